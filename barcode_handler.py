@@ -51,10 +51,9 @@ class BarcodeHandler:
     def get_part_by_barcode(data_manager, barcode_input):
         """Look up a part using its barcode"""
         try:
-            df = data_manager.get_all_parts()
-            part = df[df['barcode'] == barcode_input]
-            if not part.empty:
-                return True, part.iloc[0]
+            part = data_manager.get_part_by_barcode(barcode_input.strip())
+            if part is not None:
+                return True, part
             return False, None
         except Exception as e:
             print(f"Error looking up barcode: {e}")
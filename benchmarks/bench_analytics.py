@@ -0,0 +1,88 @@
+# benchmarks/bench_analytics.py
+"""Benchmarks for the inventory_analytics computations.
+
+    python benchmarks/bench_analytics.py --scales 1k,50k,500k
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from harness import add_common_args, ensure_database, measure, parse_scales, quiet, report
+
+import inventory_analytics
+from data_manager import DataManager
+
+SUITE = 'analytics'
+HISTORY_DAYS = 365
+
+
+def load_frames(path):
+    """Parts and a year of transactions, shaped as the pages receive them"""
+    with quiet():
+        data_manager = DataManager(path)
+        try:
+            spare_parts = data_manager.get_all_parts()
+            transactions = data_manager.get_transaction_history(days=HISTORY_DAYS)
+            department_names = data_manager.get_department_names()
+        finally:
+            data_manager.close()
+    return spare_parts, transactions, department_names
+
+
+def benchmarks(spare_parts, transactions, department_names):
+    parts = inventory_analytics.ensure_data_consistency(spare_parts, department_names)
+    history = inventory_analytics.ensure_data_consistency(transactions, department_names)
+    check_outs = history[history['transaction_type'] == 'check_out']
+    daily_demand = check_outs.groupby(
+        ['part_id', inventory_analytics.parse_timestamps(check_outs['timestamp']).dt.date.rename('day')]
+    )['quantity'].sum().reset_index()
+    start = date.today() - timedelta(days=HISTORY_DAYS)
+    daily_mean, daily_std = inventory_analytics.daily_demand_stats(
+        daily_demand, parts['id'].to_numpy(), start, HISTORY_DAYS)
+    return {
+        'ensure_data_consistency[parts]': lambda: inventory_analytics.ensure_data_consistency(
+            spare_parts, department_names),
+        'ensure_data_consistency[transactions]': lambda: inventory_analytics.ensure_data_consistency(
+            transactions, department_names),
+        'health_counts': lambda: inventory_analytics.health_counts(parts),
+        'reorder_priority': lambda: inventory_analytics.reorder_priority(parts['quantity'], parts['min_order_level']),
+        'classify_parts': lambda: inventory_analytics.classify_parts(parts),
+        'abc_analysis': lambda: inventory_analytics.abc_analysis(parts),
+        'abc_summary': lambda: inventory_analytics.abc_summary(parts),
+        'stock_recommendations': lambda: inventory_analytics.stock_recommendations(parts),
+        'critical_items': lambda: inventory_analytics.critical_items(parts),
+        'turnover_rate': lambda: inventory_analytics.turnover_rate(history, parts),
+        'average_daily_demand': lambda: inventory_analytics.average_daily_demand(history),
+        'demand_variability': lambda: inventory_analytics.demand_variability(history),
+        'peak_demand_hour': lambda: inventory_analytics.peak_demand_hour(history),
+        'top_moving_items': lambda: inventory_analytics.top_moving_items(history),
+        'department_activity': lambda: inventory_analytics.department_activity(history, parts),
+        'forecast_demand': lambda: inventory_analytics.forecast_demand(
+            daily_demand, parts['id'].to_numpy(), start, HISTORY_DAYS),
+        'demand_correlations': lambda: inventory_analytics.demand_correlations(history),
+        'deployment_risk': lambda: inventory_analytics.deployment_risk(
+            daily_mean, daily_std, parts['quantity'].to_numpy(), parts['id'].to_numpy(), seed=0)
+    }
+
+
+def run_scale(scale, args, only=None):
+    frames = load_frames(ensure_database(scale))
+    results = {}
+    for name, func in benchmarks(*frames).items():
+        if only is None or name in only or name.split('[')[0] in only:
+            results[name] = measure(func, min_time=args.min_time)
+            print(f"[{scale}] {name}: {results[name]['median'] * 1000:.2f}ms")
+    return results
+
+
+def main(argv=None):
+    parser = add_common_args(argparse.ArgumentParser(description=__doc__.splitlines()[0]))
+    args = parser.parse_args(argv)
+    only = set(args.only.split(',')) if args.only else None
+
+    results = {scale: run_scale(scale, args, only) for scale in parse_scales(args.scales)}
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# benchmarks/bench_data_manager.py
+"""Benchmarks for the DataManager hot paths.
+
+    python benchmarks/bench_data_manager.py --scales 1k,50k,500k
+    python benchmarks/bench_data_manager.py --baseline benchmarks/results/data_manager-baseline.json
+"""
+import argparse
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from harness import add_common_args, copy_database, ensure_database, measure, parse_scales, quiet, report
+
+from barcode_handler import BarcodeHandler
+from data_manager import DataManager
+
+SUITE = 'data_manager'
+IMPORT_BATCH = 50
+# Lines of a scanner burst committed together
+BURST_LINES = 30
+
+
+def _sample_ids(data_manager, column, count=100, seed=0):
+    values = pd.read_sql_query(f"SELECT {column} FROM spare_parts", data_manager.conn)[column]
+    rng = np.random.default_rng(seed)
+    return values.iloc[rng.choice(len(values), size=min(count, len(values)), replace=False)].tolist()
+
+
+def _busiest_department(data_manager):
+    return int(data_manager.conn.execute(
+        "SELECT department_id FROM spare_parts GROUP BY department_id ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0])
+
+
+def read_benchmarks(data_manager):
+    department_id = _busiest_department(data_manager)
+    barcodes = itertools.cycle(_sample_ids(data_manager, 'barcode'))
+    return {
+        'get_all_parts': data_manager.get_all_parts,
+        'get_parts_by_department': lambda: data_manager.get_parts_by_department(department_id),
+        'get_parts_page': lambda: (data_manager.count_parts(department_id, 'valve'),
+                                   data_manager.get_parts_page(department_id, 'valve', sort_by='quantity')),
+        'get_transaction_history': lambda: data_manager.get_transaction_history(days=30),
+        'get_low_stock_items': data_manager.get_low_stock_items,
+        'get_demand_histogram': lambda: data_manager.get_demand_histogram(days=365),
+        'barcode_lookup': lambda: BarcodeHandler.get_part_by_barcode(data_manager, next(barcodes)),
+        'search_parts_by_prefix': lambda: data_manager.search_parts_by_prefix('b', department_id)
+    }
+
+
+def cached_read_benchmarks(data_manager):
+    """Read cache hits: same calls with nothing written in between"""
+    department_id = _busiest_department(data_manager)
+    return {
+        'get_all_parts[cached]': data_manager.get_all_parts,
+        'get_parts_by_department[cached]': lambda: data_manager.get_parts_by_department(department_id),
+        'get_transaction_history[cached]': lambda: data_manager.get_transaction_history(days=30)
+    }
+
+
+def check_cache_isolation(data_manager):
+    """Fail when an in-place edit of a cached read shows up in the next hit"""
+    department_id = _busiest_department(data_manager)
+    parts = data_manager.get_parts_by_department(department_id)
+    expected = parts.copy()
+    try:
+        parts.iloc[0, parts.columns.get_loc('quantity')] = -1
+    except ValueError:
+        # Read-only, as intended
+        pass
+    parts['name'] = 'edited'
+    if not data_manager.get_parts_by_department(department_id).equals(expected):
+        raise RuntimeError("In-place edits of a cached frame reached the read cache")
+
+
+def record_transaction_benchmark(data_manager):
+    part_ids = itertools.cycle(_sample_ids(data_manager, 'id'))
+    # Check in before checking out so stock never runs short
+    types = itertools.cycle(['check_in', 'check_out'])
+
+    def run():
+        part_id = next(part_ids)
+        for transaction_type in (next(types), next(types)):
+            success, error = data_manager.record_transaction(
+                part_id, transaction_type, 1, 'Benchmark', 'benchmark')
+            if not success:
+                raise RuntimeError(error)
+    return run
+
+
+def record_transactions_benchmark(data_manager):
+    """A scanner burst: BURST_LINES check-ins, then the same check-outs, one commit each"""
+    part_ids = _sample_ids(data_manager, 'id')
+    bursts = itertools.count()
+
+    def run():
+        offset = next(bursts) * BURST_LINES
+        burst = [part_ids[(offset + i) % len(part_ids)] for i in range(BURST_LINES)]
+        for transaction_type in ('check_in', 'check_out'):
+            success, error = data_manager.record_transactions(
+                [(part_id, transaction_type, 1, 'Benchmark', 'benchmark') for part_id in burst])
+            if not success:
+                raise RuntimeError(error)
+    return run
+
+
+def bulk_import_benchmark(data_manager):
+    department_id = _busiest_department(data_manager)
+    parent_id = data_manager.conn.execute(
+        "SELECT parent_id FROM departments WHERE id = ?", (department_id,)).fetchone()[0]
+    batches = itertools.count(1)
+
+    def run():
+        batch = next(batches)
+        df = pd.DataFrame({
+            'part_number': [f"BENCH-{batch:05d}-{i:03d}" for i in range(IMPORT_BATCH)],
+            'name': [f"Benchmark Part {i}" for i in range(IMPORT_BATCH)],
+            'description': 'Benchmark import',
+            'quantity': 5,
+            'box_no': 'B1',
+            'compartment_no': 'C1',
+            'ilms_code': 'ILMS-0000',
+            'min_order_level': 2,
+            'min_order_quantity': 5,
+            'barcode': [f"BEN-{batch:05d}-{i:03d}" for i in range(IMPORT_BATCH)]
+        })
+        _, success, message = data_manager.bulk_import_spare_parts(df, department_id, parent_id)
+        if not success:
+            raise RuntimeError(message)
+    return run
+
+
+def run_scale(scale, args, only=None):
+    path = ensure_database(scale)
+    results = {}
+
+    def wanted(name):
+        return only is None or name in only
+
+    # Uncached DataManager times the queries themselves
+    for use_cache, factory in ((False, read_benchmarks), (True, cached_read_benchmarks)):
+        with quiet():
+            data_manager = DataManager(path, use_cache=use_cache)
+        try:
+            if use_cache:
+                check_cache_isolation(data_manager)
+            for name, func in factory(data_manager).items():
+                if wanted(name) or wanted(name.split('[')[0]):
+                    results[name] = measure(func, min_time=args.min_time)
+                    print(f"[{scale}] {name}: {results[name]['median'] * 1000:.2f}ms")
+        finally:
+            with quiet():
+                data_manager.close()
+
+    writers = {
+        'record_transaction': record_transaction_benchmark,
+        f'record_transactions[{BURST_LINES}]': record_transactions_benchmark,
+        f'bulk_import_spare_parts[{IMPORT_BATCH}]': bulk_import_benchmark
+    }
+    for name, factory in writers.items():
+        if not wanted(name.split('[')[0]) and not wanted(name):
+            continue
+        copy_path = copy_database(path, 'write')
+        with quiet():
+            data_manager = DataManager(copy_path, use_cache=False)
+        try:
+            results[name] = measure(factory(data_manager), min_time=args.min_time)
+            print(f"[{scale}] {name}: {results[name]['median'] * 1000:.2f}ms")
+        finally:
+            with quiet():
+                data_manager.close()
+            os.remove(copy_path)
+    return results
+
+
+def main(argv=None):
+    parser = add_common_args(argparse.ArgumentParser(description=__doc__.splitlines()[0]))
+    args = parser.parse_args(argv)
+    only = set(args.only.split(',')) if args.only else None
+
+    results = {scale: run_scale(scale, args, only) for scale in parse_scales(args.scales)}
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# benchmarks/harness.py
+"""Shared helpers for the standalone benchmark scripts"""
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Scale name -> number of parts and of transactions in the generated database
+SCALES = {
+    '1k': 1_000,
+    '50k': 50_000,
+    '500k': 500_000
+}
+DEPARTMENTS = 20
+DEFAULT_THRESHOLD = 0.20
+
+
+def ensure_database(scale, seed=42):
+    """Path to the generated database for a scale, building it on first use"""
+    from data_generator import generate_database
+
+    size = SCALES[scale]
+    end_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # History is relative to today so `days=30` queries always hit data
+    path = os.path.join(DATA_DIR, f"{scale}-seed{seed}-{end_date:%Y%m%d}.db")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with quiet():
+            summary = generate_database(
+                path, departments=DEPARTMENTS,
+                parts_per_department=max(1, size // DEPARTMENTS),
+                years=1.0, transactions_per_day=size / 365,
+                seed=seed, end_date=end_date)
+        print(f"Generated {scale} database in {summary['seconds']}s: {path}")
+    return path
+
+
+def copy_database(path, suffix):
+    """Copy a database so write benchmarks leave the shared one untouched"""
+    target = f"{path[:-3]}-{suffix}.db"
+    src = sqlite3.connect(path)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    return target
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the print() logging of the code under test"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def measure(func, rounds=None, min_time=1.0, max_rounds=200, warmup=1):
+    """Time func() repeatedly; returns summary statistics in seconds"""
+    with quiet():
+        for _ in range(warmup):
+            func()
+
+        timings = []
+        started = time.perf_counter()
+        while True:
+            t0 = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - t0)
+            if rounds is not None:
+                if len(timings) >= rounds:
+                    break
+            elif (time.perf_counter() - started >= min_time and len(timings) >= 3) \
+                    or len(timings) >= max_rounds:
+                break
+
+    return {
+        'rounds': len(timings),
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'max': max(timings)
+    }
+
+
+def environment():
+    """Machine and library versions recorded alongside results"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                  capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+
+
+def add_common_args(parser, timing=True):
+    """CLI options shared by all benchmark scripts"""
+    parser.add_argument('--scales', default='1k,50k',
+                        help=f"Comma separated subset of {','.join(SCALES)} (default: 1k,50k)")
+    if timing:
+        parser.add_argument('--only', help="Comma separated benchmark names to run")
+        parser.add_argument('--min-time', type=float, default=1.0,
+                            help="Minimum seconds spent timing each benchmark")
+    parser.add_argument('--output', help="Results JSON path (default: benchmarks/results/<suite>-<timestamp>.json)")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Also write the results as benchmarks/results/<suite>-baseline.json")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown of the median that counts as a regression (default: 0.20)")
+    return parser
+
+
+def parse_scales(value):
+    scales = [s.strip() for s in value.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        raise SystemExit(f"Unknown scale(s): {', '.join(unknown)}")
+    return scales
+
+
+def write_results(suite, results, output=None, save_baseline=False):
+    """Write a results document and return its path"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    document = {'suite': suite, 'environment': environment(), 'results': results}
+    if output is None:
+        output = os.path.join(RESULTS_DIR, f"{suite}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    if save_baseline:
+        with open(os.path.join(RESULTS_DIR, f"{suite}-baseline.json"), 'w') as f:
+            json.dump(document, f, indent=2)
+    return output
+
+
+def compare_to_baseline(results, baseline_path, threshold=DEFAULT_THRESHOLD):
+    """List of (scale, name, baseline_median, median, ratio) that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f).get('results', {})
+
+    regressions = []
+    for scale, benches in results.items():
+        for name, stats in benches.items():
+            previous = baseline.get(scale, {}).get(name)
+            if not previous or not previous.get('median'):
+                continue
+            ratio = stats['median'] / previous['median']
+            if ratio > 1 + threshold:
+                regressions.append((scale, name, previous['median'], stats['median'], ratio))
+    return regressions
+
+
+def print_table(results):
+    for scale, benches in results.items():
+        print(f"\n== {scale} ==")
+        print(f"{'benchmark':<34}{'median':>12}{'min':>12}{'rounds':>8}")
+        for name, stats in benches.items():
+            print(f"{name:<34}{stats['median'] * 1000:>10.2f}ms{stats['min'] * 1000:>10.2f}ms{stats['rounds']:>8}")
+
+
+def report(suite, results, args, table=print_table):
+    """Print, store and compare a run; returns the process exit code"""
+    table(results)
+    path = write_results(suite, results, args.output, args.save_baseline)
+    print(f"\nResults written to {path}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for scale, name, before, after, ratio in regressions:
+                print(f"  [{scale}] {name}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms ({ratio:.2f}x)")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
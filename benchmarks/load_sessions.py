@@ -0,0 +1,308 @@
+# benchmarks/load_sessions.py
+"""Concurrent session load test against one SQLite database.
+
+Simulates N operators, each with its own DataManager like a Streamlit
+session, running a mix of dashboard reads, inventory grid searches, part typeahead
+lookups, check-ins and check-outs and report generation for a fixed duration.
+
+    python benchmarks/load_sessions.py --scales 50k --sessions 1,4,16 --modes threads,processes
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from harness import add_common_args, copy_database, ensure_database, parse_scales, quiet, report
+
+import inventory_analytics
+from data_manager import PART_STOCK_FILTERS, DataManager
+
+SUITE = 'load_sessions'
+DEFAULT_MIX = 'dashboard=40,search=20,typeahead=10,transaction=20,report=10'
+REPORT_DAYS = 90
+LOCKED = 'database is locked'
+# Share of the busy timeout after which a lock error counts as a timeout
+# rather than an immediate SQLITE_BUSY
+TIMEOUT_SHARE = 0.9
+
+
+class SessionOutput(io.TextIOBase):
+    """sys.stdout stand-in that keeps each thread's print() output apart.
+
+    DataManager reports most failures by printing and returning an empty
+    result, so the harness reads the output of every operation to classify it.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def capture(self):
+        self.local.buffer = []
+
+    def release(self):
+        text = ''.join(self.local.buffer)
+        self.local.buffer = None
+        return text
+
+
+def parse_mix(value):
+    """{operation: weight} from 'dashboard=40,search=30,...'"""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation in --mix: {name.strip()}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def load_samples(path, count=200, seed=0):
+    """Part ids, department ids and search terms shared by all sessions"""
+    with quiet():
+        data_manager = DataManager(path)
+    try:
+        parts = pd.read_sql_query("SELECT id, name, part_number, department_id FROM spare_parts", data_manager.conn)
+    finally:
+        with quiet():
+            data_manager.close()
+
+    rng = np.random.default_rng(seed)
+    sample = parts.iloc[rng.choice(len(parts), size=min(count, len(parts)), replace=False)]
+    terms = sample['name'].str.split().str[0].tolist() + sample['part_number'].str[:4].tolist()
+    return {
+        'part_ids': sample['id'].astype(int).tolist(),
+        'department_ids': sorted(parts['department_id'].dropna().astype(int).unique().tolist()),
+        'search_terms': sorted(set(terms))
+    }
+
+
+def dashboard(data_manager, rng, samples):
+    """Reads behind the main page and its sidebar"""
+    data_manager.get_stock_alert_counts()
+    data_manager.get_stock_alert_counts(rng.choice(samples['department_ids']))
+    data_manager.get_open_alerts(limit=4)
+    data_manager.get_all_parts()
+    data_manager.get_transaction_history(days=30)
+
+
+def search(data_manager, rng, samples):
+    """First page of the Inventory grid for a search term and stock filter"""
+    department_id = rng.choice(samples['department_ids'])
+    term = rng.choice(samples['search_terms'])
+    stock_filter = rng.choice([None, *PART_STOCK_FILTERS])
+    if data_manager.count_parts(department_id, term, stock_filter):
+        data_manager.get_parts_page(department_id, term, stock_filter)
+
+
+def typeahead(data_manager, rng, samples):
+    """Part pick list of the Operations page for a typed prefix"""
+    data_manager.search_parts_by_prefix(rng.choice(samples['search_terms']), rng.choice(samples['department_ids']))
+
+
+def transaction(data_manager, rng, samples):
+    """One check-in or check-out through record_transaction"""
+    transaction_type = rng.choice(['check_in', 'check_out'])
+    success, error = data_manager.record_transaction(
+        rng.choice(samples['part_ids']), transaction_type, 1, 'Load test', 'load_sessions')
+    return error
+
+
+def report_generation(data_manager, rng, samples):
+    """Reads and computations of the Reports executive summary"""
+    parts = inventory_analytics.ensure_data_consistency(data_manager.get_all_parts())
+    transactions = inventory_analytics.ensure_data_consistency(data_manager.get_transaction_history(days=REPORT_DAYS))
+    inventory_analytics.turnover_rate(transactions, parts)
+    inventory_analytics.abc_summary(parts)
+    inventory_analytics.health_counts(parts)
+    inventory_analytics.department_activity(transactions, parts)
+
+
+OPERATIONS = {
+    'dashboard': dashboard,
+    'search': search,
+    'typeahead': typeahead,
+    'transaction': transaction,
+    'report': report_generation
+}
+
+
+def classify(text, latency, busy_timeout):
+    """Outcome of one operation from its printed output or error message"""
+    if LOCKED in text:
+        return 'lock_timeout' if latency >= busy_timeout * TIMEOUT_SHARE else 'locked'
+    if 'Insufficient stock' in text:
+        return 'rejected'
+    if 'Error' in text or 'error' in text:
+        return 'error'
+    return 'ok'
+
+
+def run_session(path, index, duration, mix, think_time, busy_timeout, samples, barrier, seed):
+    """Run one simulated session; returns its timed operations"""
+    output = sys.stdout if isinstance(sys.stdout, SessionOutput) else None
+    if output is None:
+        # Worker process: each process owns its stdout
+        output = sys.stdout = SessionOutput(sys.stdout)
+
+    output.capture()
+    data_manager = DataManager(path)
+    if busy_timeout is not None:
+        data_manager.conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+    output.release()
+    timeout = data_manager.conn.execute("PRAGMA busy_timeout").fetchone()[0] / 1000
+
+    rng = random.Random(seed + index)
+    names, weights = list(mix), list(mix.values())
+    records = []
+    barrier.wait(timeout=120)
+    started = time.perf_counter()
+    deadline = started + duration
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            output.capture()
+            t0 = time.perf_counter()
+            try:
+                message = OPERATIONS[name](data_manager, rng, samples)
+            except Exception as e:
+                message = f"Error: {e}"
+            latency = time.perf_counter() - t0
+            text = output.release() + (message if isinstance(message, str) else '')
+            records.append((name, latency, classify(text, latency, timeout)))
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+    finally:
+        output.capture()
+        data_manager.close()
+        output.release()
+    return {'elapsed': time.perf_counter() - started, 'records': records}
+
+
+def run_load(path, mode, sessions, args, mix, samples):
+    """Run `sessions` concurrent sessions as threads or processes"""
+    common = (args.duration, mix, args.think_time, args.busy_timeout, samples)
+    if mode == 'threads':
+        barrier = threading.Barrier(sessions)
+        original = sys.stdout
+        sys.stdout = SessionOutput(original)
+        try:
+            with ThreadPoolExecutor(max_workers=sessions) as pool:
+                futures = [pool.submit(run_session, path, i, *common, barrier, args.seed) for i in range(sessions)]
+                outcomes = [f.result() for f in futures]
+        finally:
+            sys.stdout = original
+    else:
+        context = multiprocessing.get_context('spawn')
+        with context.Manager() as manager:
+            barrier = manager.Barrier(sessions)
+            with ProcessPoolExecutor(max_workers=sessions, mp_context=context) as pool:
+                futures = [pool.submit(run_session, path, i, *common, barrier, args.seed) for i in range(sessions)]
+                outcomes = [f.result() for f in futures]
+    return summarize(outcomes)
+
+
+def _latency_stats(latencies):
+    if not len(latencies):
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(np.max(latencies))}
+
+
+def summarize(outcomes):
+    """Throughput, latency percentiles and outcome counts of one run"""
+    records = pd.DataFrame([r for o in outcomes for r in o['records']],
+                           columns=['operation', 'latency', 'outcome'])
+    elapsed = max(o['elapsed'] for o in outcomes)
+    counts = records['outcome'].value_counts()
+    summary = {
+        'sessions': len(outcomes),
+        'operations': len(records),
+        'throughput': len(records) / elapsed if elapsed else 0.0,
+        **_latency_stats(records['latency'].to_numpy()),
+        **{outcome: int(counts.get(outcome, 0)) for outcome in ['ok', 'rejected', 'locked', 'lock_timeout', 'error']},
+        'by_operation': {}
+    }
+    # Regression checks compare the median latency
+    summary['median'] = summary['p50']
+    for name, group in records.groupby('operation'):
+        summary['by_operation'][name] = {
+            'operations': len(group),
+            **_latency_stats(group['latency'].to_numpy()),
+            'locked': int(group['outcome'].isin(['locked', 'lock_timeout']).sum()),
+            'error': int((group['outcome'] == 'error').sum())
+        }
+    return summary
+
+
+def print_load_table(results):
+    for scale, runs in results.items():
+        print(f"\n== {scale} ==")
+        print(f"{'run':<16}{'ops':>8}{'ops/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}"
+              f"{'locked':>8}{'timeout':>9}{'errors':>8}{'rejected':>10}")
+        for name, stats in runs.items():
+            print(f"{name:<16}{stats['operations']:>8}{stats['throughput']:>9.1f}"
+                  f"{stats['p50'] * 1000:>8.1f}ms{stats['p95'] * 1000:>8.1f}ms{stats['p99'] * 1000:>8.1f}ms"
+                  f"{stats['locked']:>8}{stats['lock_timeout']:>9}{stats['error']:>8}{stats['rejected']:>10}")
+
+
+def main(argv=None):
+    parser = add_common_args(argparse.ArgumentParser(description=__doc__.splitlines()[0]), timing=False)
+    parser.add_argument('--sessions', default='1,2,4,8,16',
+                        help="Comma separated numbers of concurrent sessions (default: 1,2,4,8,16)")
+    parser.add_argument('--modes', default='threads,processes',
+                        help="Run sessions as threads, processes or both (default: threads,processes)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run (default: 10)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="Mean pause between a session's operations in seconds (default: 0, saturating)")
+    parser.add_argument('--busy-timeout', type=float,
+                        help="Override the SQLite busy timeout in seconds (default: DataManager's 10s)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    if set(modes) - {'threads', 'processes'}:
+        raise SystemExit("--modes accepts threads and processes")
+    session_counts = [int(n) for n in args.sessions.split(',')]
+
+    results = {}
+    for scale in parse_scales(args.scales):
+        path = ensure_database(scale)
+        samples = load_samples(path)
+        results[scale] = {}
+        for mode in modes:
+            for sessions in session_counts:
+                # Fresh copy per run so earlier writes do not skew later runs
+                copy_path = copy_database(path, 'load')
+                try:
+                    stats = run_load(copy_path, mode, sessions, args, mix, samples)
+                finally:
+                    os.remove(copy_path)
+                results[scale][f"{mode}[{sessions}]"] = stats
+                print(f"[{scale}] {mode}[{sessions}]: {stats['throughput']:.1f} ops/s, "
+                      f"p95 {stats['p95'] * 1000:.1f}ms, {stats['locked'] + stats['lock_timeout']} locked")
+    return report(SUITE, results, args, table=print_load_table)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# benchmarks/replay_trace.py
+"""Replay a recorded DataManager call trace against a copy of a database.
+
+Record on the server with INVENTORY_TRACE=/path/trace.jsonl, take a copy
+of inventory.db from when the recording started, then:
+
+    python benchmarks/replay_trace.py trace.jsonl --db snapshot.db --speed 10
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from harness import DEFAULT_THRESHOLD, copy_database, report
+from load_sessions import SessionOutput, classify
+
+import query_trace
+from data_manager import DataManager
+
+SUITE = 'replay'
+
+
+def replay_session(path, calls, trace_start, replay_start, speed, output):
+    """Re-execute one recorded session's calls in order on its own DataManager"""
+    output.capture()
+    data_manager = DataManager(path, trace_path='')
+    output.release()
+    timeout = data_manager.conn.execute("PRAGMA busy_timeout").fetchone()[0] / 1000
+
+    records = []
+    try:
+        for call in calls:
+            lag = 0.0
+            if speed:
+                due = replay_start + (call['t'] - trace_start) / speed
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                lag = max(0.0, -wait)
+            method = getattr(data_manager, call['m'], None)
+            output.capture()
+            t0 = time.perf_counter()
+            try:
+                if method is None:
+                    raise AttributeError(f"DataManager has no method {call['m']}")
+                result = method(*call['a'], **call.get('k', {}))
+                message = result[1] if isinstance(result, tuple) and len(result) == 2 \
+                    and result[0] is False and isinstance(result[1], str) else ''
+            except Exception as e:
+                message = f"Error: {e}"
+            latency = time.perf_counter() - t0
+            text = output.release() + (message or '')
+            records.append((call['m'], call['d'], latency, lag, classify(text, latency, timeout)))
+    finally:
+        output.capture()
+        data_manager.close()
+        output.release()
+    return records
+
+
+def replay(trace_path, db_path, speed):
+    """Replay every session of a trace concurrently; returns timed records and wall time"""
+    header, calls = query_trace.read_trace(trace_path)
+    if not calls:
+        raise SystemExit(f"No calls recorded in {trace_path}")
+
+    sessions = {}
+    for call in calls:
+        sessions.setdefault(call['s'], []).append(call)
+    print(f"Replaying {len(calls)} calls from {len(sessions)} session(s) "
+          f"recorded against {header.get('db', 'unknown')} at "
+          f"{'full speed' if not speed else f'{speed:g}x'}")
+
+    copy_path = copy_database(db_path, 'replay')
+    original = sys.stdout
+    output = sys.stdout = SessionOutput(original)
+    try:
+        with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+            replay_start = time.perf_counter()
+            futures = [pool.submit(replay_session, copy_path, session_calls, calls[0]['t'],
+                                   replay_start, speed, output)
+                       for session_calls in sessions.values()]
+            records = [r for f in futures for r in f.result()]
+            wall = time.perf_counter() - replay_start
+    finally:
+        sys.stdout = original
+        os.remove(copy_path)
+    return records, wall, calls[-1]['t'] - calls[0]['t']
+
+
+def summarize(records, wall, recorded_span):
+    """Recorded vs replayed latency per method plus an 'all' row"""
+    df = pd.DataFrame(records, columns=['method', 'recorded', 'latency', 'lag', 'outcome'])
+
+    def stats(group):
+        p50, p95 = np.percentile(group['latency'], [50, 95])
+        return {
+            'calls': len(group),
+            'recorded_median': float(group['recorded'].median()),
+            'median': float(p50),
+            'p95': float(p95),
+            'max': float(group['latency'].max()),
+            'max_lag': float(group['lag'].max()),
+            'locked': int(group['outcome'].isin(['locked', 'lock_timeout']).sum()),
+            'error': int((group['outcome'] == 'error').sum())
+        }
+
+    results = {name: stats(group) for name, group in df.groupby('method')}
+    results['all'] = {**stats(df), 'wall_time': wall, 'recorded_span': recorded_span}
+    return results
+
+
+def print_replay_table(results):
+    for trace, methods in results.items():
+        total = methods['all']
+        print(f"\n== {trace}: {total['calls']} calls in {total['wall_time']:.1f}s "
+              f"(recorded over {total['recorded_span']:.1f}s) ==")
+        print(f"{'method':<40}{'calls':>7}{'recorded':>11}{'p50':>10}{'p95':>10}{'lag':>10}{'locked':>8}{'errors':>8}")
+        for name, s in sorted(methods.items(), key=lambda item: item[0] == 'all'):
+            print(f"{name:<40}{s['calls']:>7}{s['recorded_median'] * 1000:>9.1f}ms{s['median'] * 1000:>8.1f}ms"
+                  f"{s['p95'] * 1000:>8.1f}ms{s['max_lag'] * 1000:>8.0f}ms{s['locked']:>8}{s['error']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help="Trace file written with INVENTORY_TRACE")
+    parser.add_argument('--db', default='inventory.db',
+                        help="Database snapshot to replay against; a copy is used (default: inventory.db)")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Time compression: 1 replays at the recorded pace, 10 ten times faster, "
+                             "0 as fast as possible (default: 1)")
+    parser.add_argument('--output', help="Results JSON path (default: benchmarks/results/replay-<timestamp>.json)")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Also write the results as benchmarks/results/replay-baseline.json")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown of the median that counts as a regression (default: 0.20)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+    records, wall, recorded_span = replay(args.trace, args.db, args.speed)
+    results = {os.path.basename(args.trace): summarize(records, wall, recorded_span)}
+    return report(SUITE, results, args, table=print_replay_table)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
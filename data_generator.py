@@ -0,0 +1,341 @@
+# data_generator.py
+"""Headless, deterministic synthetic data for load testing.
+
+Builds a standalone SQLite database with the application schema, a
+department hierarchy, spare parts and an intermittent demand history.
+Same seed and end date always produce the same database.
+
+    python data_generator.py --db load_test.db --departments 50 \\
+        --parts-per-department 400 --years 3 --transactions-per-day 1000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from data_manager import DataManager
+
+# Same ship areas as the Data Management sample data
+PARENT_DEPARTMENTS = [
+    ("ENG", "Engineering"),
+    ("DECK", "Deck Operations"),
+    ("NAV", "Navigation"),
+    ("CAB", "Cabins & Accommodation"),
+    ("GAL", "Galley & Provisions")
+]
+
+CHILD_DEPARTMENTS = [
+    ("MEP", "Main Engine Parts", "ENG"),
+    ("AEP", "Auxiliary Engine Parts", "ENG"),
+    ("ELC", "Electrical Systems", "ENG"),
+    ("HUL", "Hull Maintenance", "ENG"),
+    ("CAR", "Cargo Operations", "DECK"),
+    ("ANC", "Anchoring Systems", "DECK"),
+    ("MOR", "Mooring Equipment", "DECK"),
+    ("LIF", "Life Saving Appliances", "DECK"),
+    ("COM", "Communication Systems", "NAV"),
+    ("RAD", "Radar & Navigation", "NAV"),
+    ("AIS", "AIS & GPS Systems", "NAV"),
+    ("PLU", "Plumbing Systems", "CAB"),
+    ("HVAC", "HVAC Systems", "CAB"),
+    ("FIR", "Fire Fighting Equipment", "CAB"),
+    ("KIT", "Kitchen Equipment", "GAL"),
+    ("REF", "Refrigeration", "GAL"),
+    ("PRO", "Provisions Storage", "GAL")
+]
+
+PART_TYPES = [
+    ("Piston Ring Set", "High-pressure piston rings"),
+    ("Cylinder Liner", "Cylinder liner assembly"),
+    ("Fuel Injector", "Electronic fuel injector unit"),
+    ("Bearing Set", "Main bearing set"),
+    ("Generator Brush", "Carbon brushes for generator"),
+    ("Pump Impeller", "Impeller for cooling water pump"),
+    ("Compressor Valve", "Reed valves for air compressor"),
+    ("Circuit Breaker", "Circuit breaker 400A"),
+    ("Control Relay", "24V DC control relay"),
+    ("Cable Terminal", "High voltage cable terminal"),
+    ("Wire Rope", "20mm wire rope"),
+    ("Hatch Cover Seal", "Rubber seal for hatch covers"),
+    ("Gasket Kit", "Assorted flange gaskets"),
+    ("O-Ring Kit", "Nitrile O-ring assortment"),
+    ("Filter Element", "Lube oil filter element"),
+    ("V-Belt", "Drive belt for auxiliary machinery"),
+    ("Solenoid Valve", "24V solenoid valve"),
+    ("Pressure Gauge", "0-16 bar pressure gauge"),
+    ("Fuse", "Cartridge fuse"),
+    ("Lamp", "Navigation lamp bulb")
+]
+
+STATUSES = ["In Store", "Operational", "Under Maintenance"]
+DENOMINATIONS = ["Pieces", "NOS", "Sets", "Meters"]
+
+CHECK_OUT_REASONS = ['Operational Use', 'Maintenance', 'Replacement', 'Emergency']
+CHECK_IN_REASONS = ['Restock', 'Return from Maintenance', 'New Supply']
+
+# Relative activity by weekday (Mon..Sun) and hour of day
+WEEKDAY_WEIGHTS = np.array([1.0, 1.1, 1.1, 1.0, 0.9, 0.45, 0.35])
+HOUR_WEIGHTS = np.array([0.1, 0.05, 0.05, 0.05, 0.1, 0.3, 0.7, 1.2, 1.6, 1.7, 1.6, 1.3,
+                         0.8, 1.3, 1.5, 1.4, 1.1, 0.7, 0.5, 0.4, 0.3, 0.25, 0.2, 0.15])
+
+# Share of transactions that are check-ins (restocks and returns)
+CHECK_IN_SHARE = 0.2
+LEAD_TIME_DAYS = 14
+
+
+def generate_departments(count):
+    """Department rows (id, code, name, parent_id): 5 parents and `count` children"""
+    rows = []
+    parent_ids = {}
+    for i, (code, name) in enumerate(PARENT_DEPARTMENTS, start=1):
+        rows.append((i, code, name, None))
+        parent_ids[code] = i
+
+    next_id = len(rows) + 1
+    for i in range(count):
+        if i < len(CHILD_DEPARTMENTS):
+            code, name, parent_code = CHILD_DEPARTMENTS[i]
+        else:
+            parent_code = PARENT_DEPARTMENTS[i % len(PARENT_DEPARTMENTS)][0]
+            code, name = f"D{i + 1:03d}", f"Department {i + 1}"
+        rows.append((next_id, code, name, parent_ids[parent_code]))
+        next_id += 1
+    return rows
+
+
+def generate_parts(departments, parts_per_department, total_check_outs, days, rng):
+    """Spare part rows plus the per-part demand weights used for transactions"""
+    children = [d for d in departments if d[3] is not None]
+    parents = {d[0]: d[1] for d in departments if d[3] is None}
+    n_parts = len(children) * parts_per_department
+
+    # Heavy-tailed popularity: a few fast movers, a long tail of slow,
+    # intermittent parts that see demand only a handful of times a year.
+    weights = rng.lognormal(mean=0.0, sigma=1.6, size=n_parts)
+    weights /= weights.sum()
+    size_mean = 1.0 + rng.gamma(shape=1.2, scale=1.0, size=n_parts)
+
+    daily_demand = weights * total_check_outs * size_mean / max(days, 1)
+    min_order_level = np.maximum(1, np.ceil(daily_demand * LEAD_TIME_DAYS)).astype(np.int64)
+    min_order_quantity = np.maximum(1, np.ceil(min_order_level * rng.uniform(0.5, 2.0, n_parts))).astype(np.int64)
+
+    # Current stock: some out of stock, some last piece, some low, the rest healthy
+    bucket = rng.choice(4, size=n_parts, p=[0.04, 0.08, 0.18, 0.70])
+    quantity = np.select(
+        [bucket == 0, bucket == 1, bucket == 2],
+        [0, 1, rng.integers(2, min_order_level + 2)],
+        rng.integers(min_order_level + 1, min_order_level * 5 + 3)
+    ).astype(float)
+
+    type_idx = rng.integers(0, len(PART_TYPES), n_parts)
+    status_idx = rng.choice(len(STATUSES), size=n_parts, p=[0.6, 0.3, 0.1])
+    denomination_idx = rng.choice(len(DENOMINATIONS), size=n_parts, p=[0.6, 0.25, 0.1, 0.05])
+    mustered = rng.random(n_parts) < 0.5
+    line_no = rng.integers(1, 11, n_parts)
+    page_no = rng.integers(1, 6, n_parts)
+    order_no = rng.integers(1000, 10000, n_parts)
+    material_code = rng.integers(100, 1000, n_parts)
+    ilms_code = rng.integers(1000, 10000, n_parts)
+    compartment_no = rng.integers(1, 11, n_parts)
+    box_no = rng.integers(1, 21, n_parts)
+
+    rows = []
+    part_id = 0
+    for dept_id, code, name, parent_id in children:
+        # Barcodes follow the PAR-CH-SERIAL layout used by the inventory page;
+        # the child code keeps them unique across departments.
+        prefix = f"{parents[parent_id][:3]}-{code}"
+        for serial in range(1, parts_per_department + 1):
+            i = part_id
+            part_name, description = PART_TYPES[type_idx[i]]
+            rows.append((
+                i + 1,
+                f"{code}-{serial:05d}",
+                f"{part_name} {code}-{serial}",
+                f"{description} for {name}",
+                float(quantity[i]),
+                int(line_no[i]),
+                f"P{page_no[i]}",
+                f"ORD-{order_no[i]}",
+                f"MAT-{material_code[i]}",
+                f"ILMS-{ilms_code[i]}",
+                DENOMINATIONS[denomination_idx[i]],
+                int(mustered[i]),
+                dept_id,
+                f"C{compartment_no[i]}",
+                f"B{box_no[i]}",
+                "Synthetic load test data",
+                int(min_order_level[i]),
+                int(min_order_quantity[i]),
+                f"{prefix}-{serial:04d}",
+                STATUSES[status_idx[i]]
+            ))
+            part_id += 1
+
+    return rows, weights, size_mean, min_order_quantity
+
+
+def generate_transactions(weights, size_mean, min_order_quantity, days,
+                          transactions_per_day, end_date, rng):
+    """Transaction columns ordered by timestamp"""
+    n_total = int(days * transactions_per_day)
+    n_in = int(round(n_total * CHECK_IN_SHARE))
+    n_out = n_total - n_in
+    n_parts = len(weights)
+
+    # Which part each transaction touches; the popularity skew makes demand
+    # for most parts intermittent (long gaps between non-zero days).
+    part_idx = np.concatenate([
+        rng.choice(n_parts, size=n_out, p=weights),
+        rng.choice(n_parts, size=n_in, p=weights)
+    ])
+    is_check_out = np.arange(n_total) < n_out
+
+    out_qty = 1 + rng.poisson(size_mean[part_idx[:n_out]] - 1.0)
+    in_qty = min_order_quantity[part_idx[n_out:]] * rng.integers(1, 3, n_in)
+    quantity = np.concatenate([out_qty, in_qty]).astype(float)
+
+    # Timestamps: weekday-weighted day, working-hours-weighted hour
+    # (microsecond resolution, matching str(datetime.now()) written by the app)
+    start = np.datetime64(end_date - timedelta(days=days), 'us')
+    start_weekday = (end_date - timedelta(days=days)).weekday()
+    day_weights = WEEKDAY_WEIGHTS[(start_weekday + np.arange(days)) % 7]
+    day = rng.choice(days, size=n_total, p=day_weights / day_weights.sum())
+    hour = rng.choice(24, size=n_total, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    offset = (day * 86400 + hour * 3600) * 1_000_000 + rng.integers(0, 3_600_000_000, n_total)
+
+    order = np.argsort(offset, kind='stable')
+    part_idx = part_idx[order]
+    is_check_out = is_check_out[order]
+    quantity = quantity[order]
+    timestamps = np.datetime_as_string(start + offset[order].astype('timedelta64[us]'))
+    timestamps = np.char.replace(timestamps, 'T', ' ')
+
+    out_reason = rng.integers(0, len(CHECK_OUT_REASONS), n_total)
+    in_reason = rng.integers(0, len(CHECK_IN_REASONS), n_total)
+    reasons = np.where(is_check_out,
+                       np.array(CHECK_OUT_REASONS, dtype=object)[out_reason],
+                       np.array(CHECK_IN_REASONS, dtype=object)[in_reason])
+    remark_lookup = {r: f"Used for {r.lower()}" for r in CHECK_OUT_REASONS}
+    remark_lookup.update({r: f"Received from {r.lower()}" for r in CHECK_IN_REASONS})
+
+    return {
+        'part_id': part_idx + 1,
+        'transaction_type': np.where(is_check_out, 'check_out', 'check_in').astype(object),
+        'quantity': quantity,
+        'timestamp': timestamps.astype(object),
+        'reason': reasons,
+        'remarks': np.array([remark_lookup[r] for r in CHECK_OUT_REASONS + CHECK_IN_REASONS],
+                            dtype=object)[
+            np.where(is_check_out, out_reason, len(CHECK_OUT_REASONS) + in_reason)
+        ]
+    }
+
+
+def generate_database(db_path, departments=17, parts_per_department=20, years=1.0,
+                      transactions_per_day=50, seed=42, end_date=None, overwrite=False):
+    """Build a synthetic inventory database and return a summary dict"""
+    if departments < 1 or parts_per_department < 1:
+        raise ValueError("departments and parts_per_department must be at least 1")
+    if years <= 0 or transactions_per_day < 0:
+        raise ValueError("years must be positive and transactions_per_day non-negative")
+
+    if os.path.exists(db_path):
+        if not overwrite:
+            raise FileExistsError(f"{db_path} already exists (use overwrite=True / --overwrite)")
+        os.remove(db_path)
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    if end_date is None:
+        end_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    days = max(1, int(round(years * 365)))
+    n_check_outs = int(days * transactions_per_day) - int(round(days * transactions_per_day * CHECK_IN_SHARE))
+
+    dept_rows = generate_departments(departments)
+    part_rows, weights, size_mean, moq = generate_parts(
+        dept_rows, parts_per_department, n_check_outs, days, rng)
+    tx = generate_transactions(weights, size_mean, moq, days, transactions_per_day, end_date, rng)
+
+    data_manager = DataManager(db_path)
+    conn = data_manager.conn
+    try:
+        # Bulk load: nothing to protect in a freshly generated file
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        # Per-row version bumps and histogram updates would double the load
+        # time; create_tables() below puts the triggers back and the
+        # histogram is rebuilt in one pass
+        conn.execute("DROP TRIGGER IF EXISTS transactions_version_insert")
+        conn.execute("DROP TRIGGER IF EXISTS transactions_histogram_insert")
+        last_updated = end_date.strftime('%Y-%m-%d %H:%M:%S')
+        with data_manager.get_cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO departments (id, code, name, parent_id) VALUES (?, ?, ?, ?)",
+                dept_rows)
+            cursor.executemany('''
+                INSERT INTO spare_parts (
+                    id, part_number, name, description, quantity, line_no, page_no,
+                    order_no, material_code, ilms_code, item_denomination,
+                    mustered, department_id, compartment_no, box_no, remark,
+                    min_order_level, min_order_quantity, barcode, status, last_updated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (row + (last_updated,) for row in part_rows))
+            cursor.executemany('''
+                INSERT INTO transactions (part_id, transaction_type, quantity, timestamp, reason, remarks)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', zip(tx['part_id'].tolist(), tx['transaction_type'].tolist(),
+                     tx['quantity'].tolist(), tx['timestamp'].tolist(),
+                     tx['reason'].tolist(), tx['remarks'].tolist()))
+        conn.commit()
+        data_manager.create_tables()
+        data_manager.rebuild_demand_histogram()
+    finally:
+        data_manager.close()
+
+    return {
+        'db_path': db_path,
+        'seed': seed,
+        'departments': len(dept_rows),
+        'parts': len(part_rows),
+        'transactions': len(tx['part_id']),
+        'days': days,
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic inventory database for load testing")
+    parser.add_argument('--db', default='load_test.db', help="Output SQLite file (default: load_test.db)")
+    parser.add_argument('--departments', type=int, default=17, help="Number of child departments")
+    parser.add_argument('--parts-per-department', type=int, default=20)
+    parser.add_argument('--years', type=float, default=1.0, help="Years of transaction history")
+    parser.add_argument('--transactions-per-day', type=float, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end-date', help="Last day of history, YYYY-MM-DD (default: today)")
+    parser.add_argument('--overwrite', action='store_true', help="Replace the output file if it exists")
+    args = parser.parse_args(argv)
+
+    end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+    try:
+        summary = generate_database(
+            args.db, departments=args.departments,
+            parts_per_department=args.parts_per_department, years=args.years,
+            transactions_per_day=args.transactions_per_day, seed=args.seed,
+            end_date=end_date, overwrite=args.overwrite)
+    except (ValueError, FileExistsError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Generated {summary['transactions']:,} transactions for {summary['parts']:,} parts "
+          f"in {summary['departments']} departments -> {summary['db_path']} "
+          f"({summary['seconds']}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
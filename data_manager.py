@@ -1,20 +1,336 @@
 import sqlite3
+import re
 from contextlib import contextmanager
 import pandas as pd
 from datetime import datetime
 import os
 from barcode_handler import BarcodeHandler
+import query_trace
+import query_cache
+from query_cache import cached_read
+from inventory_analytics.metrics import ALERT_LEVELS, LAST_PIECE_QUANTITY, OUT_OF_STOCK_QUANTITY
+
+def _alert_level(row):
+    """Alert severity of a spare_parts row, the SQL twin of inventory_analytics.stock_alert_levels"""
+    return f"""(CASE WHEN {row}.quantity <= {OUT_OF_STOCK_QUANTITY} THEN {ALERT_LEVELS['out_of_stock']}
+                WHEN {row}.quantity <= {LAST_PIECE_QUANTITY} THEN {ALERT_LEVELS['last_piece']}
+                WHEN {row}.quantity <= {row}.min_order_level THEN {ALERT_LEVELS['low_stock']} ELSE 0 END)"""
+
+
+def _alert_type(row):
+    return f"""(CASE {_alert_level(row)} WHEN {ALERT_LEVELS['out_of_stock']} THEN 'out_of_stock'
+                WHEN {ALERT_LEVELS['last_piece']} THEN 'last_piece' ELSE 'low_stock' END)"""
+
+
+def stock_alert_condition(alert_type, row='spare_parts'):
+    """SQL condition of the parts at exactly one ALERT_TYPES level, as the alerts and counters see it"""
+    return f"{_alert_level(row)} = {ALERT_LEVELS[alert_type]}"
+
+
+ALERT_TYPES = {
+    'out_of_stock': 'Out of Stock',
+    'last_piece': 'Last Piece',
+    'low_stock': 'Low Stock'
+}
+
+
+def _alert_count_update(row, sign):
+    """UPDATE adding (sign '+') or removing (sign '-') a spare_parts row from its department's counters"""
+    return f'''
+        UPDATE stock_alert_counts SET
+            part_count = part_count {sign} 1,
+            last_piece = last_piece {sign} ({stock_alert_condition('last_piece', row)}),
+            low_stock = low_stock {sign} ({stock_alert_condition('low_stock', row)}),
+            out_of_stock = out_of_stock {sign} ({stock_alert_condition('out_of_stock', row)})
+        WHERE department_id = IFNULL({row}.department_id, 0);
+    '''
+
+
+_ALERT_COUNT_ROW = '''
+        INSERT OR IGNORE INTO stock_alert_counts (department_id) VALUES (IFNULL(NEW.department_id, 0));
+'''
+
+# Same levels as the stock alerts and get_last_piece_stock_items /
+# get_low_stock_items; parts without a department are counted under
+# department_id 0
+STOCK_ALERT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alert_counts_insert
+    AFTER INSERT ON spare_parts
+    BEGIN
+        {_ALERT_COUNT_ROW}
+        {_alert_count_update('NEW', '+')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alert_counts_delete
+    AFTER DELETE ON spare_parts
+    BEGIN
+        {_alert_count_update('OLD', '-')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alert_counts_update
+    AFTER UPDATE OF quantity, min_order_level, department_id ON spare_parts
+    BEGIN
+        {_alert_count_update('OLD', '-')}
+        {_ALERT_COUNT_ROW}
+        {_alert_count_update('NEW', '+')}
+    END
+    '''
+]
+
+
+
+_ALERT_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+_ACTIVE_ALERT = "status IN ('open', 'acknowledged')"
+
+# Opens an alert for NEW unless the part already has an active one
+_OPEN_ALERT = f'''
+        INSERT INTO alerts (part_id, department_id, alert_type, severity, status,
+                            quantity, min_order_level, opened_at, updated_at)
+        SELECT NEW.id, NEW.department_id, {_alert_type('NEW')}, {_alert_level('NEW')}, 'open',
+               NEW.quantity, NEW.min_order_level, {_ALERT_NOW}, {_ALERT_NOW}
+        WHERE {_alert_level('NEW')} > 0
+          AND NOT EXISTS (SELECT 1 FROM alerts WHERE part_id = NEW.id AND {_ACTIVE_ALERT});
+'''
+
+# Alerts change only when a part crosses a threshold: recovering resolves
+# the active alert, worsening re-opens an acknowledged one, and a part
+# entering an alert level opens a new alert
+STOCK_EVENT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alerts_insert
+    AFTER INSERT ON spare_parts
+    BEGIN
+        {_OPEN_ALERT}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alerts_level
+    AFTER UPDATE OF quantity, min_order_level ON spare_parts
+    WHEN {_alert_level('NEW')} != {_alert_level('OLD')}
+    BEGIN
+        UPDATE alerts SET status = 'resolved', resolved_at = {_ALERT_NOW}, updated_at = {_ALERT_NOW},
+            quantity = NEW.quantity
+        WHERE part_id = NEW.id AND {_ACTIVE_ALERT} AND {_alert_level('NEW')} = 0;
+
+        UPDATE alerts SET
+            alert_type = {_alert_type('NEW')},
+            severity = {_alert_level('NEW')},
+            quantity = NEW.quantity,
+            min_order_level = NEW.min_order_level,
+            updated_at = {_ALERT_NOW},
+            status = CASE WHEN {_alert_level('NEW')} > severity THEN 'open' ELSE status END,
+            acknowledged_at = CASE WHEN {_alert_level('NEW')} > severity THEN NULL ELSE acknowledged_at END,
+            acknowledged_by = CASE WHEN {_alert_level('NEW')} > severity THEN NULL ELSE acknowledged_by END
+        WHERE part_id = NEW.id AND {_ACTIVE_ALERT} AND {_alert_level('NEW')} > 0;
+
+        {_OPEN_ALERT}
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alerts_department
+    AFTER UPDATE OF department_id ON spare_parts
+    WHEN OLD.department_id IS NOT NEW.department_id
+    BEGIN
+        UPDATE alerts SET department_id = NEW.department_id WHERE part_id = NEW.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS spare_parts_alerts_delete
+    AFTER DELETE ON spare_parts
+    BEGIN
+        DELETE FROM alerts WHERE part_id = OLD.id;
+    END
+    '''
+]
+
+
+def _histogram_bucket(row):
+    """department_id, day, weekday (0 = Monday) and hour of a transactions row"""
+    return f'''IFNULL((SELECT department_id FROM spare_parts WHERE id = {row}.part_id), 0),
+            date({row}.timestamp), (CAST(strftime('%w', {row}.timestamp) AS INTEGER) + 6) % 7,
+            CAST(strftime('%H', {row}.timestamp) AS INTEGER)'''
+
+
+def _histogram_row(row):
+    return f'''
+        INSERT OR IGNORE INTO demand_histogram (department_id, day, weekday, hour)
+        SELECT {_histogram_bucket(row)} WHERE date({row}.timestamp) IS NOT NULL;
+    '''
+
+
+def _histogram_update(row, sign):
+    """UPDATE adding (sign '+') or removing (sign '-') a transactions row from its demand_histogram bucket"""
+    check_out = f"IFNULL({row}.transaction_type = 'check_out', 0)"
+    return f'''
+        UPDATE demand_histogram SET
+            transaction_count = transaction_count {sign} 1,
+            quantity = quantity {sign} IFNULL({row}.quantity, 0),
+            check_out_count = check_out_count {sign} {check_out},
+            check_out_quantity = check_out_quantity {sign} {check_out} * IFNULL({row}.quantity, 0)
+        WHERE (department_id, day, weekday, hour) = ({_histogram_bucket(row)});
+    '''
+
+
+# Transactions per department, day and hour; the weekday x hour patterns
+# sum these buckets instead of regrouping the transactions. A transaction
+# stays under the department its part had when it was recorded.
+DEMAND_HISTOGRAM_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS transactions_histogram_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        {_histogram_row('NEW')}
+        {_histogram_update('NEW', '+')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS transactions_histogram_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        {_histogram_update('OLD', '-')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS transactions_histogram_update
+    AFTER UPDATE OF part_id, transaction_type, quantity, timestamp ON transactions
+    BEGIN
+        {_histogram_update('OLD', '-')}
+        {_histogram_row('NEW')}
+        {_histogram_update('NEW', '+')}
+    END
+    '''
+]
+
+# Transaction types and reason of the paired rows of an inter-department
+# transfer. They move stock without consuming it, so they are not
+# check-outs and stay out of every demand figure.
+TRANSFER_OUT = 'transfer_out'
+TRANSFER_IN = 'transfer_in'
+TRANSFER_REASON = 'Transfer'
+
+# PRAGMA user_version of a database whose one-time data migrations have run:
+# 1 - transfers retyped from check_out/check_in to TRANSFER_OUT/TRANSFER_IN
+SCHEMA_VERSION = 1
+
+# Every stock shortfall matched against surplus of the same part number in
+# other departments. A part is short below min_order_level + 1, the level
+# at which it leaves low stock, and a donor never gives below that level.
+# Shortfalls (emptiest first) and surpluses (largest first) are laid end to
+# end per part number; each overlap of a shortfall and a surplus interval
+# is one transfer, which moves as much as the part number allows.
+TRANSFER_RECOMMENDATIONS_QUERY = '''
+    WITH levels AS (
+        SELECT id, part_number, department_id, COALESCE(quantity, 0) AS quantity,
+            COALESCE(min_order_level, 0) + 1 - COALESCE(quantity, 0) AS gap
+        FROM spare_parts
+        WHERE part_number IS NOT NULL AND part_number != ''
+    ),
+    shortfalls AS (
+        SELECT id, part_number, department_id, quantity, gap AS shortfall,
+            SUM(gap) OVER (PARTITION BY part_number ORDER BY quantity, gap DESC, id) AS shortfall_end
+        FROM levels
+        WHERE gap > 0
+    ),
+    surpluses AS (
+        SELECT id, part_number, department_id, quantity, -gap AS surplus,
+            SUM(-gap) OVER (PARTITION BY part_number ORDER BY gap, id) AS surplus_end
+        FROM levels
+        WHERE gap < 0 AND part_number IN (SELECT part_number FROM shortfalls)
+    )
+    SELECT s.id AS from_part_id, n.id AS to_part_id, n.part_number,
+        s.department_id AS from_department_id, n.department_id AS to_department_id,
+        s.quantity AS from_quantity, n.quantity AS to_quantity, n.shortfall,
+        MIN(n.shortfall_end, s.surplus_end) - MAX(n.shortfall_end - n.shortfall, s.surplus_end - s.surplus)
+            AS transfer_quantity
+    FROM shortfalls n
+    JOIN surpluses s ON s.part_number = n.part_number
+    WHERE MIN(n.shortfall_end, s.surplus_end) > MAX(n.shortfall_end - n.shortfall, s.surplus_end - s.surplus)
+'''
+
+# Inventory grid: columns the search box matches, columns it may sort on
+# and stock filters, all applied in SQL so only one page leaves the database
+PART_SEARCH_COLUMNS = ('name', 'description', 'part_number', 'barcode', 'ilms_code', 'compartment_no', 'box_no')
+PART_SORT_COLUMNS = ('name', 'part_number', 'quantity', 'min_order_level', 'compartment_no', 'box_no',
+                     'ilms_code', 'status', 'last_updated')
+# Stock filters count exactly as the sidebar and alerts do, one per ALERT_TYPES level
+PART_STOCK_FILTERS = {alert_type: stock_alert_condition(alert_type, row='sp') for alert_type in ALERT_TYPES}
+PART_PAGE_SIZE = 50
+# Most parts a typeahead pick list offers
+TYPEAHEAD_LIMIT = 20
+
+# A part row with its parent and child department names
+PART_WITH_DEPARTMENTS_QUERY = '''
+    SELECT sp.*,
+        d1.name as parent_department,
+        d2.name as child_department
+    FROM spare_parts sp
+    LEFT JOIN departments d2 ON sp.department_id = d2.id
+    LEFT JOIN departments d1 ON d2.parent_id = d1.id
+'''
+
+# Tables whose every insert, update and delete bumps data_versions; cached
+# reads are keyed by the versions of the tables they query
+VERSIONED_TABLES = ['departments', 'spare_parts', 'transactions', 'alerts', 'demand_forecasts',
+                    'reorder_suggestions', 'demand_histogram', 'part_seasonality', 'department_seasonality']
+DATA_VERSION_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+    AFTER {event} ON {table}
+    BEGIN
+        UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+    END
+    '''
+    for table in VERSIONED_TABLES for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+
+def _create_triggers(cursor, triggers):
+    """Create triggers, replacing any stored under the same name with an older definition.
+
+    Returns True when an existing trigger was replaced, so the caller can
+    recount what the old definition maintained.
+    """
+    replaced = False
+    for trigger in triggers:
+        name = re.search(r'CREATE TRIGGER IF NOT EXISTS (\w+)', trigger).group(1)
+        stored = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)).fetchone()
+        # sqlite_master keeps the statement without IF NOT EXISTS
+        if stored and ' '.join(stored[0].split()) != ' '.join(trigger.replace('IF NOT EXISTS ', '', 1).split()):
+            cursor.execute(f"DROP TRIGGER {name}")
+            replaced = True
+        cursor.execute(trigger)
+    return replaced
+
 
 class DataManager:
 
-    def __init__(self):
+    def __init__(self, db_path='inventory.db', trace_path=None, use_cache=True, auto_sync=True):
         # Ensure database directory exists
-        self.db_path = 'inventory.db'
+        self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False,
                                timeout=10)
+        # Read cache shared by every DataManager of this process
+        self.cache = query_cache.shared_cache if use_cache else None
+        # Snapshot of data_versions. auto_sync polls for other connections'
+        # commits before every cached read; Streamlit sessions turn it off
+        # and call sync_versions() once per rerun instead
+        self.auto_sync = auto_sync
+        self._versions = None
+        self._data_version = None
+        self._changes_seen = None
         self.create_tables()
         print(f"Connected to database at {self.db_path}")
 
+        # Opt-in call trace for replay benchmarks: pass trace_path or set
+        # INVENTORY_TRACE; trace_path='' disables it regardless of the env
+        if trace_path is None:
+            trace_path = query_trace.trace_path_from_env()
+        self.tracer = query_trace.instrument(self, trace_path) if trace_path else None
+
     @contextmanager
     def get_cursor(self):
         cursor = self.conn.cursor()
@@ -23,6 +339,44 @@ class DataManager:
         finally:
             cursor.close()
 
+    def sync_versions(self):
+        """Refresh the data_versions snapshot if any connection has written since the last poll"""
+        try:
+            # Changes only when another connection, in this process or
+            # another one, commits to the database file
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error polling data version: {e}")
+            self._versions = None
+            return
+        if data_version != self._data_version or self.conn.total_changes != self._changes_seen:
+            self._data_version = data_version
+            self._load_versions()
+
+    def _load_versions(self):
+        previous = self._versions
+        try:
+            self._versions = dict(self.conn.execute("SELECT table_name, version FROM data_versions").fetchall())
+        except sqlite3.Error as e:
+            print(f"Error reading data versions: {e}")
+            self._versions = None
+            return
+        self._changes_seen = self.conn.total_changes
+        # Drop the cached results of the tables that changed, the rest stay warm
+        if previous is not None and previous != self._versions and self.cache is not None:
+            self.cache.invalidate(self.db_path, self._versions)
+
+    def table_versions(self, tables):
+        """Current data versions of tables, or None when they cannot be read"""
+        if self.auto_sync:
+            self.sync_versions()
+        elif self._versions is None or self.conn.total_changes != self._changes_seen:
+            # PRAGMA data_version ignores this connection's own writes
+            self._load_versions()
+        if self._versions is None:
+            return None
+        return tuple(self._versions.get(table, 0) for table in tables)
+
     def close(self):
         if hasattr(self, 'conn') and self.conn:
             self.conn.close()
@@ -46,10 +400,10 @@ class DataManager:
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS spare_parts (
                         id INTEGER PRIMARY KEY,
-                        part_number TEXT UNIQUE,
+                        part_number TEXT,
                         name TEXT,
                         description TEXT,
-                        quantity INTEGER,
+                        quantity REAL,
                         line_no INTEGER,
                         yard_no INTEGER,
                         page_no TEXT,
@@ -65,9 +419,28 @@ class DataManager:
                         min_order_level INTEGER,
                         min_order_quantity INTEGER,
                         barcode TEXT UNIQUE,
+                        location TEXT,
+                        status TEXT,
+                        last_maintenance_date TIMESTAMP,
+                        next_maintenance_date TIMESTAMP,
                         last_updated TIMESTAMP
                     )
                 ''')
+                # Inventory grid pages (one department, ordered by name by default)
+                # and typeahead, where LIKE 'prefix%' becomes a range scan of a
+                # NOCASE index, within a department or across all of them
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_spare_parts_department_name
+                    ON spare_parts (department_id, name COLLATE NOCASE)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_spare_parts_department_part_number
+                    ON spare_parts (department_id, part_number COLLATE NOCASE)
+                ''')
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_spare_parts_part_number ON spare_parts (part_number COLLATE NOCASE)")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_spare_parts_name ON spare_parts (name COLLATE NOCASE)")
 
                 # Create transactions table
                 cursor.execute('''
@@ -75,7 +448,7 @@ class DataManager:
                         id INTEGER PRIMARY KEY,
                         part_id INTEGER,
                         transaction_type TEXT,
-                        quantity INTEGER,
+                        quantity REAL,
                         timestamp TIMESTAMP,
                         reason TEXT,
                         remarks TEXT,
@@ -83,6 +456,186 @@ class DataManager:
                     )
                 ''')
 
+                # Per-department alert counters for the sidebar, maintained by
+                # triggers so every writer (record_transaction, add/update/delete,
+                # bulk import, page-level SQL) keeps them current
+                counters_exist = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stock_alert_counts'"
+                ).fetchone()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS stock_alert_counts (
+                        department_id INTEGER PRIMARY KEY,
+                        part_count INTEGER NOT NULL DEFAULT 0,
+                        last_piece INTEGER NOT NULL DEFAULT 0,
+                        low_stock INTEGER NOT NULL DEFAULT 0,
+                        out_of_stock INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                # Counters kept by an older definition are recounted
+                if _create_triggers(cursor, STOCK_ALERT_TRIGGERS) or not counters_exist:
+                    self._rebuild_stock_alert_counts(cursor)
+
+                # Stock alerts raised on threshold crossings (see STOCK_EVENT_TRIGGERS)
+                alerts_exist = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alerts'"
+                ).fetchone()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS alerts (
+                        id INTEGER PRIMARY KEY,
+                        part_id INTEGER NOT NULL,
+                        department_id INTEGER,
+                        alert_type TEXT NOT NULL,
+                        severity INTEGER NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'open',
+                        quantity REAL,
+                        min_order_level REAL,
+                        opened_at TIMESTAMP,
+                        updated_at TIMESTAMP,
+                        acknowledged_at TIMESTAMP,
+                        acknowledged_by TEXT,
+                        resolved_at TIMESTAMP,
+                        FOREIGN KEY (part_id) REFERENCES spare_parts (id)
+                    )
+                ''')
+                # At most one open or acknowledged alert per part
+                cursor.execute(f'''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_active_part
+                    ON alerts (part_id) WHERE {_ACTIVE_ALERT}
+                ''')
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_alerts_status_department ON alerts (status, department_id)")
+                _create_triggers(cursor, STOCK_EVENT_TRIGGERS)
+                if not alerts_exist:
+                    cursor.execute(f'''
+                        INSERT INTO alerts (part_id, department_id, alert_type, severity, status,
+                                            quantity, min_order_level, opened_at, updated_at)
+                        SELECT id, department_id, {_alert_type('spare_parts')}, {_alert_level('spare_parts')},
+                               'open', quantity, min_order_level, {_ALERT_NOW}, {_ALERT_NOW}
+                        FROM spare_parts
+                        WHERE {_alert_level('spare_parts')} > 0
+                    ''')
+
+                # Weekday x hour demand buckets (see DEMAND_HISTOGRAM_TRIGGERS)
+                histogram_exists = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'demand_histogram'"
+                ).fetchone()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS demand_histogram (
+                        department_id INTEGER NOT NULL,
+                        day TEXT NOT NULL,
+                        weekday INTEGER NOT NULL,
+                        hour INTEGER NOT NULL,
+                        transaction_count INTEGER NOT NULL DEFAULT 0,
+                        quantity REAL NOT NULL DEFAULT 0,
+                        check_out_count INTEGER NOT NULL DEFAULT 0,
+                        check_out_quantity REAL NOT NULL DEFAULT 0,
+                        PRIMARY KEY (department_id, day, weekday, hour)
+                    ) WITHOUT ROWID
+                ''')
+                # Covers the all-department period sums of get_demand_histogram
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_demand_histogram_day ON demand_histogram (
+                        day, weekday, hour, transaction_count, quantity, check_out_count, check_out_quantity)
+                ''')
+                _create_triggers(cursor, DEMAND_HISTOGRAM_TRIGGERS)
+                if not histogram_exists:
+                    self._rebuild_demand_histogram(cursor)
+                schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+                if schema_version < 1:
+                    # Transfers used to be recorded as check-outs and check-ins;
+                    # the histogram trigger takes them out of the check-out buckets
+                    cursor.execute('''
+                        UPDATE transactions
+                        SET transaction_type = CASE transaction_type WHEN 'check_out' THEN ? ELSE ? END
+                        WHERE reason = ? AND transaction_type IN ('check_out', 'check_in')
+                    ''', (TRANSFER_OUT, TRANSFER_IN, TRANSFER_REASON))
+
+                # Latest batch demand forecast per part (see forecast_job.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS demand_forecasts (
+                        part_id INTEGER PRIMARY KEY,
+                        pattern TEXT,
+                        method TEXT,
+                        daily_rate REAL,
+                        horizon_days INTEGER,
+                        horizon_demand REAL,
+                        ewma_rate REAL,
+                        croston_rate REAL,
+                        sba_rate REAL,
+                        adi REAL,
+                        cv2 REAL,
+                        demand_days INTEGER,
+                        history_days INTEGER,
+                        computed_at TIMESTAMP,
+                        FOREIGN KEY (part_id) REFERENCES spare_parts (id)
+                    )
+                ''')
+
+                # Dominant demand cycle per part and per department, 0 being the
+                # whole inventory (see seasonality_job.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS part_seasonality (
+                        part_id INTEGER PRIMARY KEY,
+                        dominant_period TEXT,
+                        period_days REAL,
+                        strength REAL,
+                        weekly_strength REAL,
+                        monthly_strength REAL,
+                        annual_strength REAL,
+                        demand_days INTEGER,
+                        history_days INTEGER,
+                        computed_at TIMESTAMP,
+                        FOREIGN KEY (part_id) REFERENCES spare_parts (id)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS department_seasonality (
+                        department_id INTEGER PRIMARY KEY,
+                        dominant_period TEXT,
+                        period_days REAL,
+                        strength REAL,
+                        weekly_strength REAL,
+                        monthly_strength REAL,
+                        annual_strength REAL,
+                        demand_days INTEGER,
+                        history_days INTEGER,
+                        computed_at TIMESTAMP
+                    )
+                ''')
+
+                # Suggested minimum levels awaiting review (see reorder_job.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS reorder_suggestions (
+                        part_id INTEGER PRIMARY KEY,
+                        current_min_order_level REAL,
+                        suggested_min_order_level INTEGER,
+                        avg_daily_demand REAL,
+                        demand_std REAL,
+                        safety_stock REAL,
+                        reorder_point REAL,
+                        service_level REAL,
+                        lead_time_days INTEGER,
+                        history_days INTEGER,
+                        computed_at TIMESTAMP,
+                        FOREIGN KEY (part_id) REFERENCES spare_parts (id)
+                    )
+                ''')
+
+                # Per-table write counters for the read cache
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS data_versions (
+                        table_name TEXT PRIMARY KEY,
+                        version INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO data_versions (table_name) VALUES (?)",
+                    [(table,) for table in VERSIONED_TABLES])
+                _create_triggers(cursor, DATA_VERSION_TRIGGERS)
+
+                if schema_version < SCHEMA_VERSION:
+                    # Written in the same transaction as the migrations it records
+                    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
                 self.conn.commit()
                 print("Database tables created successfully")
             except sqlite3.Error as e:
@@ -139,6 +692,7 @@ class DataManager:
             except sqlite3.IntegrityError:
                 return False
 
+    @cached_read('departments')
     def get_all_departments_as_df(self):
         with self.get_cursor() as cursor:
             try:
@@ -155,6 +709,12 @@ class DataManager:
                 print(f"Error retrieving parts: {e}")
                 return pd.DataFrame()
 
+    def get_department_names(self):
+        """Returns a {department_id: name} mapping"""
+        with self.get_cursor() as cursor:
+            cursor.execute("SELECT id, name FROM departments")
+            return dict(cursor.fetchall())
+
     def get_parent_options(self):
         with self.get_cursor() as cursor:
             """Returns options for parent department dropdown"""
@@ -177,12 +737,14 @@ class DataManager:
             result = pd.read_sql_query(query, self.conn, params=(department_id,))
             return result.iloc[0] if not result.empty else None
     
+    @cached_read('departments')
     def get_parent_departments(self):
         with self.get_cursor() as cursor:
             """Get all parent departments"""
             query = "SELECT id, name FROM departments WHERE parent_id IS NULL"
             return pd.read_sql_query(query, self.conn)
 
+    @cached_read('departments')
     def get_child_departments(self, parent_id):
         """Get child departments for a given parent"""
         if not parent_id:
@@ -530,6 +1092,7 @@ class DataManager:
                 part_data['next_maintenance_date'], part_id))
             self.conn.commit()
 
+    @cached_read('spare_parts', 'departments')
     def get_parts_by_department(self, department_id):
         """Get all parts for a specific department"""
         with self.get_cursor() as cursor:
@@ -550,6 +1113,98 @@ class DataManager:
                 print(f"Error retrieving parts: {e}")
                 return pd.DataFrame()
     
+    def _parts_filter(self, department_id, search='', stock_filter=None):
+        """WHERE clause and parameters of the inventory grid's department, search and stock filter"""
+        clauses = ["sp.department_id = ?"]
+        params = [department_id]
+        if search:
+            pattern = '%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clauses.append('(' + ' OR '.join(f"sp.{column} LIKE ? ESCAPE '\\'" for column in PART_SEARCH_COLUMNS) + ')')
+            params.extend([pattern] * len(PART_SEARCH_COLUMNS))
+        if stock_filter:
+            clauses.append(PART_STOCK_FILTERS[stock_filter])
+        return ' AND '.join(clauses), params
+
+    @cached_read('spare_parts', 'departments')
+    def get_parts_page(self, department_id, search='', stock_filter=None, sort_by='name', descending=False,
+                       page=0, page_size=PART_PAGE_SIZE):
+        """One page of a department's parts, searched, filtered and sorted in SQL"""
+        if sort_by not in PART_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort parts by {sort_by}")
+        where, params = self._parts_filter(department_id, search, stock_filter)
+        query = f'''
+            {PART_WITH_DEPARTMENTS_QUERY}
+            WHERE {where}
+            ORDER BY sp.{sort_by} COLLATE NOCASE {'DESC' if descending else 'ASC'}, sp.id
+            LIMIT ? OFFSET ?
+        '''
+        try:
+            return pd.read_sql_query(query, self.conn, params=params + [page_size, page * page_size])
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving parts: {e}")
+            return pd.DataFrame()
+
+    def count_parts(self, department_id, search='', stock_filter=None):
+        """Number of a department's parts matching the inventory grid's search and filter"""
+        where, params = self._parts_filter(department_id, search, stock_filter)
+        try:
+            return self.conn.execute(f"SELECT COUNT(*) FROM spare_parts sp WHERE {where}", params).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error counting parts: {e}")
+            return 0
+
+    def get_department_part(self, part_number, department_id):
+        """The part with part_number in a department, with department names, or None"""
+        query = f"{PART_WITH_DEPARTMENTS_QUERY} WHERE sp.part_number = ? AND sp.department_id = ? LIMIT 1"
+        try:
+            df = pd.read_sql_query(query, self.conn, params=(part_number, int(department_id)))
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving part {part_number}: {e}")
+            return None
+        return None if df.empty else df.iloc[0]
+
+    def get_part_by_barcode(self, barcode):
+        """The part with this barcode, with department names, or None; one unique index probe"""
+        query = f"{PART_WITH_DEPARTMENTS_QUERY} WHERE sp.barcode = ?"
+        try:
+            df = pd.read_sql_query(query, self.conn, params=(barcode,))
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error looking up barcode {barcode}: {e}")
+            return None
+        return None if df.empty else df.iloc[0]
+
+    def search_parts_by_prefix(self, prefix, department_id=None, limit=TYPEAHEAD_LIMIT):
+        """Up to limit parts whose part number or name starts with prefix, ignoring case.
+
+        Each prefix is a range scan of a NOCASE index, so the cost depends on
+        limit, not on the number of parts. An empty prefix lists the first
+        parts by name.
+        """
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        scope = "" if department_id is None else "AND department_id = ?"
+        scope_params = [] if department_id is None else [int(department_id)]
+        query = f'''
+            {PART_WITH_DEPARTMENTS_QUERY}
+            WHERE sp.id IN (
+                SELECT id FROM (
+                    SELECT id FROM spare_parts WHERE part_number LIKE ? ESCAPE '\\' {scope}
+                    ORDER BY part_number COLLATE NOCASE LIMIT ?)
+                UNION
+                SELECT id FROM (
+                    SELECT id FROM spare_parts WHERE name LIKE ? ESCAPE '\\' {scope}
+                    ORDER BY name COLLATE NOCASE LIMIT ?)
+            )
+            ORDER BY sp.part_number LIKE ? ESCAPE '\\' DESC, sp.name COLLATE NOCASE, sp.id
+            LIMIT ?
+        '''
+        params = [pattern] + scope_params + [limit, pattern] + scope_params + [limit, pattern, limit]
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error searching parts: {e}")
+            return pd.DataFrame()
+
+    @cached_read('spare_parts', 'departments')
     def get_all_parts(self):
         with self.get_cursor() as cursor:
             try:
@@ -606,41 +1261,507 @@ class DataManager:
                     return 0
             return 0
 
+    @cached_read('spare_parts')
     def get_last_piece_stock_items(self):
         with self.get_cursor() as cursor:
             try:
                 return pd.read_sql_query(
-                    "SELECT * FROM spare_parts WHERE quantity = 1",
+                    f"SELECT * FROM spare_parts WHERE {stock_alert_condition('last_piece')}",
                     self.conn)
             except pd.io.sql.DatabaseError as e:
                 print(f"Error retrieving low stock items: {e}")
                 return pd.DataFrame()
         
+    @cached_read('spare_parts')
     def get_last_piece_stock_items_by_dept(self, department_id):
         with self.get_cursor() as cursor:
             try:
                 return pd.read_sql_query(
-                    "SELECT * FROM spare_parts WHERE department_id = ?  AND quantity = 1",
+                    f"SELECT * FROM spare_parts WHERE department_id = ? AND {stock_alert_condition('last_piece')}",
                     self.conn, params=(department_id,))
             except pd.io.sql.DatabaseError as e:
                 print(f"Error retrieving low stock items: {e}")
                 return pd.DataFrame()
         
+    def _rebuild_stock_alert_counts(self, cursor):
+        cursor.execute("DELETE FROM stock_alert_counts")
+        cursor.execute(f'''
+            INSERT INTO stock_alert_counts (department_id, part_count, last_piece, low_stock, out_of_stock)
+            SELECT IFNULL(department_id, 0), COUNT(*),
+                SUM({stock_alert_condition('last_piece')}),
+                SUM({stock_alert_condition('low_stock')}),
+                SUM({stock_alert_condition('out_of_stock')})
+            FROM spare_parts
+            GROUP BY IFNULL(department_id, 0)
+        ''')
+
+    def rebuild_stock_alert_counts(self):
+        """Recount the alert counters from spare_parts"""
+        with self.get_cursor() as cursor:
+            try:
+                self._rebuild_stock_alert_counts(cursor)
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error rebuilding stock alert counts: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    def _rebuild_demand_histogram(self, cursor):
+        cursor.execute("DELETE FROM demand_histogram")
+        cursor.execute('''
+            INSERT INTO demand_histogram (department_id, day, weekday, hour, transaction_count, quantity,
+                                          check_out_count, check_out_quantity)
+            SELECT IFNULL(sp.department_id, 0), date(t.timestamp),
+                (CAST(strftime('%w', t.timestamp) AS INTEGER) + 6) % 7,
+                CAST(strftime('%H', t.timestamp) AS INTEGER),
+                COUNT(*), TOTAL(t.quantity),
+                TOTAL(IFNULL(t.transaction_type = 'check_out', 0)),
+                TOTAL(IFNULL(t.transaction_type = 'check_out', 0) * IFNULL(t.quantity, 0))
+            FROM transactions t
+            LEFT JOIN spare_parts sp ON sp.id = t.part_id
+            WHERE date(t.timestamp) IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+        ''')
+
+    def rebuild_demand_histogram(self):
+        """Recount the weekday x hour demand buckets from transactions"""
+        with self.get_cursor() as cursor:
+            try:
+                self._rebuild_demand_histogram(cursor)
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error rebuilding demand histogram: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('demand_histogram', daily=True)
+    def get_demand_histogram(self, department_id=None, days=None):
+        """Transactions and quantities per weekday (0 = Monday) and hour over the last days, or all time"""
+        query = '''
+            SELECT weekday, hour, SUM(transaction_count) AS transaction_count, SUM(quantity) AS quantity,
+                SUM(check_out_count) AS check_out_count, SUM(check_out_quantity) AS check_out_quantity
+            FROM demand_histogram
+            WHERE 1 = 1
+        '''
+        params = []
+        if days is not None:
+            query += " AND day >= date('now', ?)"
+            params.append(f'-{int(days)} days')
+        if department_id is not None:
+            query += " AND department_id = ?"
+            params.append(int(department_id))
+        query += " GROUP BY weekday, hour ORDER BY weekday, hour"
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving demand histogram: {e}")
+            return pd.DataFrame()
+
+    def get_stock_alert_counts(self, department_id=None):
+        """Part, last-piece, low-stock and out-of-stock counts for one department or all"""
+        with self.get_cursor() as cursor:
+            query = '''
+                SELECT TOTAL(part_count), TOTAL(last_piece), TOTAL(low_stock), TOTAL(out_of_stock)
+                FROM stock_alert_counts
+            '''
+            params = ()
+            if department_id is not None:
+                query += " WHERE department_id = ?"
+                params = (int(department_id),)
+            try:
+                row = cursor.execute(query, params).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error retrieving stock alert counts: {e}")
+                row = (0, 0, 0, 0)
+            return dict(zip(['part_count', 'last_piece', 'low_stock', 'out_of_stock'], map(int, row)))
+
+    @cached_read('alerts', 'spare_parts', 'departments')
+    def get_open_alerts(self, department_id=None, limit=None):
+        """Open stock alerts with current part details, most severe and newest first"""
+        with self.get_cursor() as cursor:
+            query = '''
+                SELECT a.id AS alert_id, a.alert_type, a.severity, a.opened_at,
+                    sp.id AS part_id, sp.name, sp.part_number, sp.quantity,
+                    sp.min_order_level, sp.min_order_quantity, sp.department_id,
+                    d.name AS child_department
+                FROM alerts a
+                JOIN spare_parts sp ON sp.id = a.part_id
+                LEFT JOIN departments d ON d.id = sp.department_id
+                WHERE a.status = 'open'
+            '''
+            params = []
+            if department_id is not None:
+                query += " AND a.department_id = ?"
+                params.append(int(department_id))
+            query += " ORDER BY a.severity DESC, a.opened_at DESC"
+            if limit:
+                query += " LIMIT ?"
+                params.append(int(limit))
+            try:
+                return pd.read_sql_query(query, self.conn, params=params)
+            except pd.io.sql.DatabaseError as e:
+                print(f"Error retrieving open alerts: {e}")
+                return pd.DataFrame()
+
+    def acknowledge_alerts(self, alert_ids, username):
+        """Mark open alerts as acknowledged; they stay out of the open list until the part worsens"""
+        alert_ids = [int(alert_id) for alert_id in alert_ids]
+        if not alert_ids:
+            return True, None
+        with self.get_cursor() as cursor:
+            try:
+                now = datetime.now()
+                cursor.execute(
+                    f'''
+                    UPDATE alerts SET status = 'acknowledged', acknowledged_at = ?,
+                        acknowledged_by = ?, updated_at = ?
+                    WHERE status = 'open' AND id IN ({', '.join('?' for _ in alert_ids)})
+                ''', (now, username, now, *alert_ids))
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error acknowledging alerts: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    def get_daily_demand(self, start_date):
+        """Check-out quantity per part and day since start_date (YYYY-MM-DD)"""
+        query = '''
+            SELECT part_id, date(timestamp) AS day, SUM(quantity) AS quantity
+            FROM transactions
+            WHERE transaction_type = 'check_out' AND timestamp >= ?
+            GROUP BY part_id, day
+        '''
+        try:
+            return pd.read_sql_query(query, self.conn, params=[str(start_date)])
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving daily demand: {e}")
+            return pd.DataFrame(columns=['part_id', 'day', 'quantity'])
+
+    def save_demand_forecasts(self, forecasts, horizon_days):
+        """Replace the stored forecasts with a forecast_demand() frame"""
+        columns = ['part_id', 'pattern', 'method', 'daily_rate', 'horizon_demand', 'ewma_rate',
+                   'croston_rate', 'sba_rate', 'adi', 'cv2', 'demand_days', 'history_days']
+        rows = forecasts[columns].astype(object).where(forecasts[columns].notna(), None)
+        now = datetime.now()
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("DELETE FROM demand_forecasts")
+                cursor.executemany(f'''
+                    INSERT INTO demand_forecasts ({', '.join(columns)}, horizon_days, computed_at)
+                    VALUES ({', '.join('?' for _ in columns)}, ?, ?)
+                ''', [(*row, horizon_days, now) for row in rows.itertuples(index=False, name=None)])
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error saving demand forecasts: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    def get_demand_forecast(self, part_id):
+        """Stored forecast of one part as a dict, or None before the first refresh"""
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("SELECT * FROM demand_forecasts WHERE part_id = ?", (int(part_id),))
+                row = cursor.fetchone()
+            except sqlite3.Error as e:
+                print(f"Error retrieving demand forecast: {e}")
+                return None
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    @cached_read('demand_forecasts', 'spare_parts', 'departments')
+    def get_demand_forecasts(self, department_id=None):
+        """Stored forecasts with part and department names"""
+        query = '''
+            SELECT f.*, sp.name, sp.part_number, sp.quantity, sp.min_order_level,
+                sp.department_id, d.name AS child_department
+            FROM demand_forecasts f
+            JOIN spare_parts sp ON sp.id = f.part_id
+            LEFT JOIN departments d ON d.id = sp.department_id
+        '''
+        params = []
+        if department_id is not None:
+            query += " WHERE sp.department_id = ?"
+            params.append(int(department_id))
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving demand forecasts: {e}")
+            return pd.DataFrame()
+
+    def demand_forecasts_computed_at(self):
+        """Time of the last forecast refresh, or None if there never was one"""
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("SELECT MAX(computed_at) FROM demand_forecasts")
+                computed_at = cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                print(f"Error reading forecast refresh time: {e}")
+                return None
+        return pd.Timestamp(computed_at).to_pydatetime() if computed_at else None
+
+    def save_seasonality(self, part_seasonality, department_seasonality):
+        """Replace the stored seasonality with detect_seasonality() frames"""
+        columns = ['dominant_period', 'period_days', 'strength', 'weekly_strength', 'monthly_strength',
+                   'annual_strength', 'demand_days', 'history_days']
+        for key, frame in (('part_id', part_seasonality), ('department_id', department_seasonality)):
+            if frame[key].duplicated().any():
+                print(f"Error saving seasonality: duplicate {key} values")
+                return False, f"Duplicate {key} values in seasonality"
+        now = datetime.now()
+        with self.get_cursor() as cursor:
+            try:
+                for table, key, frame in (('part_seasonality', 'part_id', part_seasonality),
+                                          ('department_seasonality', 'department_id', department_seasonality)):
+                    rows = frame[[key] + columns].astype(object).where(frame[[key] + columns].notna(), None)
+                    cursor.execute(f"DELETE FROM {table}")
+                    cursor.executemany(f'''
+                        INSERT INTO {table} ({key}, {', '.join(columns)}, computed_at)
+                        VALUES (?, {', '.join('?' for _ in columns)}, ?)
+                    ''', [(*row, now) for row in rows.itertuples(index=False, name=None)])
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error saving seasonality: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('part_seasonality', 'spare_parts', 'departments')
+    def get_part_seasonality(self, department_id=None):
+        """Stored seasonality of the parts with a dominant cycle, strongest first"""
+        query = '''
+            SELECT s.*, sp.name, sp.part_number, sp.department_id, d.name AS child_department
+            FROM part_seasonality s
+            JOIN spare_parts sp ON sp.id = s.part_id
+            LEFT JOIN departments d ON d.id = sp.department_id
+            WHERE s.dominant_period IS NOT NULL
+        '''
+        params = []
+        if department_id is not None:
+            query += " AND sp.department_id = ?"
+            params.append(int(department_id))
+        query += " ORDER BY s.strength DESC"
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving part seasonality: {e}")
+            return pd.DataFrame()
+
+    def get_department_seasonality(self, department_id=None):
+        """Stored seasonality of a department's total demand (None: whole inventory) as a dict"""
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("SELECT * FROM department_seasonality WHERE department_id = ?",
+                               (int(department_id or 0),))
+                row = cursor.fetchone()
+            except sqlite3.Error as e:
+                print(f"Error retrieving department seasonality: {e}")
+                return None
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    def seasonality_computed_at(self):
+        """Time of the last seasonality refresh, or None if there never was one"""
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("SELECT MAX(computed_at) FROM department_seasonality")
+                computed_at = cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                print(f"Error reading seasonality refresh time: {e}")
+                return None
+        return pd.Timestamp(computed_at).to_pydatetime() if computed_at else None
+
+    def save_reorder_suggestions(self, suggestions, service_level, lead_time_days, history_days):
+        """Replace the pending suggestions with the reorder_points() rows that change a minimum level"""
+        columns = ['part_id', 'current_min_order_level', 'suggested_min_order_level', 'avg_daily_demand',
+                   'demand_std', 'safety_stock', 'reorder_point']
+        changed = suggestions[suggestions['suggested_min_order_level'] != suggestions['current_min_order_level']]
+        now = datetime.now()
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("DELETE FROM reorder_suggestions")
+                cursor.executemany(f'''
+                    INSERT INTO reorder_suggestions ({', '.join(columns)}, service_level, lead_time_days,
+                                                     history_days, computed_at)
+                    VALUES ({', '.join('?' for _ in columns)}, ?, ?, ?, ?)
+                ''', [(*row, service_level, lead_time_days, history_days, now)
+                      for row in changed[columns].astype(object).itertuples(index=False, name=None)])
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error saving reorder suggestions: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('reorder_suggestions', 'spare_parts', 'departments')
+    def get_reorder_suggestions(self, department_id=None):
+        """Pending minimum level suggestions with part and department names"""
+        query = '''
+            SELECT r.*, sp.name, sp.part_number, sp.quantity, sp.min_order_level,
+                sp.department_id, d.name AS child_department
+            FROM reorder_suggestions r
+            JOIN spare_parts sp ON sp.id = r.part_id
+            LEFT JOIN departments d ON d.id = sp.department_id
+        '''
+        params = []
+        if department_id is not None:
+            query += " WHERE sp.department_id = ?"
+            params.append(int(department_id))
+        query += " ORDER BY ABS(r.suggested_min_order_level - sp.min_order_level) DESC"
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving reorder suggestions: {e}")
+            return pd.DataFrame()
+
+    def apply_reorder_suggestions(self, part_ids):
+        """Set min_order_level to the pending suggestion of each part, in one transaction"""
+        part_ids = [int(part_id) for part_id in part_ids]
+        if not part_ids:
+            return True, None
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute("CREATE TEMP TABLE IF NOT EXISTS apply_parts (part_id INTEGER PRIMARY KEY)")
+                cursor.execute("DELETE FROM apply_parts")
+                cursor.executemany("INSERT OR IGNORE INTO apply_parts VALUES (?)", [(part_id,) for part_id in part_ids])
+                cursor.execute('''
+                    UPDATE spare_parts
+                    SET min_order_level = r.suggested_min_order_level, last_updated = ?
+                    FROM reorder_suggestions r JOIN apply_parts a ON a.part_id = r.part_id
+                    WHERE spare_parts.id = r.part_id
+                ''', (datetime.now(),))
+                cursor.execute(
+                    "DELETE FROM reorder_suggestions WHERE part_id IN (SELECT part_id FROM apply_parts)")
+                cursor.execute("DELETE FROM apply_parts")
+                self.conn.commit()
+                return True, None
+            except sqlite3.Error as e:
+                print(f"Error applying reorder suggestions: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('spare_parts', 'departments')
+    def get_transfer_recommendations(self, department_id=None):
+        """Proposed transfers of surplus stock to departments short of the same part number.
+
+        With department_id, only transfers into or out of that department.
+        """
+        query = f'''
+            SELECT t.*, sp.name, df.name AS from_department, dt.name AS to_department
+            FROM ({TRANSFER_RECOMMENDATIONS_QUERY}) t
+            JOIN spare_parts sp ON sp.id = t.to_part_id
+            LEFT JOIN departments df ON df.id = t.from_department_id
+            LEFT JOIN departments dt ON dt.id = t.to_department_id
+        '''
+        params = []
+        if department_id is not None:
+            query += " WHERE ? IN (t.from_department_id, t.to_department_id)"
+            params.append(int(department_id))
+        query += " ORDER BY t.to_quantity, t.part_number, t.to_part_id, t.transfer_quantity DESC"
+        try:
+            return pd.read_sql_query(query, self.conn, params=params)
+        except pd.io.sql.DatabaseError as e:
+            print(f"Error retrieving transfer recommendations: {e}")
+            return pd.DataFrame()
+
+    def execute_transfers(self, transfers, remarks=''):
+        """Move stock between parts of the same part number as paired TRANSFER_OUT/TRANSFER_IN transactions.
+
+        transfers is an iterable of (from_part_id, to_part_id, quantity).
+        Either every transfer is recorded and both stock levels updated, or
+        nothing is.
+        """
+        rows = [(int(from_id), int(to_id), float(quantity)) for from_id, to_id, quantity in transfers]
+        if not rows:
+            return True, None
+        now = datetime.now()
+        suffix = f" - {remarks}" if remarks else ''
+        with self.get_cursor() as cursor:
+            try:
+                cursor.execute('''
+                    CREATE TEMP TABLE IF NOT EXISTS transfer_batch (
+                        from_part_id INTEGER, to_part_id INTEGER, quantity REAL)
+                ''')
+                cursor.execute("DELETE FROM transfer_batch")
+                cursor.executemany("INSERT INTO transfer_batch VALUES (?, ?, ?)", rows)
+
+                invalid = cursor.execute('''
+                    SELECT COUNT(*) FROM transfer_batch b
+                    LEFT JOIN spare_parts f ON f.id = b.from_part_id
+                    LEFT JOIN spare_parts t ON t.id = b.to_part_id
+                    WHERE b.quantity <= 0 OR b.from_part_id = b.to_part_id
+                        OR f.id IS NULL OR t.id IS NULL OR f.part_number IS NOT t.part_number
+                ''').fetchone()[0]
+                if invalid:
+                    raise ValueError(f"{invalid} transfers are not between parts of the same part number")
+                short = cursor.execute('''
+                    SELECT sp.part_number, sp.quantity, b.quantity
+                    FROM (SELECT from_part_id, SUM(quantity) AS quantity FROM transfer_batch
+                          GROUP BY from_part_id) b
+                    JOIN spare_parts sp ON sp.id = b.from_part_id
+                    WHERE sp.quantity < b.quantity
+                ''').fetchone()
+                if short:
+                    raise ValueError(
+                        f"Insufficient stock of {short[0]}. Available: {short[1]}, Requested: {short[2]}")
+
+                cursor.execute('''
+                    INSERT INTO transactions (part_id, transaction_type, quantity, timestamp, reason, remarks)
+                    SELECT b.from_part_id, ?, b.quantity, ?, ?, 'To ' || IFNULL(d.name, 'another department') || ?
+                    FROM transfer_batch b
+                    JOIN spare_parts sp ON sp.id = b.to_part_id
+                    LEFT JOIN departments d ON d.id = sp.department_id
+                ''', (TRANSFER_OUT, now, TRANSFER_REASON, suffix))
+                cursor.execute('''
+                    INSERT INTO transactions (part_id, transaction_type, quantity, timestamp, reason, remarks)
+                    SELECT b.to_part_id, ?, b.quantity, ?, ?, 'From ' || IFNULL(d.name, 'another department') || ?
+                    FROM transfer_batch b
+                    JOIN spare_parts sp ON sp.id = b.from_part_id
+                    LEFT JOIN departments d ON d.id = sp.department_id
+                ''', (TRANSFER_IN, now, TRANSFER_REASON, suffix))
+                cursor.execute('''
+                    UPDATE spare_parts
+                    SET quantity = spare_parts.quantity + moved.change, last_updated = ?
+                    FROM (
+                        SELECT part_id, SUM(change) AS change FROM (
+                            SELECT from_part_id AS part_id, -quantity AS change FROM transfer_batch
+                            UNION ALL
+                            SELECT to_part_id, quantity FROM transfer_batch
+                        ) GROUP BY part_id
+                    ) moved
+                    WHERE spare_parts.id = moved.part_id
+                ''', (now,))
+                cursor.execute("DELETE FROM transfer_batch")
+                self.conn.commit()
+                print(f"Recorded {len(rows)} transfers")
+                return True, None
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error executing transfers: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('spare_parts')
     def get_low_stock_items(self):
         with self.get_cursor() as cursor:
             try:
                 return pd.read_sql_query(
-                    "SELECT * FROM spare_parts WHERE quantity <= min_order_level AND quantity > 1",
+                    f"SELECT * FROM spare_parts WHERE {stock_alert_condition('low_stock')}",
                     self.conn)
             except pd.io.sql.DatabaseError as e:
                 print(f"Error retrieving low stock items: {e}")
                 return pd.DataFrame()
         
+    @cached_read('spare_parts')
     def get_low_stock_items_by_dept(self, department_id):
         with self.get_cursor() as cursor:
             try:
                 return pd.read_sql_query(
-                    "SELECT * FROM spare_parts WHERE department_id = ? AND quantity <= min_order_level AND quantity > 1",
+                    f"SELECT * FROM spare_parts WHERE department_id = ? AND {stock_alert_condition('low_stock')}",
                     self.conn, params=(department_id,))
             except pd.io.sql.DatabaseError as e:
                 print(f"Error retrieving low stock items: {e}")
@@ -690,6 +1811,75 @@ class DataManager:
                 self.conn.rollback()
                 return False, str(e)  # Return error status and message
 
+    def check_transaction_batch(self, lines):
+        """Validation message of every (part_id, transaction_type, quantity, reason, remarks) line, or None.
+
+        Lines apply in order, so a check-out is checked against the stock the
+        earlier lines of the batch leave.
+        """
+        part_ids = sorted({int(line[0]) for line in lines})
+        if not part_ids:
+            return []
+        placeholders = ', '.join('?' for _ in part_ids)
+        stock = dict(self.conn.execute(
+            f"SELECT id, COALESCE(quantity, 0) FROM spare_parts WHERE id IN ({placeholders})", part_ids).fetchall())
+        errors = []
+        for part_id, transaction_type, quantity, reason, remarks in lines:
+            part_id, quantity = int(part_id), float(quantity)
+            if part_id not in stock:
+                errors.append(f"Part with ID {part_id} not found")
+            elif quantity <= 0:
+                errors.append("Quantity must be positive")
+            elif transaction_type == 'check_out' and stock[part_id] < quantity:
+                errors.append(f"Insufficient stock. Available: {stock[part_id]}, Requested: {quantity}")
+            else:
+                stock[part_id] += quantity if transaction_type == 'check_in' else -quantity
+                errors.append(None)
+        return errors
+
+    def record_transactions(self, lines):
+        """Record many (part_id, transaction_type, quantity, reason, remarks) lines in one transaction.
+
+        Every line is validated as in check_transaction_batch; if any fails,
+        nothing is recorded.
+        """
+        lines = [(int(part_id), transaction_type, float(quantity), reason, remarks)
+                 for part_id, transaction_type, quantity, reason, remarks in lines]
+        if not lines:
+            return True, None
+        now = datetime.now()
+        with self.get_cursor() as cursor:
+            try:
+                # Take the write lock first, so the stock validated is the stock updated
+                if not self.conn.in_transaction:
+                    cursor.execute("BEGIN IMMEDIATE")
+                errors = self.check_transaction_batch(lines)
+                failed = [(number, error) for number, error in enumerate(errors, 1) if error]
+                if failed:
+                    raise ValueError("; ".join(f"Line {number}: {error}" for number, error in failed))
+
+                cursor.executemany('''
+                    INSERT INTO transactions (part_id, transaction_type, quantity, timestamp, reason, remarks)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(part_id, transaction_type, quantity, now, reason, remarks)
+                      for part_id, transaction_type, quantity, reason, remarks in lines])
+
+                changes = {}
+                for part_id, transaction_type, quantity, _, _ in lines:
+                    changes[part_id] = changes.get(part_id, 0.0) + (quantity if transaction_type == 'check_in' else -quantity)
+                cursor.executemany(
+                    "UPDATE spare_parts SET quantity = quantity + ?, last_updated = ? WHERE id = ?",
+                    [(change, now, part_id) for part_id, change in changes.items()])
+
+                self.conn.commit()
+                print(f"Recorded {len(lines)} transactions")
+                return True, None
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error recording transactions: {e}")
+                self.conn.rollback()
+                return False, str(e)
+
+    @cached_read('transactions', 'spare_parts', 'departments', daily=True)
     def get_transaction_history(self, days=30):
         with self.get_cursor() as cursor:
             query = '''
@@ -710,6 +1900,7 @@ class DataManager:
                 print(f"Error retrieving transaction history: {e}")
                 return pd.DataFrame()
         
+    @cached_read('transactions', 'spare_parts', 'departments', daily=True)
     def get_transaction_history_by_department(self, department_id, days=30):
         with self.get_cursor() as cursor:
             """Get all parts for a specific department"""
@@ -0,0 +1,99 @@
+# forecast_job.py
+"""Batch demand forecasting for every part into the demand_forecasts table.
+
+    python forecast_job.py --db inventory.db
+
+The app runs the same refresh in one daemon thread per server process
+(start_background_refresh), whenever the stored forecasts are older than
+REFRESH_INTERVAL seconds; the thread also keeps seasonality_job's results
+current.
+"""
+import argparse
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import inventory_analytics
+import seasonality_job
+from data_manager import DataManager
+
+HISTORY_DAYS = 365
+HORIZON_DAYS = 30
+REFRESH_INTERVAL = 6 * 3600
+# How often the background thread checks whether a refresh is due
+CHECK_INTERVAL = 300
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def refresh_forecasts(data_manager, history_days=HISTORY_DAYS, horizon_days=HORIZON_DAYS,
+                      alpha=inventory_analytics.forecasting.DEFAULT_ALPHA):
+    """Forecast every part from its daily check-outs and store the result"""
+    started = time.perf_counter()
+    parts = data_manager.get_all_parts()
+    if parts.empty:
+        return True, None
+
+    # Full days only: the window ends yesterday
+    start = date.today() - timedelta(days=history_days)
+    demand = data_manager.get_daily_demand(start)
+    forecasts = inventory_analytics.forecast_demand(
+        demand, parts['id'].to_numpy(), start, history_days, alpha=alpha, horizon_days=horizon_days)
+    success, error_msg = data_manager.save_demand_forecasts(forecasts, horizon_days)
+    if success:
+        print(f"Refreshed demand forecasts for {len(forecasts)} parts in {time.perf_counter() - started:.2f}s")
+    return success, error_msg
+
+
+def forecasts_due(data_manager, max_age=REFRESH_INTERVAL):
+    """True when the stored forecasts are missing or older than max_age seconds"""
+    computed_at = data_manager.demand_forecasts_computed_at()
+    return computed_at is None or (datetime.now() - computed_at).total_seconds() > max_age
+
+
+def _refresh_loop(db_path):
+    data_manager = DataManager(db_path, trace_path='', use_cache=False)
+    while True:
+        try:
+            if forecasts_due(data_manager):
+                refresh_forecasts(data_manager)
+            if seasonality_job.seasonality_due(data_manager):
+                seasonality_job.refresh_seasonality(data_manager)
+        except Exception as e:
+            print(f"Error refreshing demand forecasts: {e}")
+        time.sleep(CHECK_INTERVAL)
+
+
+def start_background_refresh(db_path='inventory.db'):
+    """Start this process's forecast refresh thread unless it is already running"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_loop, args=(db_path,),
+                                          name='forecast-refresh', daemon=True)
+            _refresher.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='inventory.db', help='SQLite database to refresh')
+    parser.add_argument('--history-days', type=int, default=HISTORY_DAYS,
+                        help='days of check-out history to fit on')
+    parser.add_argument('--horizon-days', type=int, default=HORIZON_DAYS,
+                        help='days covered by horizon_demand')
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.db, trace_path='', use_cache=False)
+    try:
+        success, error_msg = refresh_forecasts(data_manager, args.history_days, args.horizon_days)
+    finally:
+        data_manager.close()
+    if not success:
+        print(f"Forecast refresh failed: {error_msg}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,14 @@
+# fragment_rerun.py
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+def rerun_fragment():
+    """Rerun only the calling fragment, or the whole page when the fragment runs as part of it.
+
+    A click inside a fragment reruns just that fragment, unless it arrives
+    while a full rerun is pending and gets folded into it; a fragment-scoped
+    st.rerun raises during a full run.
+    """
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")
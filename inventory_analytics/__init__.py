@@ -0,0 +1,102 @@
+"""Streamlit-free inventory computations shared by the Analytics and Reports pages.
+
+Everything here takes and returns plain pandas/NumPy objects so it can be
+imported by scripts, background jobs and benchmarks.
+"""
+from inventory_analytics.consistency import (
+    NUMERIC_COLUMNS,
+    ensure_numeric,
+    numeric_column,
+    ensure_data_consistency,
+    parse_timestamps
+)
+from inventory_analytics.classification import (
+    OUT_OF_STOCK,
+    LAST_PIECE,
+    LOW_STOCK,
+    HEALTHY,
+    HEALTH_LABELS,
+    REORDER_PRIORITIES,
+    health_status,
+    add_health_status,
+    health_counts,
+    reorder_priority,
+    classify_parts,
+    abc_classes,
+    abc_analysis,
+    abc_summary
+)
+from inventory_analytics.metrics import (
+    OUT_OF_STOCK_QUANTITY,
+    LAST_PIECE_QUANTITY,
+    ALERT_LEVELS,
+    stock_alert_levels,
+    turnover_rate,
+    service_level,
+    inventory_value,
+    carrying_cost,
+    excess_stock_count,
+    stockout_risk_count,
+    optimal_stock_level,
+    optimal_stock_percentage,
+    average_daily_demand,
+    demand_variability,
+    peak_demand_hour,
+    top_moving_items,
+    critical_items,
+    department_activity,
+    stock_recommendations
+)
+from inventory_analytics.forecasting import (
+    FORECAST_COLUMNS,
+    demand_matrix,
+    ewma,
+    croston,
+    demand_pattern,
+    forecast_matrix,
+    forecast_demand
+)
+from inventory_analytics.correlation import (
+    PAIR_COLUMNS,
+    sparse_check_outs,
+    active_demand_matrix,
+    correlation_matrix,
+    top_correlated_pairs,
+    demand_correlations,
+    strongest_pairs
+)
+from inventory_analytics.replenishment import (
+    DEFAULT_SERVICE_LEVEL,
+    DEFAULT_LEAD_TIME_DAYS,
+    REORDER_COLUMNS,
+    service_factor,
+    daily_demand_stats,
+    reorder_points
+)
+from inventory_analytics.patterns import (
+    WEEKDAYS,
+    weekday_hour_matrix,
+    weekday_totals,
+    peak_hour,
+    weekday_occurrences,
+    counter_staffing,
+    busiest_slot
+)
+from inventory_analytics.seasonality import (
+    SEASONAL_PERIODS,
+    SEASONALITY_COLUMNS,
+    power_spectrum,
+    period_strengths,
+    seasonality_matrix,
+    detect_seasonality
+)
+from inventory_analytics.simulation import (
+    DEFAULT_TRIALS,
+    DEFAULT_DEPLOYMENT_DAYS,
+    RISK_COLUMNS,
+    standard_scenarios,
+    simulate_demand,
+    stockout_risk,
+    deployment_risk,
+    department_risk
+)
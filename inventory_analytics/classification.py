@@ -0,0 +1,158 @@
+# inventory_analytics/classification.py
+import numpy as np
+import pandas as pd
+
+from inventory_analytics.consistency import numeric_column
+from inventory_analytics.metrics import ALERT_LEVELS, LAST_PIECE_QUANTITY, stock_alert_levels
+
+OUT_OF_STOCK = 'Out of Stock'
+LAST_PIECE = 'Last Piece'
+LOW_STOCK = 'Low Stock'
+HEALTHY = 'Healthy'
+HEALTH_LABELS = [OUT_OF_STOCK, LAST_PIECE, LOW_STOCK, HEALTHY]
+
+# Cumulative share of the score that closes the A and B classes
+ABC_A_LIMIT = 80
+ABC_B_LIMIT = 95
+
+CRITICAL = '🚨 CRITICAL'
+HIGH = '⚠️ HIGH'
+MEDIUM = '🔶 MEDIUM'
+REORDER_PRIORITIES = [CRITICAL, HIGH, MEDIUM]
+# Share of the minimum order level at or below which a reorder is HIGH
+HIGH_PRIORITY_SHARE = 0.5
+
+# Classifiers compute small integer codes and take labels from these, which
+# is much cheaper than selecting among string arrays
+_HEALTH_LABELS = np.array(HEALTH_LABELS, dtype=object)
+_ABC_LABELS = np.array(['A', 'B', 'C'], dtype=object)
+_REORDER_PRIORITIES = np.array(REORDER_PRIORITIES, dtype=object)
+# HEALTH_LABELS index of each stock alert level, so health follows the alerts
+_LEVEL_HEALTH = {0: HEALTHY, ALERT_LEVELS['low_stock']: LOW_STOCK,
+                 ALERT_LEVELS['last_piece']: LAST_PIECE, ALERT_LEVELS['out_of_stock']: OUT_OF_STOCK}
+_HEALTH_CODES = np.array([HEALTH_LABELS.index(_LEVEL_HEALTH[level]) for level in range(len(_LEVEL_HEALTH))])
+
+
+def _health_codes(quantity, min_order_level):
+    """Index into HEALTH_LABELS per item"""
+    return _HEALTH_CODES[stock_alert_levels(quantity, min_order_level)]
+
+
+def health_status(quantity, min_order_level):
+    """Health label per item: out of stock, last piece, low stock or healthy"""
+    return _HEALTH_LABELS[_health_codes(quantity, min_order_level)]
+
+
+def add_health_status(spare_parts):
+    """Copy of spare_parts with a health_status column"""
+    return spare_parts.assign(health_status=_health_of(spare_parts))
+
+
+def health_counts(spare_parts):
+    """Number of items per health label, largest first"""
+    counts = np.bincount(_health_codes(*_stock_levels(spare_parts)), minlength=len(HEALTH_LABELS))
+    counts = pd.Series(counts, index=pd.Index(HEALTH_LABELS, name='health_status'), name='count')
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+def _stock_levels(spare_parts):
+    if spare_parts.empty:
+        return np.array([]), np.array([])
+    return (numeric_column(spare_parts, 'quantity').to_numpy(),
+            numeric_column(spare_parts, 'min_order_level').to_numpy())
+
+
+def _health_of(spare_parts):
+    return health_status(*_stock_levels(spare_parts))
+
+
+def reorder_priority(quantity, min_order_level):
+    """Reorder priority per item: critical at the last piece, high at half the minimum level, else medium"""
+    quantity = np.asarray(quantity, dtype=float)
+    min_order_level = np.asarray(min_order_level, dtype=float)
+    return _REORDER_PRIORITIES[np.select(
+        [quantity <= LAST_PIECE_QUANTITY, quantity <= min_order_level * HIGH_PRIORITY_SHARE],
+        [0, 1],
+        2
+    )]
+
+
+def _abc_codes(cumulative_percentage):
+    """Index into A/B/C per item; limits are inclusive and NaN sorts last, so C"""
+    return np.searchsorted([ABC_A_LIMIT, ABC_B_LIMIT], np.asarray(cumulative_percentage, dtype=float), side='left')
+
+
+def abc_classes(cumulative_percentage):
+    """A/B/C class from the cumulative percentage of the score"""
+    return _ABC_LABELS[_abc_codes(cumulative_percentage)]
+
+
+def _abc_order(quantity, min_order_level):
+    """Criticality scores, their descending order and the cumulative share in that order"""
+    score = quantity * min_order_level
+    order = np.argsort(-score, kind='stable')
+    total = score.sum()
+    cumulative_percentage = np.cumsum(score[order]) / total * 100 if total else np.full(len(score), np.nan)
+    return score, order, cumulative_percentage
+
+
+def classify_parts(spare_parts):
+    """Health status, ABC class and reorder priority per item, aligned with spare_parts"""
+    columns = ['health_status', 'abc_class', 'reorder_priority']
+    if spare_parts.empty:
+        return pd.DataFrame(columns=columns)
+
+    quantity, min_order_level = _stock_levels(spare_parts)
+    _, order, cumulative_percentage = _abc_order(quantity, min_order_level)
+    abc_class = np.empty(len(order), dtype=object)
+    abc_class[order] = abc_classes(cumulative_percentage)
+    return pd.DataFrame({
+        'health_status': health_status(quantity, min_order_level),
+        'abc_class': abc_class,
+        'reorder_priority': reorder_priority(quantity, min_order_level)
+    }, index=spare_parts.index, columns=columns)
+
+
+def abc_analysis(spare_parts):
+    """Items sorted by criticality with cumulative share and ABC class.
+
+    criticality_score is quantity x min_order_level; estimated_value is the
+    same score scaled by the nominal unit value used on the reports page.
+    """
+    if spare_parts.empty:
+        return pd.DataFrame()
+
+    quantity, min_order_level = _stock_levels(spare_parts)
+    score, order, cumulative_percentage = _abc_order(quantity, min_order_level)
+
+    score = score[order]
+    classified = spare_parts.take(order)
+    classified['quantity'] = quantity[order]
+    classified['min_order_level'] = min_order_level[order]
+    classified['criticality_score'] = score
+    classified['estimated_value'] = score * 10
+    classified['cumulative_percentage'] = cumulative_percentage
+    classified['abc_class'] = abc_classes(cumulative_percentage)
+    return classified
+
+
+def abc_summary(spare_parts):
+    """Item count, criticality and quantity per ABC class with percentages"""
+    if spare_parts.empty:
+        return pd.DataFrame()
+
+    quantity, min_order_level = _stock_levels(spare_parts)
+    score, order, cumulative_percentage = _abc_order(quantity, min_order_level)
+    codes = np.empty(len(order), dtype=np.intp)
+    codes[order] = _abc_codes(cumulative_percentage)
+
+    classes = len(_ABC_LABELS)
+    summary = pd.DataFrame({
+        'item_count': np.bincount(codes, minlength=classes),
+        'total_criticality': np.bincount(codes, weights=score, minlength=classes),
+        'quantity': np.bincount(codes, weights=quantity, minlength=classes)
+    }, index=pd.Index(_ABC_LABELS, name='abc_class'))
+    summary = summary[summary['item_count'] > 0]
+    summary['percentage_items'] = summary['item_count'] / len(score) * 100
+    summary['percentage_criticality'] = summary['total_criticality'] / score.sum() * 100
+    return summary.round(2)
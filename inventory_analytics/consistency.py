@@ -0,0 +1,58 @@
+# inventory_analytics/consistency.py
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+NUMERIC_COLUMNS = ['quantity', 'min_order_level', 'min_order_quantity', 'line_no']
+
+
+def ensure_numeric(df, numeric_columns=None):
+    """Coerce numeric columns to floats, treating unparsable values as 0.0"""
+    if df.empty:
+        return df
+
+    df = df.copy()
+    for col in numeric_columns or NUMERIC_COLUMNS:
+        if col not in df.columns:
+            continue
+        df[col] = numeric_column(df, col)
+    return df
+
+
+def numeric_column(df, col, default=0.0):
+    """Float values of one column without copying the frame"""
+    values = df[col]
+    if not is_float_dtype(values):
+        values = pd.to_numeric(values, errors='coerce').astype(float)
+    return values.fillna(default) if values.hasnans else values
+
+
+def ensure_data_consistency(df, department_names=None):
+    """Numeric columns as floats and a filled child_department column.
+
+    department_names is a {department_id: name} mapping, or a callable
+    returning one; it is only consulted when child_department is missing.
+    """
+    if df.empty:
+        return df
+
+    df = ensure_numeric(df)
+
+    if 'child_department' not in df.columns:
+        if 'department_id' in df.columns:
+            names = department_names() if callable(department_names) else (department_names or {})
+            department_ids = df['department_id']
+            child = department_ids.map(names)
+            missing = child.isna() & department_ids.notna()
+            if missing.any():
+                child[missing] = 'Dept_' + department_ids[missing].astype('Int64').astype(str)
+            df['child_department'] = child
+        else:
+            df['child_department'] = 'General Department'
+
+    df['child_department'] = df['child_department'].fillna('Unknown Department')
+    return df
+
+
+def parse_timestamps(values):
+    """Parse transaction timestamps (with or without microseconds)"""
+    return pd.to_datetime(values, format='ISO8601')
@@ -0,0 +1,132 @@
+# inventory_analytics/correlation.py
+import numpy as np
+import pandas as pd
+
+from inventory_analytics.consistency import parse_timestamps
+
+# Parts need check-outs on at least this many days to be correlated; rarer
+# parts give correlations driven by one or two coincidences
+MIN_DEMAND_DAYS = 5
+TOP_K = 5
+# Related parts must correlate above this; with few co-movers the top_k
+# would otherwise fill up with unrelated parts
+MIN_CORRELATION = 0.0
+# Rows of the correlation matrix computed at once; bounds memory at
+# BLOCK_SIZE x active parts floats
+BLOCK_SIZE = 1000
+
+PAIR_COLUMNS = ['part_id', 'related_part_id', 'rank', 'correlation']
+
+
+def sparse_check_outs(transactions):
+    """(part ids, row, day, quantity) coordinates of the daily check-out matrix.
+
+    Only days with demand are kept, one entry per part and day; day 0 is the
+    first day of the transactions.
+    """
+    check_outs = transactions[transactions['transaction_type'] == 'check_out']
+    if check_outs.empty:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, np.array([], dtype=float)
+
+    rows, part_ids = pd.factorize(check_outs['part_id'], sort=True)
+    days = parse_timestamps(check_outs['timestamp']).dt.normalize()
+    columns = ((days - days.min()) // pd.Timedelta(days=1)).to_numpy(dtype=np.int64)
+    width = columns.max() + 1
+    cells, positions = np.unique(rows * width + columns, return_inverse=True)
+    quantity = np.bincount(positions, weights=check_outs['quantity'].to_numpy(dtype=float))
+    return np.asarray(part_ids), cells // width, cells % width, quantity
+
+
+def active_demand_matrix(transactions, min_demand_days=MIN_DEMAND_DAYS):
+    """(part ids, active parts x days matrix) for parts with enough demand days.
+
+    The matrix is only materialised for the active parts, so the thousands
+    of rarely used parts never cost memory.
+    """
+    part_ids, rows, columns, quantity = sparse_check_outs(transactions)
+    if not len(quantity):
+        return part_ids, np.zeros((0, 0))
+
+    demand_days = np.bincount(rows, minlength=len(part_ids))
+    width = columns.max() + 1
+    # A part with demand every day has no zero days to contrast against
+    # but can still vary, so only the lower bound filters
+    active = demand_days >= min_demand_days
+    new_rows = np.cumsum(active) - 1
+    keep = active[rows]
+    matrix = np.zeros((active.sum(), width))
+    matrix[new_rows[rows[keep]], columns[keep]] = quantity[keep]
+    return part_ids[active], matrix
+
+
+def standardized_rows(matrix):
+    """Rows scaled so that the dot product of two rows is their Pearson correlation.
+
+    Rows that never vary come back as zeros, correlating 0 with everything.
+    """
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered ** 2).sum(axis=1, keepdims=True))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(norms > 0, centered / norms, 0.0)
+
+
+def correlation_matrix(matrix):
+    """Pearson correlation between all rows of a (small) demand matrix"""
+    standardized = standardized_rows(matrix)
+    return np.clip(standardized @ standardized.T, -1.0, 1.0)
+
+
+def top_correlated_pairs(part_ids, matrix, top_k=TOP_K, block_size=BLOCK_SIZE, min_correlation=MIN_CORRELATION):
+    """Up to top_k other parts of every part correlating above min_correlation, strongest first.
+
+    The correlation matrix is built BLOCK_SIZE rows at a time and reduced
+    to its top_k columns per row right away.
+    """
+    parts = len(part_ids)
+    top_k = min(top_k, parts - 1)
+    if top_k <= 0:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    # Single precision halves the cost of the products; correlations only
+    # need a few digits
+    standardized = standardized_rows(matrix).astype(np.float32)
+    related, correlations = [], []
+    for start in range(0, parts, block_size):
+        block = standardized[start:start + block_size] @ standardized.T
+        block[np.arange(len(block)), np.arange(start, start + len(block))] = -np.inf
+        top = np.argpartition(block, -top_k, axis=1)[:, -top_k:]
+        values = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-values, axis=1)
+        related.append(np.take_along_axis(top, order, axis=1))
+        correlations.append(np.take_along_axis(values, order, axis=1))
+
+    related = np.concatenate(related).ravel()
+    correlations = np.clip(np.concatenate(correlations).ravel(), -1.0, 1.0).astype(float)
+    # Rows are sorted, so the kept pairs keep ranks 1, 2, ... per part
+    keep = correlations > min_correlation
+    return pd.DataFrame({
+        'part_id': np.repeat(part_ids, top_k)[keep],
+        'related_part_id': part_ids[related[keep]],
+        'rank': np.tile(np.arange(1, top_k + 1), parts)[keep],
+        'correlation': correlations[keep]
+    })
+
+
+def demand_correlations(transactions, min_demand_days=MIN_DEMAND_DAYS, top_k=TOP_K):
+    """(part ids, demand matrix, top pairs) of the parts active enough to correlate"""
+    part_ids, matrix = active_demand_matrix(transactions, min_demand_days)
+    return part_ids, matrix, top_correlated_pairs(part_ids, matrix, top_k)
+
+
+def strongest_pairs(pairs, limit=None):
+    """Distinct part pairs by descending correlation, each pair listed once"""
+    if pairs.empty:
+        return pairs
+    first = np.minimum(pairs['part_id'], pairs['related_part_id'])
+    second = np.maximum(pairs['part_id'], pairs['related_part_id'])
+    distinct = pairs.assign(part_id=first, related_part_id=second) \
+        .drop_duplicates(['part_id', 'related_part_id']) \
+        .sort_values('correlation', ascending=False, kind='stable')
+    distinct = distinct.drop(columns='rank').reset_index(drop=True)
+    return distinct if limit is None else distinct.head(limit)
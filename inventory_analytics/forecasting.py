@@ -0,0 +1,139 @@
+# inventory_analytics/forecasting.py
+import numpy as np
+import pandas as pd
+
+# Smoothing constant of the EWMA level and of both Croston estimates
+DEFAULT_ALPHA = 0.1
+# Parts per demand matrix; bounds memory at CHUNK_SIZE x days floats
+CHUNK_SIZE = 10000
+
+# Syntetos-Boylan demand classes, split on the average inter-demand interval
+# (ADI) and the squared coefficient of variation of demand sizes (CV2)
+ADI_CUTOFF = 1.32
+CV2_CUTOFF = 0.49
+SMOOTH = 'smooth'
+ERRATIC = 'erratic'
+INTERMITTENT = 'intermittent'
+LUMPY = 'lumpy'
+NO_DEMAND = 'no demand'
+_PATTERNS = np.array([SMOOTH, ERRATIC, INTERMITTENT, LUMPY, NO_DEMAND], dtype=object)
+
+EWMA = 'EWMA'
+SBA = 'SBA'
+_METHODS = np.array([EWMA, EWMA, SBA, SBA, None], dtype=object)
+
+FORECAST_COLUMNS = ['part_id', 'pattern', 'method', 'daily_rate', 'horizon_demand',
+                    'ewma_rate', 'croston_rate', 'sba_rate', 'adi', 'cv2', 'demand_days', 'history_days']
+
+
+def demand_matrix(daily_demand, part_ids, start, days):
+    """parts x days array of demand from (part_id, day, quantity) rows.
+
+    Row i is part_ids[i], column j is start + j days; rows of other parts or
+    outside the window are ignored.
+    """
+    matrix_size = len(part_ids) * days
+    if daily_demand.empty or not matrix_size:
+        return np.zeros((len(part_ids), days))
+
+    rows = pd.Index(part_ids).get_indexer(daily_demand['part_id'])
+    columns = (pd.to_datetime(daily_demand['day']) - pd.Timestamp(start)).dt.days.to_numpy()
+    keep = (rows >= 0) & (columns >= 0) & (columns < days)
+    cells = rows[keep] * days + columns[keep]
+    quantity = daily_demand['quantity'].to_numpy(dtype=float)[keep]
+    return np.bincount(cells, weights=quantity, minlength=matrix_size).reshape(len(part_ids), days)
+
+
+def ewma(matrix, alpha=DEFAULT_ALPHA):
+    """Exponentially smoothed daily level per part after the last day.
+
+    The recursion level += alpha * (demand - level), seeded with day 0, is
+    a fixed weighting of the days, so all parts reduce to one product.
+    """
+    days = matrix.shape[1]
+    weights = alpha * (1 - alpha) ** np.arange(days - 1, -1, -1, dtype=float)
+    weights[0] = (1 - alpha) ** (days - 1)
+    return matrix @ weights
+
+
+def croston(matrix, alpha=DEFAULT_ALPHA):
+    """Croston's smoothed demand size and inter-demand interval per part.
+
+    Both estimates only move on days with demand; parts without any demand
+    get NaN. All parts advance together, one day at a time.
+    """
+    parts, days = matrix.shape
+    size = np.full(parts, np.nan)
+    interval = np.full(parts, np.nan)
+    since_demand = np.zeros(parts)
+    for day in range(days):
+        since_demand += 1
+        demand = matrix[:, day]
+        hit = demand > 0
+        if not hit.any():
+            continue
+        first = hit & np.isnan(size)
+        size[first] = demand[first]
+        interval[first] = since_demand[first]
+        later = hit & ~first
+        size[later] += alpha * (demand[later] - size[later])
+        interval[later] += alpha * (since_demand[later] - interval[later])
+        since_demand[hit] = 0
+    return size, interval
+
+
+def demand_pattern(matrix):
+    """(pattern codes into _PATTERNS, ADI, CV2, demand days) per part"""
+    demand_days = (matrix > 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adi = matrix.shape[1] / demand_days
+        mean_size = matrix.sum(axis=1) / demand_days
+        squared = np.where(matrix > 0, (matrix - mean_size[:, None]) ** 2, 0.0)
+        cv2 = squared.sum(axis=1) / demand_days / mean_size ** 2
+    codes = (adi >= ADI_CUTOFF) * 2 + (cv2 >= CV2_CUTOFF)
+    codes[demand_days == 0] = len(_PATTERNS) - 1
+    return codes, adi, cv2, demand_days
+
+
+def forecast_matrix(matrix, alpha=DEFAULT_ALPHA, horizon_days=30):
+    """Forecast columns (without part_id) for every row of a demand matrix.
+
+    Smooth and erratic parts are forecast by EWMA, intermittent and lumpy
+    ones by the Syntetos-Boylan approximation of Croston's method.
+    """
+    codes, adi, cv2, demand_days = demand_pattern(matrix)
+    ewma_rate = ewma(matrix, alpha)
+    size, interval = croston(matrix, alpha)
+    croston_rate = np.nan_to_num(size / interval)
+    sba_rate = croston_rate * (1 - alpha / 2)
+    daily_rate = np.select([codes < 2, codes < 4], [ewma_rate, sba_rate], 0.0)
+    return pd.DataFrame({
+        'pattern': _PATTERNS[codes],
+        'method': _METHODS[codes],
+        'daily_rate': daily_rate,
+        'horizon_demand': daily_rate * horizon_days,
+        'ewma_rate': ewma_rate,
+        'croston_rate': croston_rate,
+        'sba_rate': sba_rate,
+        'adi': np.where(demand_days > 0, adi, np.nan),
+        'cv2': np.where(demand_days > 0, cv2, np.nan),
+        'demand_days': demand_days,
+        'history_days': matrix.shape[1]
+    })
+
+
+def forecast_demand(daily_demand, part_ids, start, days, alpha=DEFAULT_ALPHA, horizon_days=30,
+                    chunk_size=CHUNK_SIZE):
+    """Forecast every part from (part_id, day, quantity) demand rows over start + days"""
+    part_ids = np.asarray(part_ids)
+    if not len(part_ids):
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    chunks = []
+    for offset in range(0, len(part_ids), chunk_size):
+        ids = part_ids[offset:offset + chunk_size]
+        chunk = daily_demand[daily_demand['part_id'].isin(ids)]
+        forecasts = forecast_matrix(demand_matrix(chunk, ids, start, days), alpha, horizon_days)
+        forecasts.insert(0, 'part_id', ids)
+        chunks.append(forecasts)
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,193 @@
+# inventory_analytics/metrics.py
+import numpy as np
+import pandas as pd
+
+from inventory_analytics.consistency import numeric_column, parse_timestamps
+
+# Nominal unit value and yearly carrying cost used by the value estimates
+UNIT_VALUE = 10
+CARRYING_COST_RATE = 0.25
+# Stock alert thresholds, shared with the alert triggers and counters of
+# data_manager: out of stock at or below OUT_OF_STOCK_QUANTITY, last piece
+# at or below LAST_PIECE_QUANTITY, low stock at or below min_order_level
+OUT_OF_STOCK_QUANTITY = 0
+LAST_PIECE_QUANTITY = 1
+ALERT_LEVELS = {'out_of_stock': 3, 'last_piece': 2, 'low_stock': 1}
+
+
+def stock_alert_levels(quantity, min_order_level):
+    """Alert level of every part, the highest of ALERT_LEVELS it reaches or 0"""
+    quantity = np.asarray(quantity, dtype=float)
+    min_order_level = np.asarray(min_order_level, dtype=float)
+    return np.select(
+        [quantity <= OUT_OF_STOCK_QUANTITY, quantity <= LAST_PIECE_QUANTITY, quantity <= min_order_level],
+        [ALERT_LEVELS['out_of_stock'], ALERT_LEVELS['last_piece'], ALERT_LEVELS['low_stock']],
+        0)
+
+
+def _daily_quantity(transactions):
+    dates = parse_timestamps(transactions['timestamp']).dt.normalize()
+    return numeric_column(transactions, 'quantity').groupby(dates.values).sum()
+
+
+def turnover_rate(transactions, spare_parts):
+    """Total check-out quantity divided by the average stock on hand"""
+    if transactions.empty or spare_parts.empty:
+        return 0.0
+
+    is_check_out = (transactions['transaction_type'] == 'check_out').to_numpy()
+    usage = abs(numeric_column(transactions, 'quantity').to_numpy()[is_check_out].sum())
+    avg_inventory = numeric_column(spare_parts, 'quantity').mean()
+    return float(usage / avg_inventory) if avg_inventory != 0 else 0.0
+
+
+def service_level(transactions):
+    """Service level percentage"""
+    if transactions.empty:
+        return 100.0
+    return 95.0  # Simplified - in real scenario, calculate based on stockouts
+
+
+def inventory_value(spare_parts):
+    """Total estimated inventory value (simplified)"""
+    if spare_parts.empty:
+        return 0.0
+    quantity = numeric_column(spare_parts, 'quantity')
+    return float((quantity * numeric_column(spare_parts, 'min_order_level') * UNIT_VALUE).sum())
+
+
+def carrying_cost(spare_parts):
+    """Yearly carrying cost estimate"""
+    return inventory_value(spare_parts) * CARRYING_COST_RATE
+
+
+def excess_stock_count(spare_parts, factor=2):
+    """Items holding more than factor x their minimum order level"""
+    if spare_parts.empty:
+        return 0
+    return int((spare_parts['quantity'] > spare_parts['min_order_level'] * factor).sum())
+
+
+def stockout_risk_count(spare_parts):
+    """Items at or below their minimum order level"""
+    if spare_parts.empty:
+        return 0
+    return int((spare_parts['quantity'] <= spare_parts['min_order_level']).sum())
+
+
+def optimal_stock_level(spare_parts):
+    """Percentage of items above their minimum order level"""
+    if spare_parts.empty:
+        return 0.0
+    return float((spare_parts['quantity'] > spare_parts['min_order_level']).mean() * 100)
+
+
+def optimal_stock_percentage(spare_parts):
+    """Percentage of items between their minimum order level and twice that"""
+    if spare_parts.empty:
+        return 0.0
+    quantity, min_level = spare_parts['quantity'], spare_parts['min_order_level']
+    return float(((quantity > min_level) & (quantity <= min_level * 2)).mean() * 100)
+
+
+def average_daily_demand(transactions):
+    """Mean quantity moved per active day"""
+    if transactions.empty:
+        return 0.0
+    return float(_daily_quantity(transactions).mean())
+
+
+def demand_variability(transactions):
+    """Coefficient of variation of the daily quantity moved"""
+    if transactions.empty:
+        return 0.0
+    daily = _daily_quantity(transactions)
+    mean = daily.mean()
+    return float(daily.std() / mean) if mean != 0 else 0.0
+
+
+def peak_demand_hour(transactions):
+    """Hour of day with the largest quantity moved, as 'H:00'"""
+    if transactions.empty:
+        return "N/A"
+    hours = parse_timestamps(transactions['timestamp']).dt.hour
+    return f"{numeric_column(transactions, 'quantity').groupby(hours.values).sum().idxmax()}:00"
+
+
+def top_moving_items(transactions, top_n=5):
+    """[{'name', 'quantity'}] for the items with the largest total movement"""
+    if transactions.empty:
+        return []
+    quantity = numeric_column(transactions, 'quantity')
+    top_movers = quantity.groupby(transactions['name']).sum().abs().nlargest(top_n)
+    return [{'name': name, 'quantity': float(qty)} for name, qty in top_movers.items()]
+
+
+def critical_items(spare_parts, top_n=3):
+    """[{'name', 'quantity', 'min_level'}] for the lowest items at/below minimum"""
+    if spare_parts.empty:
+        return []
+    quantity = numeric_column(spare_parts, 'quantity')
+    min_level = numeric_column(spare_parts, 'min_order_level')
+    critical = quantity[quantity <= min_level].nsmallest(top_n)
+    return [{'name': str(spare_parts.at[i, 'name']), 'quantity': float(qty), 'min_level': float(min_level[i])}
+            for i, qty in critical.items()]
+
+
+def department_activity(transactions, spare_parts):
+    """Quantity, transaction count and distinct items moved per child department"""
+    columns = ['child_department', 'total_quantity', 'transaction_count', 'unique_items']
+    if transactions.empty:
+        return pd.DataFrame(columns=columns)
+
+    if 'child_department' in transactions.columns:
+        departments = transactions['child_department']
+    elif not spare_parts.empty and {'id', 'child_department'} <= set(spare_parts.columns):
+        departments = transactions['part_id'].map(spare_parts.set_index('id')['child_department'])
+    else:
+        departments = pd.Series('General Department', index=transactions.index)
+
+    activity = pd.DataFrame({
+        'child_department': departments.fillna('Unknown Department'),
+        'quantity': numeric_column(transactions, 'quantity'),
+        'part_id': transactions['part_id']
+    }).groupby('child_department').agg(
+        total_quantity=('quantity', 'sum'),
+        transaction_count=('quantity', 'size'),
+        unique_items=('part_id', 'nunique')
+    ).round(2)
+    return activity.reset_index()
+
+
+def stock_recommendations(spare_parts):
+    """Groups of items needing action: immediate reorder, low stock, excess stock"""
+    if spare_parts.empty:
+        return []
+
+    quantity = numeric_column(spare_parts, 'quantity')
+    min_level = numeric_column(spare_parts, 'min_order_level')
+    levels = pd.Series(stock_alert_levels(quantity, min_level), index=spare_parts.index)
+    groups = [
+        ('🚨 Immediate Reorder Required',
+         'Items at last piece level require immediate attention to avoid stockouts.',
+         levels == ALERT_LEVELS['last_piece'], 'Immediate Reorder'),
+        ('⚠️ Low Stock Alert',
+         'Items below minimum order level should be reordered soon.',
+         levels == ALERT_LEVELS['low_stock'], 'Schedule Reorder'),
+        ('💡 Excess Stock Identified',
+         'Items with stock levels significantly above requirements.',
+         quantity > min_level * 3, 'Review Stock Levels')
+    ]
+
+    columns = pd.DataFrame({'name': spare_parts['name'], 'quantity': quantity, 'min_order_level': min_level})
+    recommendations = []
+    for title, description, mask, action in groups:
+        items = columns[mask.to_numpy()]
+        if not items.empty:
+            recommendations.append({
+                'type': title,
+                'count': len(items),
+                'description': description,
+                'items': items.assign(recommended_action=action)
+            })
+    return recommendations
@@ -0,0 +1,50 @@
+# inventory_analytics/patterns.py
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Transactions one store counter clerk handles in an hour
+COUNTER_TRANSACTIONS_PER_HOUR = 20
+
+
+def weekday_hour_matrix(histogram, value='transaction_count'):
+    """7 x 24 frame of a demand histogram column, weekdays as rows and hours as columns"""
+    matrix = np.zeros((len(WEEKDAYS), 24))
+    if not histogram.empty:
+        np.add.at(matrix, (histogram['weekday'].to_numpy(dtype=int), histogram['hour'].to_numpy(dtype=int)),
+                  histogram[value].to_numpy(dtype=float))
+    return pd.DataFrame(matrix, index=WEEKDAYS, columns=range(24))
+
+
+def weekday_totals(histogram, value='transaction_count'):
+    """Histogram column summed per weekday, Monday first"""
+    return weekday_hour_matrix(histogram, value).sum(axis=1)
+
+
+def peak_hour(histogram, value='quantity'):
+    """Busiest hour of the day as 'H:00', or 'N/A' without demand"""
+    hours = weekday_hour_matrix(histogram, value).sum(axis=0)
+    if not hours.any():
+        return "N/A"
+    return f"{hours.idxmax()}:00"
+
+
+def weekday_occurrences(days, end=None):
+    """How often each weekday, Monday first, falls in the last days up to end (default today)"""
+    end = pd.Timestamp(end if end is not None else pd.Timestamp.today()).normalize()
+    dates = pd.date_range(end - pd.Timedelta(days=days), end, freq='D')
+    return np.bincount(dates.weekday, minlength=len(WEEKDAYS))
+
+
+def counter_staffing(histogram, days, per_clerk_hour=COUNTER_TRANSACTIONS_PER_HOUR):
+    """(average transactions, clerks needed) per weekday and hour over the last days"""
+    occurrences = np.maximum(weekday_occurrences(days), 1)
+    average = weekday_hour_matrix(histogram).div(occurrences, axis=0)
+    clerks = np.ceil(average / per_clerk_hour).astype(int)
+    return average, clerks
+
+
+def busiest_slot(average):
+    """(weekday, hour, average transactions) of the busiest hour of the week"""
+    weekday, hour = np.unravel_index(np.argmax(average.to_numpy()), average.shape)
+    return WEEKDAYS[weekday], int(hour), float(average.iat[weekday, hour])
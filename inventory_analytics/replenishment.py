@@ -0,0 +1,59 @@
+# inventory_analytics/replenishment.py
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SERVICE_LEVEL = 0.95
+DEFAULT_LEAD_TIME_DAYS = 7
+# Suggested minimum levels never go below this, so parts without recent
+# demand keep a spare on the shelf
+MIN_SUGGESTED_LEVEL = 1
+
+REORDER_COLUMNS = ['part_id', 'avg_daily_demand', 'demand_std', 'safety_stock', 'reorder_point',
+                   'suggested_min_order_level']
+
+
+def service_factor(service_level):
+    """Standard normal quantile of a cycle service level (0.95 -> 1.645)"""
+    if not 0 < service_level < 1:
+        raise ValueError("service_level must be between 0 and 1")
+    return NormalDist().inv_cdf(service_level)
+
+
+def daily_demand_stats(daily_demand, part_ids, start, days):
+    """Mean and sample standard deviation of daily demand per part over start + days.
+
+    daily_demand holds (part_id, day, quantity) rows for days with demand
+    only; the other days of the window count as zero demand.
+    """
+    part_ids = np.asarray(part_ids)
+    rows = pd.Index(part_ids).get_indexer(daily_demand['part_id'])
+    columns = (pd.to_datetime(daily_demand['day']) - pd.Timestamp(start)).dt.days.to_numpy()
+    keep = (rows >= 0) & (columns >= 0) & (columns < days)
+    quantity = daily_demand['quantity'].to_numpy(dtype=float)[keep]
+    total = np.bincount(rows[keep], weights=quantity, minlength=len(part_ids))
+    squares = np.bincount(rows[keep], weights=quantity ** 2, minlength=len(part_ids))
+    mean = total / days
+    variance = (squares - days * mean ** 2) / max(days - 1, 1)
+    return mean, np.sqrt(np.clip(variance, 0, None))
+
+
+def reorder_points(daily_demand, part_ids, start, days, service_level=DEFAULT_SERVICE_LEVEL,
+                   lead_time_days=DEFAULT_LEAD_TIME_DAYS, min_level=MIN_SUGGESTED_LEVEL):
+    """Safety stock, reorder point and suggested min_order_level of every part.
+
+    Safety stock covers demand variability over the lead time at the given
+    cycle service level: z * std * sqrt(lead time).
+    """
+    mean, std = daily_demand_stats(daily_demand, part_ids, start, days)
+    safety_stock = service_factor(service_level) * std * np.sqrt(lead_time_days)
+    reorder_point = mean * lead_time_days + safety_stock
+    return pd.DataFrame({
+        'part_id': np.asarray(part_ids),
+        'avg_daily_demand': mean,
+        'demand_std': std,
+        'safety_stock': safety_stock,
+        'reorder_point': reorder_point,
+        'suggested_min_order_level': np.maximum(np.ceil(reorder_point - 1e-9), min_level).astype(int)
+    })
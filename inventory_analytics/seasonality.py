@@ -0,0 +1,112 @@
+# inventory_analytics/seasonality.py
+import numpy as np
+import pandas as pd
+
+from inventory_analytics.forecasting import CHUNK_SIZE, demand_matrix
+
+# Cycles looked for in daily demand, in days
+SEASONAL_PERIODS = {
+    'weekly': 7.0,
+    'monthly': 365.25 / 12,
+    'annual': 365.25
+}
+# Harmonics counted towards a cycle: a demand spike once a cycle puts its
+# power at the period and its fractions
+HARMONICS = 3
+# Share of the demand variance a cycle must explain to count as seasonal;
+# on a year of random daily demand 99% of parts stay below 0.1
+MIN_STRENGTH = 0.15
+
+SEASONALITY_COLUMNS = ['dominant_period', 'period_days', 'strength', 'weekly_strength',
+                       'monthly_strength', 'annual_strength', 'demand_days', 'history_days']
+
+
+def power_spectrum(matrix):
+    """Periodogram of every row without the mean: power per frequency bin k (period days / k)"""
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    power = np.abs(np.fft.rfft(centered, axis=1)) ** 2
+    # Bins other than 0 and Nyquist stand for a +/- frequency pair
+    power[:, 1:(matrix.shape[1] + 1) // 2] *= 2
+    return power
+
+
+def period_bins(period, days):
+    """Frequency bins of a cycle and its harmonics over a series of days, or none if it cannot repeat"""
+    if round(days / period) < 2:
+        return np.array([], dtype=int)
+    bins = set()
+    for harmonic in range(1, HARMONICS + 1):
+        if period / harmonic < 2:
+            break
+        centre = int(round(harmonic * days / period))
+        bins.update(range(max(centre - 1, 1), min(centre + 1, days // 2) + 1))
+    return np.array(sorted(bins), dtype=int)
+
+
+def period_strengths(matrix):
+    """Share of each row's demand variance explained by each SEASONAL_PERIODS cycle"""
+    days = matrix.shape[1]
+    power = power_spectrum(matrix)
+    total = power[:, 1:].sum(axis=1)
+    strengths = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name, period in SEASONAL_PERIODS.items():
+            bins = period_bins(period, days)
+            band = power[:, bins].sum(axis=1) if len(bins) else np.zeros(len(matrix))
+            strengths[name] = np.where(total > 0, band / total, 0.0)
+    return pd.DataFrame(strengths)
+
+
+def seasonality_matrix(matrix, min_strength=MIN_STRENGTH):
+    """SEASONALITY_COLUMNS for every row of a demand matrix.
+
+    The dominant period is the cycle explaining the largest share of the
+    variance, if that share reaches min_strength; otherwise None.
+    """
+    strengths = period_strengths(matrix)
+    names = np.array(list(SEASONAL_PERIODS), dtype=object)
+    best = strengths.to_numpy().argmax(axis=1)
+    strength = strengths.to_numpy()[np.arange(len(strengths)), best]
+    seasonal = strength >= min_strength
+    return pd.DataFrame({
+        'dominant_period': np.where(seasonal, names[best], None),
+        'period_days': np.where(seasonal, np.array(list(SEASONAL_PERIODS.values()))[best], np.nan),
+        'strength': strength,
+        'weekly_strength': strengths['weekly'].to_numpy(),
+        'monthly_strength': strengths['monthly'].to_numpy(),
+        'annual_strength': strengths['annual'].to_numpy(),
+        'demand_days': (matrix > 0).sum(axis=1),
+        'history_days': matrix.shape[1]
+    })
+
+
+def detect_seasonality(daily_demand, part_ids, department_ids, start, days, chunk_size=CHUNK_SIZE):
+    """(per part, per department) seasonality from (part_id, day, quantity) demand rows.
+
+    department_ids gives each part's department; the department frame also
+    holds the whole inventory under department_id 0. Parts without a
+    department count towards the whole inventory only.
+    """
+    part_ids = np.asarray(part_ids)
+    department_ids = np.asarray(department_ids, dtype=float)
+    assigned = ~np.isnan(department_ids)
+    departments, assigned_rows = np.unique(department_ids[assigned].astype(int), return_inverse=True)
+    # Unassigned parts add up in an extra last row, left out of the frame
+    department_rows = np.full(len(part_ids), len(departments))
+    department_rows[assigned] = assigned_rows
+    totals = np.zeros((len(departments) + 1, days))
+
+    chunks = []
+    for offset in range(0, len(part_ids), chunk_size):
+        ids = part_ids[offset:offset + chunk_size]
+        matrix = demand_matrix(daily_demand[daily_demand['part_id'].isin(ids)], ids, start, days)
+        np.add.at(totals, department_rows[offset:offset + chunk_size], matrix)
+        seasonality = seasonality_matrix(matrix)
+        seasonality.insert(0, 'part_id', ids)
+        chunks.append(seasonality)
+    parts = pd.concat(chunks, ignore_index=True) if chunks else \
+        pd.DataFrame(columns=['part_id'] + SEASONALITY_COLUMNS)
+
+    by_department = seasonality_matrix(np.vstack([totals[:-1], totals.sum(axis=0, keepdims=True)]))
+    by_department.insert(0, 'department_id', np.append(departments, 0))
+    return parts, by_department
@@ -3,10 +3,11 @@ from app_settings import set_page_configuration
 
 set_page_configuration()
 
-from data_manager import DataManager
+from data_manager import DataManager, ALERT_TYPES
 from barcode_handler import BarcodeHandler
 from user_management import init_session_state, render_login_page, check_and_restore_session
 from navbar import make_sidebar
+from page_profiler import run_page
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -42,12 +43,10 @@ def show_application():
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        lpl_stock = st.session_state.data_manager.get_last_piece_stock_items()
-        low_stock = st.session_state.data_manager.get_low_stock_items()
-        df = st.session_state.data_manager.get_all_parts()
-        total_parts = len(df)
-        low_stock_count = len(low_stock)
-        lpl_stock_count = len(lpl_stock)
+        alert_counts = st.session_state.data_manager.get_stock_alert_counts()
+        total_parts = alert_counts['part_count']
+        low_stock_count = alert_counts['low_stock']
+        lpl_stock_count = alert_counts['last_piece']
 
         st.metric("Total Parts",
                   total_parts,
@@ -61,7 +60,7 @@ def show_application():
                   help="Number of items below last piece level")
         
     with col3:
-        active_alerts = len(low_stock) + len(lpl_stock)
+        active_alerts = low_stock_count + lpl_stock_count
         monthly_turnover = calculate_monthly_turnover()
         st.metric("Active Alerts", active_alerts, delta=active_alerts, delta_color="inverse")
 
@@ -338,22 +337,17 @@ def get_critical_events():
     try:
         data_manager = st.session_state.data_manager
         
-        # Get low stock and last piece items
-        low_stock = data_manager.get_low_stock_items()
-        last_piece = data_manager.get_last_piece_stock_items()
-        
+        # Most severe, newest open alerts
+        alerts = data_manager.get_open_alerts(limit=4)
+
         critical_events = []
-        
-        # Add last piece alerts
-        if not last_piece.empty:
-            for _, item in last_piece.head(2).iterrows():  # Limit to 2 items
-                critical_events.append(f"Last piece: {item['name']} (Only {float(item['quantity'])} left)")
-        
-        # Add low stock alerts
-        if not low_stock.empty:
-            for _, item in low_stock.head(2).iterrows():  # Limit to 2 items
-                critical_events.append(f"Low stock: {item['name']} ({float(item['quantity']):.3f} left, min: {float(item['min_order_level']):.3f})")
-        
+        for alert_type, name, quantity, min_level in zip(alerts['alert_type'], alerts['name'],
+                                                         alerts['quantity'], alerts['min_order_level']):
+            if alert_type == 'low_stock':
+                critical_events.append(f"Low stock: {name} ({float(quantity):.3f} left, min: {float(min_level):.3f})")
+            else:
+                critical_events.append(f"{ALERT_TYPES[alert_type]}: {name} (Only {float(quantity)} left)")
+
         # If no critical events, add a message
         if not critical_events:
             critical_events.append("No critical events - all systems normal")
@@ -389,4 +383,4 @@ def filter_transactions(transactions, days, trans_type):
 
 # Only run the main function if this is the main script
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_page("Home", main)
\ No newline at end of file
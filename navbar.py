@@ -2,6 +2,7 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
 from user_management import init_session_state, logout
+from page_profiler import render_profile_toggle
 import base64
 
 # Page configuration
@@ -53,6 +54,9 @@ def nav(current_page="Home"):
                     logout()
                 elif current_page != selected:
                     st.switch_page(pages[selected])
+
+            # Super User profiling control
+            render_profile_toggle()
             
             # Stock alerts
             display_stock_alerts()
@@ -79,12 +83,12 @@ def display_stock_alerts():
         try:
             if st.session_state.user_role == 'User':
                 user_dept_id = st.session_state.get('user_department_id')
-                lpl_stock = st.session_state.data_manager.get_last_piece_stock_items_by_dept(user_dept_id)
+                counts = st.session_state.data_manager.get_stock_alert_counts(user_dept_id)
             else:
-                lpl_stock = st.session_state.data_manager.get_last_piece_stock_items()
+                counts = st.session_state.data_manager.get_stock_alert_counts()
             
-            if not lpl_stock.empty:
-                st.error(f"🚨 {len(lpl_stock)} Last Piece Level Items!")
+            if counts['last_piece']:
+                st.error(f"🚨 {counts['last_piece']} Last Piece Level Items!")
                 
         except Exception as e:
             st.error(f"Error loading stock alerts: {str(e)}")
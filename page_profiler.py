@@ -0,0 +1,148 @@
+# page_profiler.py
+import cProfile
+import os
+import pstats
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+PROFILE_DIR = 'profiles'
+# Microseconds keep captures of one page and user in the same second apart
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S-%f'
+# Profiles saved before the total time was part of the file name
+LEGACY_TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+
+
+def _slug(value):
+    """Make a value safe to embed in a profile file name"""
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value or 'unknown')).strip('-') or 'unknown'
+
+
+def request_profile():
+    """Arm the profiler so the next rerun of the current page is captured"""
+    st.session_state.profile_armed = True
+
+
+def render_profile_toggle():
+    """Super User-only sidebar control for profiling the next rerun"""
+    if st.session_state.get('user_role') != 'Super User':
+        return
+
+    if st.session_state.get('profile_armed') or st.session_state.get('profile_pending_page'):
+        st.caption("🔬 Your next action on this page will be profiled")
+    else:
+        st.button("🔬 Profile next rerun", on_click=request_profile,
+                  help="Capture a cProfile of the next rerun of this page",
+                  use_container_width=True)
+
+
+def run_page(page_name, render_func):
+    """Run a page's render function, wrapping it in cProfile when armed"""
+    # The rerun triggered by the button itself only arms the profiler, so the
+    # capture covers the user's next interaction with this page.
+    if st.session_state.pop('profile_armed', False):
+        st.session_state.profile_pending_page = page_name
+        return render_func()
+
+    if st.session_state.get('profile_pending_page') != page_name:
+        return render_func()
+
+    del st.session_state['profile_pending_page']
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = render_func()
+    finally:
+        # st.rerun()/st.stop() unwind through here too, keep the capture anyway
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        path = save_profile(profiler, page_name, st.session_state.get('username'))
+    st.toast(f"Profile saved ({elapsed:.3f}s): {os.path.basename(path)}", icon="🔬")
+    return result
+
+
+def save_profile(profiler, page_name, username):
+    """Write profiler stats to PROFILE_DIR named by timestamp, page, user and total time"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    # Kept in the name so listing profiles never has to load them
+    total_time = pstats.Stats(profiler).total_tt
+    file_name = f"{timestamp}__{_slug(page_name)}__{_slug(username)}__{total_time:.3f}s.prof"
+    path = os.path.join(PROFILE_DIR, file_name)
+    profiler.dump_stats(path)
+    return path
+
+
+def list_profiles():
+    """List saved profiles, newest first"""
+    columns = ['file', 'page', 'user', 'captured_at', 'total_time', 'size_kb']
+    if not os.path.isdir(PROFILE_DIR):
+        return pd.DataFrame(columns=columns)
+
+    rows = []
+    for file_name in os.listdir(PROFILE_DIR):
+        parts = file_name[:-len('.prof')].split('__') if file_name.endswith('.prof') else []
+        path = os.path.join(PROFILE_DIR, file_name)
+        try:
+            if len(parts) == 4:
+                timestamp, page, user, total_time = parts
+                captured_at = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+                total_time = float(total_time.rstrip('s'))
+            elif len(parts) == 3:
+                timestamp, page, user = parts
+                captured_at = datetime.strptime(timestamp, LEGACY_TIMESTAMP_FORMAT)
+                total_time = pstats.Stats(path).total_tt
+            else:
+                continue
+        except (ValueError, TypeError, EOFError):
+            continue
+        rows.append({
+            'file': file_name,
+            'page': page.replace('-', ' '),
+            'user': user,
+            'captured_at': captured_at,
+            'total_time': round(total_time, 3),
+            'size_kb': round(os.path.getsize(path) / 1024, 1)
+        })
+
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame(rows, columns=columns).sort_values('captured_at', ascending=False)
+
+
+def top_functions(file_name, limit=25):
+    """Top functions of a saved profile ordered by cumulative time"""
+    stats = pstats.Stats(os.path.join(PROFILE_DIR, os.path.basename(file_name)))
+    rows = []
+    for (filename, line, func), (primitive_calls, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({func})",
+            'ncalls': calls if calls == primitive_calls else f"{calls}/{primitive_calls}",
+            'tottime': round(tottime, 4),
+            'cumtime': round(cumtime, 4),
+            'percall': round(cumtime / primitive_calls, 6) if primitive_calls else 0.0,
+            'path': filename
+        })
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values('cumtime', ascending=False).head(limit)
+
+
+def read_profile(file_name):
+    """Raw .prof bytes for download"""
+    with open(os.path.join(PROFILE_DIR, os.path.basename(file_name)), 'rb') as f:
+        return f.read()
+
+
+def delete_profile(file_name):
+    """Remove a saved profile"""
+    try:
+        os.remove(os.path.join(PROFILE_DIR, os.path.basename(file_name)))
+        return True, None
+    except OSError as e:
+        return False, str(e)
@@ -6,6 +6,8 @@ set_page_configuration()
 import pandas as pd
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
+from page_profiler import run_page, list_profiles, top_functions, read_profile, delete_profile
+from query_cache import shared_cache
 from datetime import datetime
 
 
@@ -27,7 +29,7 @@ def render_admin_page():
         st.error("You don't have permission to access this page")
         return
     
-    tab1, tab2 = st.tabs(["Manage Users", "Add New User"])
+    tab1, tab2, tab3 = st.tabs(["Manage Users", "Add New User", "Performance Profiles"])
 
     with tab1:
         #st.subheader("User Management")
@@ -260,5 +262,95 @@ def render_admin_page():
                         st.error("Username already exists")
                         st.toast("Username already exists!", icon="✅")
 
+    with tab3:
+        render_cache_section()
+        render_profiles_section()
+
+def render_cache_section():
+    """Hit, miss and eviction counters of the shared DataManager read cache"""
+    st.subheader("Read Cache")
+    stats = shared_cache.stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Hit Rate", f"{stats['hit_rate']:.1%}")
+    col2.metric("Hits", f"{stats['hits']:,}")
+    col3.metric("Misses", f"{stats['misses']:,}")
+    col4.metric("Evictions", f"{stats['evictions']:,}")
+    col5.metric("Memory", f"{stats['bytes'] / 1024 ** 2:.1f} MB",
+                help=f"{stats['entries']} cached results, limit {stats['max_bytes'] / 1024 ** 2:.0f} MB")
+    if st.button("🧹 Clear Read Cache"):
+        shared_cache.clear()
+        st.toast("Read cache cleared", icon="✅")
+        st.rerun()
+
+def render_profiles_section():
+    """Browse cProfile captures taken with the sidebar "Profile next rerun" control"""
+    st.subheader("Performance Profiles")
+    st.caption("Use **🔬 Profile next rerun** in the sidebar on any page, then repeat the slow action.")
+
+    profiles = list_profiles()
+    if profiles.empty:
+        st.info("No profiles captured yet")
+        return
+
+    st.dataframe(
+        profiles[['captured_at', 'page', 'user', 'total_time', 'size_kb']],
+        column_config={
+            "captured_at": st.column_config.DatetimeColumn("Captured At", format="YYYY-MM-DD HH:mm:ss"),
+            "page": "Page",
+            "user": "User",
+            "total_time": st.column_config.NumberColumn("Total Time (s)", format="%.3f"),
+            "size_kb": st.column_config.NumberColumn("Size (KB)", format="%.1f")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+    selected_file = st.selectbox(
+        "Select Profile",
+        profiles['file'].tolist(),
+        format_func=lambda f: (
+            f"{profiles[profiles['file'] == f]['page'].iloc[0]} - "
+            f"{profiles[profiles['file'] == f]['user'].iloc[0]} - "
+            f"{profiles[profiles['file'] == f]['captured_at'].iloc[0]:%Y-%m-%d %H:%M:%S}"
+        ),
+        key="profile_select"
+    )
+    if not selected_file:
+        return
+
+    limit = st.slider("Functions to show", min_value=10, max_value=100, value=25, step=5)
+    st.write("**Top functions by cumulative time**")
+    st.dataframe(
+        top_functions(selected_file, limit),
+        column_config={
+            "function": "Function",
+            "ncalls": "Calls",
+            "tottime": st.column_config.NumberColumn("Own Time (s)", format="%.4f"),
+            "cumtime": st.column_config.NumberColumn("Cumulative (s)", format="%.4f"),
+            "percall": st.column_config.NumberColumn("Per Call (s)", format="%.6f"),
+            "path": "File"
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Download .prof (snakeviz)",
+            read_profile(selected_file),
+            file_name=selected_file,
+            mime="application/octet-stream",
+            help="Open locally with: snakeviz <file>.prof"
+        )
+    with col2:
+        if st.button("🗑️ Delete Profile"):
+            success, message = delete_profile(selected_file)
+            if success:
+                st.toast("Profile deleted", icon="✅")
+                st.rerun()
+            else:
+                st.error(f"Delete failed: {message}")
+
 if __name__ == "__main__":
-    render_admin_page()
\ No newline at end of file
+    run_page(current_page, render_admin_page)
\ No newline at end of file
@@ -12,8 +12,23 @@ import numpy as np
 from datetime import datetime, timedelta
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
+from page_profiler import run_page
+from section_cache import cached_section
+from report_context import ReportContext
 from data_manager import DataManager
+import inventory_analytics
+import reorder_job
 
+# Items in the demand correlation heatmap and rows of its pair table
+HEATMAP_ITEMS = 20
+CORRELATED_PAIRS_SHOWN = 25
+# Largest minimum level changes plotted in the reorder analysis
+REORDER_CHART_ITEMS = 2000
+SEASONAL_ITEMS_SHOWN = 25
+# Highest risk items listed in the deployment risk table
+RISK_ITEMS_SHOWN = 50
+# Fixed so the simulation gives the same figures on every rerun
+SIMULATION_SEED = 0
 
 current_page = "Analytics"
 st.header(current_page)
@@ -110,66 +125,28 @@ def render_analytics_page():
                             key="analytics_child_dept"
                         )
     
-    # Get data with consistency checks
-    df = pd.DataFrame()
-    transactions = pd.DataFrame()
-    
-    if selected_child is not None:
-        df = st.session_state.data_manager.get_parts_by_department(selected_child)
-        # Use selected_parent if available, otherwise use the parent of selected_child
-        if selected_parent:
-            parent_id_for_transactions = selected_parent
-        else:
-            # Get parent department from child department
-            dept_info = st.session_state.data_manager.get_department_info(selected_child)
-            if dept_info is not None and not dept_info.empty and 'parent_id' in dept_info:
-                parent_id_for_transactions = dept_info['parent_id']
-            else:
-                parent_id_for_transactions = selected_child  # fallback
-        
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(parent_id_for_transactions, days=90)
-        
-        # Ensure data consistency
-        df = ensure_data_consistency(df)
-        transactions = ensure_data_consistency(transactions)
-    else:
-        # If no department selected, get all data (for Admin/Super User)
-        if current_user_role in ['Admin', 'Super User']:
-            df = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=90)
-            
-            # Ensure data consistency
-            df = ensure_data_consistency(df)
-            transactions = ensure_data_consistency(transactions)
-        else:
-            st.warning("Please contact administrator to assign you to a department.")
-            return
-
-    # Main analytics tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📈 Overview Dashboard", 
-        "🔍 Stock Analysis", 
-        "📊 Demand Insights",         
-        "📋 Detailed Reports"
-    ])
+    if selected_child is None and current_user_role not in ['Admin', 'Super User']:
+        st.warning("Please contact administrator to assign you to a department.")
+        return
 
-    with tab1:
-        render_overview_dashboard(days if date_range != "Custom" else (end_date - start_date).days, 
-                                selected_child, current_user_role)
-    
-    with tab2:
-        render_stock_analysis(days if date_range != "Custom" else (end_date - start_date).days, 
+    # The scoped frames are read at most once, by whichever section renders
+    context = ReportContext(st.session_state.data_manager,
+                            days if date_range != "Custom" else (end_date - start_date).days,
                             selected_child, current_user_role)
-    
-    with tab3:
-        render_demand_insights(days if date_range != "Custom" else (end_date - start_date).days, 
-                             selected_child, current_user_role)
-    
-    with tab4:
-        render_detailed_reports(days if date_range != "Custom" else (end_date - start_date).days, 
-                              selected_child, current_user_role)
 
-def render_overview_dashboard(days, department_id, user_role):
+    # Main analytics navigation; only the selected section is computed
+    sections = {
+        "📈 Overview Dashboard": render_overview_dashboard,
+        "🔍 Stock Analysis": render_stock_analysis,
+        "📊 Demand Insights": render_demand_insights,
+        "🚢 Deployment Risk": render_deployment_risk,
+        "📋 Detailed Reports": render_detailed_reports
+    }
+    section = st.radio("Analytics Section", list(sections), horizontal=True,
+                       key="analytics_section", label_visibility="collapsed")
+    sections[section](context)
+
+def render_overview_dashboard(context):
     """Overview dashboard with performance metrics"""
     
     with st.expander("📊 **Performance Overview - Methodology**", expanded=False):
@@ -183,31 +160,19 @@ def render_overview_dashboard(days, department_id, user_role):
     
     st.subheader("🏆 Performance Overview")
     
-    # Get data based on user role and department
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
-    
-    # Ensure data consistency
-    spare_parts = ensure_data_consistency(spare_parts)
-    transactions = ensure_data_consistency(transactions)
+    spare_parts = context.spare_parts
+    transactions = context.transactions
     
     if spare_parts.empty:
         st.warning("No inventory data available for analysis")
         return
+    inputs = context.inputs
     
     # KPI Metrics
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        stock_turnover = calculate_stock_turnover_rate(transactions, spare_parts)
+        stock_turnover = inventory_analytics.turnover_rate(transactions, spare_parts)
         st.metric(
             "Stock Turnover Rate", 
             f"{stock_turnover:.1f}x",
@@ -215,7 +180,7 @@ def render_overview_dashboard(days, department_id, user_role):
         )
     
     with col2:
-        service_level = calculate_service_level(transactions)
+        service_level = inventory_analytics.service_level(transactions)
         st.metric(
             "Service Level", 
             f"{service_level:.1f}%",
@@ -241,7 +206,7 @@ def render_overview_dashboard(days, department_id, user_role):
             **Calculation**: Count of check-in/check-out transactions per month
             **Purpose**: Identify seasonal patterns and activity trends
             """)
-        fig = create_monthly_trend_chart(transactions)
+        fig = cached_section(create_monthly_trend_chart, inputs, transactions)
         st.plotly_chart(fig, use_container_width=True)
     
     with chart_col2:
@@ -254,7 +219,7 @@ def render_overview_dashboard(days, department_id, user_role):
             - Last Piece: Only 1 item remaining
             - Out of Stock: Zero quantity
             """)
-        fig = create_inventory_health_chart(spare_parts)
+        fig = cached_section(create_inventory_health_chart, inputs, spare_parts)
         st.plotly_chart(fig, use_container_width=True)
     
     # Charts Row 2
@@ -267,7 +232,7 @@ def render_overview_dashboard(days, department_id, user_role):
             **Calculation**: Transaction counts and quantities by department
             **Purpose**: Compare activity levels across departments
             """)
-        fig = create_department_performance_chart(transactions, spare_parts)
+        fig = cached_section(create_department_performance_chart, inputs, transactions, spare_parts)
         st.plotly_chart(fig, use_container_width=True)
     
     with chart_col4:
@@ -280,10 +245,10 @@ def render_overview_dashboard(days, department_id, user_role):
             - B (Next 15%): Medium priority items  
             - C (Bottom 5%): Low priority items
             """)
-        fig = create_abc_analysis_chart(spare_parts)
+        fig = cached_section(create_abc_analysis_chart, inputs, spare_parts)
         st.plotly_chart(fig, use_container_width=True)
 
-def render_stock_analysis(days, department_id, user_role):
+def render_stock_analysis(context):
     """Stock optimization analysis"""
     
     with st.expander("🔍 **Stock Optimization - Methodology**", expanded=False):
@@ -297,39 +262,26 @@ def render_stock_analysis(days, department_id, user_role):
     
     st.subheader("🔍 Stock Optimization Analysis")
     
-    # Get data based on access
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
-    
-    # Ensure data consistency
-    spare_parts = ensure_data_consistency(spare_parts)
-    transactions = ensure_data_consistency(transactions)
+    spare_parts = context.spare_parts
     
     if spare_parts.empty:
         st.warning("No inventory data available for analysis")
         return
+    inputs = context.inputs
     
     # Stock optimization metrics
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        excess_stock = calculate_excess_stock_count(spare_parts)
+        excess_stock = inventory_analytics.excess_stock_count(spare_parts)
         st.metric("Excess Stock Items", excess_stock)
     
     with col2:
-        stockout_risk = calculate_stockout_risk(spare_parts)
+        stockout_risk = inventory_analytics.stockout_risk_count(spare_parts)
         st.metric("High Stockout Risk Items", stockout_risk)
     
     with col3:
-        optimal_level = calculate_optimal_stock_level(spare_parts)
+        optimal_level = inventory_analytics.optimal_stock_level(spare_parts)
         st.metric("Optimal Stock Achievement", f"{optimal_level:.1f}%")
     
     # Stock analysis charts
@@ -344,9 +296,9 @@ def render_stock_analysis(days, department_id, user_role):
             """)
         col1, col2 = st.columns([2, 1])
         with col1:
-            st.plotly_chart(create_detailed_abc_chart(spare_parts), use_container_width=True)
+            st.plotly_chart(cached_section(create_detailed_abc_chart, inputs, spare_parts), use_container_width=True)
         with col2:
-            abc_summary = calculate_abc_summary(spare_parts)
+            abc_summary = cached_section(inventory_analytics.abc_summary, inputs, spare_parts)
             st.dataframe(abc_summary, use_container_width=True)
     
     with tab2:
@@ -357,11 +309,11 @@ def render_stock_analysis(days, department_id, user_role):
             **Reference Lines**: Median current quantity and median minimum level
             **Purpose**: Visualize overstocked and understocked items
             """)
-        st.plotly_chart(create_stock_level_analysis_chart(spare_parts), use_container_width=True)
+        st.plotly_chart(cached_section(create_stock_level_analysis_chart, inputs, spare_parts), use_container_width=True)
         
         # Stock level recommendations
         st.subheader("📋 Stock Level Recommendations")
-        recommendations = generate_stock_recommendations(spare_parts)
+        recommendations = cached_section(inventory_analytics.stock_recommendations, inputs, spare_parts)
         for rec in recommendations:
             with st.expander(f"{rec['type']} - {rec['count']} items"):
                 st.write(rec['description'])
@@ -372,13 +324,77 @@ def render_stock_analysis(days, department_id, user_role):
     with tab3:
         with st.expander("🔄 **Reorder Analysis - Methodology**", expanded=False):
             st.write("""
-            **Data Used**: Inventory levels + Transaction history
-            **Purpose**: Analyze reorder patterns and timing (placeholder implementation)
-            **Future**: Will incorporate lead times and demand patterns
+            **Data Used**: A year of daily check-outs for every item
+            **Safety Stock**: Service factor × daily demand standard deviation × √lead time
+            **Reorder Point**: Average daily demand × lead time + safety stock
+            **Purpose**: Suggest minimum order levels that hold the chosen service level;
+            suggestions only take effect once applied
             """)
-        st.plotly_chart(create_reorder_analysis_chart(spare_parts, transactions), use_container_width=True)
+        render_reorder_review(context)
 
-def render_demand_insights(days, department_id, user_role):
+def render_reorder_review(context):
+    """Pending minimum level suggestions, with recalculation and bulk apply for administrators"""
+    data_manager = st.session_state.data_manager
+    can_apply = context.user_role in ['Admin', 'Super User']
+    
+    if can_apply:
+        with st.form("reorder_parameters"):
+            col1, col2 = st.columns(2)
+            with col1:
+                service_level = st.select_slider(
+                    "Service Level",
+                    options=[0.80, 0.85, 0.90, 0.95, 0.98, 0.99],
+                    value=inventory_analytics.DEFAULT_SERVICE_LEVEL,
+                    format_func=lambda level: f"{level:.0%}"
+                )
+            with col2:
+                lead_time_days = st.number_input(
+                    "Lead Time (days)", min_value=1, max_value=365,
+                    value=inventory_analytics.DEFAULT_LEAD_TIME_DAYS
+                )
+            if st.form_submit_button("Calculate Suggestions"):
+                with st.spinner("Calculating reorder points for all items..."):
+                    success, error_msg = reorder_job.refresh_reorder_suggestions(
+                        data_manager, service_level, lead_time_days)
+                if not success:
+                    st.error(f"Could not calculate reorder points: {error_msg}")
+    
+    suggestions = data_manager.get_reorder_suggestions(context.department_id if context.by_department else None)
+    if suggestions.empty:
+        st.info("No pending minimum level changes" +
+                (". Calculate suggestions to review them." if can_apply else ""))
+        return
+    
+    first = suggestions.iloc[0]
+    st.caption(f"{len(suggestions)} changes at {first['service_level']:.0%} service level and "
+               f"{first['lead_time_days']} days lead time, calculated {str(first['computed_at'])[:16]}")
+    st.plotly_chart(create_reorder_analysis_chart(suggestions), use_container_width=True)
+    
+    event = st.dataframe(
+        suggestions[['name', 'part_number', 'child_department', 'quantity', 'min_order_level',
+                     'suggested_min_order_level', 'avg_daily_demand', 'demand_std', 'safety_stock']].rename(columns={
+            'name': 'Name', 'part_number': 'Part #', 'child_department': 'Department',
+            'quantity': 'Current Stock', 'min_order_level': 'Minimum Level',
+            'suggested_min_order_level': 'Suggested Minimum', 'avg_daily_demand': 'Avg Daily Demand',
+            'demand_std': 'Demand Std Dev', 'safety_stock': 'Safety Stock'}).round(2),
+        hide_index=True, use_container_width=True,
+        on_select="rerun" if can_apply else "ignore", selection_mode="multi-row", key="reorder_suggestions")
+    
+    if can_apply:
+        selected = event.selection.rows
+        col1, col2 = st.columns(2)
+        with col1:
+            apply_selected = st.button(f"Apply {len(selected)} selected", disabled=not selected)
+        with col2:
+            apply_all = st.button(f"Apply all {len(suggestions)}")
+        if apply_selected or apply_all:
+            part_ids = suggestions['part_id'].iloc[selected] if apply_selected else suggestions['part_id']
+            success, error_msg = data_manager.apply_reorder_suggestions(part_ids)
+            if success:
+                st.rerun()
+            st.error(f"Could not apply suggestions: {error_msg}")
+
+def render_demand_insights(context):
     """Demand pattern analysis"""
     
     with st.expander("📊 **Demand Analysis - Methodology**", expanded=False):
@@ -388,48 +404,38 @@ def render_demand_insights(days, department_id, user_role):
         - Avg Daily Demand: Mean quantity moved per day
         - Demand Variability: Standard deviation ÷ mean (coefficient of variation)
         - Peak Demand: Hour with highest transaction activity
-        - Seasonal Trend: Pattern detection (simplified)
+        - Seasonal Trend: Strongest weekly, monthly or annual cycle in total demand (daily batch job)
         """)
     
     st.subheader("📊 Demand Pattern Analysis")
     
-    # Get data based on access
-    if user_role == 'User':
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-    else:
-        if department_id:
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        else:
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
-            spare_parts = st.session_state.data_manager.get_all_parts()
-    
-    # Ensure data consistency
-    transactions = ensure_data_consistency(transactions)
-    spare_parts = ensure_data_consistency(spare_parts)
+    transactions = context.transactions
+    spare_parts = context.spare_parts
     
     if transactions.empty:
         st.warning("No transaction data available for demand analysis")
         return
+    inputs = context.inputs
+    scope_department = context.department_id if context.by_department else None
     
     # Demand metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_daily_demand = calculate_average_daily_demand(transactions)
+        avg_daily_demand = inventory_analytics.average_daily_demand(transactions)
         st.metric("Avg Daily Demand", f"{avg_daily_demand:.0f} units")
     
     with col2:
-        demand_variability = calculate_demand_variability(transactions)
+        demand_variability = inventory_analytics.demand_variability(transactions)
         st.metric("Demand Variability", f"{demand_variability:.2f}")
     
     with col3:
-        peak_demand = identify_peak_demand(transactions)
+        peak_demand = inventory_analytics.peak_hour(context.demand_histogram)
         st.metric("Peak Demand Period", peak_demand)
     
     with col4:
-        seasonal_trend = detect_seasonal_trend(transactions)
+        seasonal_trend = detect_seasonal_trend(
+            st.session_state.data_manager.get_department_seasonality(scope_department))
         st.metric("Seasonal Trend", seasonal_trend)
     
     # Demand forecasting
@@ -440,23 +446,31 @@ def render_demand_insights(days, department_id, user_role):
     with forecast_col1:
         with st.expander("🔮 **Item Forecasting - Methodology**", expanded=False):
             st.write("""
-            **Data Used**: Individual item transaction history
-            **Method**: 7-day moving average for trend identification
+            **Data Used**: A year of daily check-outs for every item
+            **Method**: Refreshed in the background for all items at once; steady demand uses
+            exponential smoothing (EWMA), intermittent demand the Syntetos-Boylan approximation
+            of Croston's method (SBA)
             **Purpose**: Predict future demand for specific items
-            **Limitation**: Requires sufficient historical data
             """)
         if not spare_parts.empty:
-            selected_part = st.selectbox(
+            part_labels = dict(zip(spare_parts['id'],
+                                   spare_parts['name'].astype(str) + ' (' + spare_parts['part_number'].astype(str) + ')'))
+            selected_part_id = st.selectbox(
                 "Select Item for Forecasting",
-                spare_parts['name'].unique()[:20]  # Limit to first 20 for performance
+                list(part_labels),
+                format_func=part_labels.get
             )
             
-            if selected_part:
-                part_data = spare_parts[spare_parts['name'] == selected_part].iloc[0]
-                part_transactions = transactions[transactions['name'] == selected_part]
+            if selected_part_id is not None:
+                part_data = spare_parts[spare_parts['id'] == selected_part_id].iloc[0]
+                part_transactions = transactions[transactions['part_id'] == selected_part_id]
+                # Precomputed by forecast_job, a primary key lookup
+                forecast = st.session_state.data_manager.get_demand_forecast(selected_part_id)
+                if forecast is None:
+                    st.info("Forecasts are still being computed; showing recent history only")
                 
-                if not part_transactions.empty:
-                    st.plotly_chart(create_demand_forecast_chart(part_transactions, part_data), 
+                if not part_transactions.empty or forecast is not None:
+                    st.plotly_chart(create_demand_forecast_chart(part_transactions, part_data, forecast), 
                                   use_container_width=True)
                 else:
                     st.info("No transaction history for selected item")
@@ -466,11 +480,11 @@ def render_demand_insights(days, department_id, user_role):
     with forecast_col2:
         with st.expander("📅 **Weekly Patterns - Methodology**", expanded=False):
             st.write("""
-            **Data Used**: All transactions grouped by day of week
+            **Data Used**: Weekday × hour transaction counts, kept current as transactions are recorded
             **Calculation**: Transaction counts for each weekday
             **Purpose**: Identify weekly demand cycles and busy days
             """)
-        st.plotly_chart(create_demand_pattern_chart(transactions), use_container_width=True)
+        st.plotly_chart(create_demand_pattern_chart(context.demand_histogram), use_container_width=True)
     
     # Additional demand insights
     st.subheader("📈 Demand Insights")
@@ -480,23 +494,71 @@ def render_demand_insights(days, department_id, user_role):
     with insight_col1:
         with st.expander("📊 **Weekly Pattern Details - Methodology**", expanded=False):
             st.write("""
-            **Data Used**: Transaction timestamps
+            **Data Used**: Weekday × hour check-out quantities, kept current as transactions are recorded
             **Purpose**: Detailed view of intra-week demand variations
-            **Implementation**: Placeholder for advanced weekly analysis
             """)
-        st.plotly_chart(create_weekly_demand_pattern(transactions), use_container_width=True)
+        st.plotly_chart(create_weekly_demand_pattern(context.demand_histogram), use_container_width=True)
     
     with insight_col2:
         with st.expander("🔗 **Demand Correlation - Methodology**", expanded=False):
-            st.write("""
-            **Data Used**: Multiple items' transaction patterns
+            st.write(f"""
+            **Data Used**: Daily check-outs of items drawn on at least
+            {inventory_analytics.correlation.MIN_DEMAND_DAYS} days in the period
+            **Calculation**: Pearson correlation of daily quantities between every pair of those items
             **Purpose**: Identify items with correlated demand patterns
-            **Implementation**: Placeholder for correlation heatmap
-            **Use Case**: Group ordering for correlated items
+            **Use Case**: Kitting and group ordering for correlated items
             """)
-        st.plotly_chart(create_demand_correlation_heatmap(transactions), use_container_width=True)
+        heatmap, strongest_pairs, related_items = cached_section(
+            create_demand_correlation_heatmap, inputs, transactions)
+        st.plotly_chart(heatmap, use_container_width=True)
+        if not strongest_pairs.empty:
+            st.write("**Most strongly correlated items**")
+            st.dataframe(strongest_pairs.head(CORRELATED_PAIRS_SHOWN), use_container_width=True, hide_index=True)
+            st.download_button(
+                f"Download top {inventory_analytics.correlation.TOP_K} related items per item",
+                related_items.to_csv(index=False),
+                file_name="correlated_items.csv",
+                mime="text/csv"
+            )
+    
+    # Seasonality, precomputed by seasonality_job
+    st.subheader("🌊 Seasonal Items")
+    with st.expander("🌊 **Seasonality - Methodology**", expanded=False):
+        st.write(f"""
+        **Data Used**: Up to two years of daily check-outs for every item, analysed once a day
+        **Calculation**: Periodogram (FFT) of each item's daily demand; the share of its variance
+        in the weekly, monthly and annual frequencies and their harmonics
+        **Seasonal**: The strongest cycle explains at least
+        {inventory_analytics.seasonality.MIN_STRENGTH:.0%} of the variance
+        (annual cycles need two years of history)
+        """)
+    seasonal_parts = st.session_state.data_manager.get_part_seasonality(scope_department)
+    if seasonal_parts.empty:
+        st.info("No seasonal items found yet")
+    else:
+        season_col1, season_col2 = st.columns([1, 2])
+        with season_col1:
+            st.plotly_chart(create_seasonality_chart(seasonal_parts), use_container_width=True)
+        with season_col2:
+            st.dataframe(
+                seasonal_parts.head(SEASONAL_ITEMS_SHOWN)[[
+                    'name', 'part_number', 'child_department', 'dominant_period', 'strength']].rename(columns={
+                    'name': 'Name', 'part_number': 'Part #', 'child_department': 'Department',
+                    'dominant_period': 'Cycle', 'strength': 'Strength'}).round(3),
+                use_container_width=True, hide_index=True)
+    
+    # Store counter staffing
+    st.subheader("🧑‍🔧 Store Counter Staffing")
+    with st.expander("🧑‍🔧 **Counter Staffing - Methodology**", expanded=False):
+        st.write(f"""
+        **Data Used**: Weekday × hour transaction counts of the analysis period
+        **Calculation**: Average transactions in each hour of the week, divided by
+        {inventory_analytics.patterns.COUNTER_TRANSACTIONS_PER_HOUR} transactions per clerk and hour
+        **Purpose**: Plan store counter cover for the busy hours of the week
+        """)
+    st.plotly_chart(create_staffing_heatmap(context.demand_histogram, context.days), use_container_width=True)
 
-def render_detailed_reports(days, department_id, user_role):
+def render_detailed_reports(context):
     """Detailed analytical reports"""
     
     with st.expander("📋 **Report Generation - Methodology**", expanded=False):
@@ -519,9 +581,100 @@ def render_detailed_reports(days, department_id, user_role):
     )
     
     if report_type == "Inventory Performance Report":
-        generate_inventory_performance_report(days, department_id, user_role)
+        generate_inventory_performance_report(context)
     elif report_type == "Stock Optimization Report":
-        generate_stock_optimization_report(days, department_id, user_role)
+        generate_stock_optimization_report(context)
+
+def simulate_deployment_risk(data_manager, spare_parts, history_days, deployment_days, trials):
+    """(per item, per department) stock-out risk of the current stock over a deployment"""
+    start = (datetime.now() - timedelta(days=history_days)).date()
+    mean, std = inventory_analytics.daily_demand_stats(
+        data_manager.get_daily_demand(start), spare_parts['id'].to_numpy(), start, history_days)
+    risk = inventory_analytics.deployment_risk(
+        mean, std, spare_parts['quantity'].to_numpy(), spare_parts['id'].to_numpy(),
+        days=deployment_days, trials=trials, seed=SIMULATION_SEED)
+    risk['daily_std'] = std
+    by_department = inventory_analytics.department_risk(risk, spare_parts['department_id'].to_numpy())
+    names = spare_parts.drop_duplicates('department_id').set_index('department_id')['child_department']
+    by_department['department'] = by_department['department_id'].map(names)
+    risk = risk.join(spare_parts[['name', 'part_number', 'child_department']].reset_index(drop=True))
+    return risk.sort_values(['stockout_probability', 'expected_shortfall'], ascending=False), by_department
+
+def render_deployment_risk(context):
+    """Monte Carlo stock-out risk of the current stock over a deployment without resupply"""
+    
+    with st.expander("🚢 **Deployment Risk - Methodology**", expanded=False):
+        st.write("""
+        **Data Used**: Current stock levels + daily check-outs of the analysis period
+        **Calculation**: Each item's demand over the deployment is simulated as a gamma
+        distribution with the period's daily mean and variance times the deployment days,
+        over the same random trials for every item
+        **Stock-out Probability**: Share of trials in which demand exceeds the stock on hand
+        **Expected Shortfall**: Average demand left unmet across all trials
+        """)
+    
+    st.subheader("🚢 Deployment Stock-out Risk")
+    
+    spare_parts = context.spare_parts
+    if spare_parts.empty:
+        st.warning("No inventory data available for risk simulation")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        deployment_days = st.number_input(
+            "Deployment Length (days)", min_value=1, max_value=365,
+            value=inventory_analytics.DEFAULT_DEPLOYMENT_DAYS
+        )
+    with col2:
+        trials = st.select_slider(
+            "Simulation Trials",
+            options=[1000, 5000, 10000, 50000, 100000],
+            value=inventory_analytics.DEFAULT_TRIALS
+        )
+    
+    risk, by_department = cached_section(
+        simulate_deployment_risk, context.inputs + (deployment_days, trials),
+        st.session_state.data_manager, spare_parts, context.days, deployment_days, trials)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Items Simulated", f"{len(risk):,}")
+    with col2:
+        st.metric("Expected Stock-outs", f"{risk['stockout_probability'].sum():,.1f}")
+    with col3:
+        st.metric("Items at Risk (≥50%)", f"{(risk['stockout_probability'] >= 0.5).sum():,}")
+    with col4:
+        st.metric("Expected Shortfall", f"{risk['expected_shortfall'].sum():,.0f} units")
+    
+    if len(by_department) > 1:
+        st.plotly_chart(create_department_risk_chart(by_department), use_container_width=True)
+    
+    st.write(f"**Highest risk items over {deployment_days} days**")
+    columns = {
+        'name': 'Name', 'part_number': 'Part #', 'child_department': 'Department',
+        'quantity': 'In Stock', 'expected_demand': 'Expected Demand',
+        'stockout_probability': 'Stock-out Probability', 'expected_shortfall': 'Expected Shortfall'
+    }
+    st.dataframe(risk.head(RISK_ITEMS_SHOWN)[list(columns)].rename(columns=columns).round(3),
+                 use_container_width=True, hide_index=True)
+    st.download_button(
+        "Download risk for all items",
+        risk[list(columns)].rename(columns=columns).to_csv(index=False),
+        file_name=f"deployment_risk_{deployment_days}d.csv",
+        mime="text/csv"
+    )
+    
+    # Simulated demand distribution of a single item
+    at_risk = risk[risk['expected_demand'] > 0].head(RISK_ITEMS_SHOWN)
+    if not at_risk.empty:
+        selected = st.selectbox(
+            "Simulated demand of",
+            at_risk.index,
+            format_func=lambda index: f"{at_risk.at[index, 'name']} ({at_risk.at[index, 'part_number']})"
+        )
+        st.plotly_chart(create_demand_simulation_chart(at_risk.loc[selected], deployment_days, trials),
+                        use_container_width=True)
 
 # =============================================================================
 # CHART CREATION FUNCTIONS
@@ -533,7 +686,7 @@ def create_monthly_trend_chart(transactions):
         return create_empty_chart("No transaction data available")
     
     transactions = transactions.copy()
-    transactions['timestamp'] = pd.to_datetime(transactions['timestamp'])
+    transactions['timestamp'] = inventory_analytics.parse_timestamps(transactions['timestamp'])
     monthly_data = transactions.groupby([
         transactions['timestamp'].dt.to_period('M'),
         'transaction_type'
@@ -564,30 +717,7 @@ def create_inventory_health_chart(spare_parts):
     if spare_parts.empty:
         return create_empty_chart("No inventory data available")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure decimal columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0.0)
-    
-    # Update health status logic for decimal quantities
-    health_status = []
-    for _, row in spare_parts.iterrows():
-        quantity = float(row['quantity'])
-        min_order_level = float(row['min_order_level'])
-        
-        if quantity == 0:
-            health_status.append('Out of Stock')
-        elif quantity <= 1.0:  # Changed to handle decimal "last piece"
-            health_status.append('Last Piece')
-        elif quantity <= min_order_level:
-            health_status.append('Low Stock')
-        else:
-            health_status.append('Healthy')
-    
-    spare_parts['health_status'] = health_status
-    
-    health_counts = spare_parts['health_status'].value_counts()
+    health_counts = inventory_analytics.health_counts(spare_parts)
     
     fig = px.pie(
         values=health_counts.values,
@@ -606,72 +736,8 @@ def create_department_performance_chart(transactions, spare_parts):
     if transactions.empty or spare_parts.empty:
         return create_empty_chart("Insufficient data for department analysis")
     
-    # Create a copy to avoid modifying original data
-    transactions = transactions.copy()
-    spare_parts = spare_parts.copy()
-    
-    # Check if child_department exists in spare_parts, if not try to get it
-    if 'child_department' not in spare_parts.columns:
-        # Try to get department information
-        if 'department_id' in spare_parts.columns:
-            # Create a mapping from department_id to department name
-            dept_mapping = {}
-            for dept_id in spare_parts['department_id'].unique():
-                dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                if dept_info is not None and not dept_info.empty:
-                    dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                else:
-                    dept_mapping[dept_id] = f'Dept_{dept_id}'
-            
-            spare_parts['child_department'] = spare_parts['department_id'].map(dept_mapping)
-        else:
-            # If no department info available, use a default
-            spare_parts['child_department'] = 'General Department'
-    
-    # Ensure we have the required columns for merging
-    if 'part_id' not in transactions.columns and 'id' in spare_parts.columns:
-        # If transactions has part_id but it's called differently, adjust accordingly
-        # This is a fallback - you might need to adjust based on your actual column names
-        pass
-    
-    # Merge to get department information - handle different possible column names
-    merge_successful = False
-    merged_data = transactions.copy()
-    
-    # Try different possible merge strategies
-    if 'part_id' in transactions.columns and 'id' in spare_parts.columns:
-        merged_data = transactions.merge(
-            spare_parts[['id', 'child_department']], 
-            left_on='part_id', 
-            right_on='id', 
-            how='left'
-        )
-        merge_successful = True
-    elif 'name' in transactions.columns and 'name' in spare_parts.columns:
-        # Merge by name as fallback
-        merged_data = transactions.merge(
-            spare_parts[['name', 'child_department']], 
-            on='name', 
-            how='left'
-        )
-        merge_successful = True
-    
-    if not merge_successful or 'child_department' not in merged_data.columns:
-        # If merge failed or child_department still doesn't exist, create a default
-        merged_data['child_department'] = 'General Department'
-    
-    # Fill any NaN values in child_department
-    merged_data['child_department'] = merged_data['child_department'].fillna('Unknown Department')
-    
-    # Now group by department
-    dept_performance = merged_data.groupby('child_department').agg({
-        'quantity': ['sum', 'count'],
-        'part_id': 'nunique'
-    }).round(2)
-    
-    # Flatten column names
-    dept_performance.columns = ['total_quantity', 'transaction_count', 'unique_items']
-    dept_performance = dept_performance.reset_index()
+    dept_performance = inventory_analytics.department_activity(
+        transactions, ensure_data_consistency(spare_parts))
     
     fig = px.bar(
         dept_performance,
@@ -691,30 +757,8 @@ def create_abc_analysis_chart(spare_parts):
     if spare_parts.empty:
         return create_empty_chart("No data for ABC analysis")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    # Simple ABC analysis based on quantity and criticality
-    spare_parts['criticality_score'] = spare_parts['quantity'] * spare_parts['min_order_level']
-    spare_parts = spare_parts.sort_values('criticality_score', ascending=False)
-    spare_parts['cumulative_percentage'] = spare_parts['criticality_score'].cumsum() / spare_parts['criticality_score'].sum() * 100
-    
-    # Use explicit logic instead of np.select
-    abc_class = []
-    for cum_pct in spare_parts['cumulative_percentage']:
-        if cum_pct <= 80:
-            abc_class.append('A - High Priority')
-        elif cum_pct <= 95:
-            abc_class.append('B - Medium Priority')
-        else:
-            abc_class.append('C - Low Priority')
-    
-    spare_parts['abc_class'] = abc_class
-    
-    abc_counts = spare_parts['abc_class'].value_counts()
+    abc_labels = {'A': 'A - High Priority', 'B': 'B - Medium Priority', 'C': 'C - Low Priority'}
+    abc_counts = inventory_analytics.abc_analysis(spare_parts)['abc_class'].map(abc_labels).value_counts()
     
     fig = px.bar(
         x=abc_counts.index,
@@ -733,16 +777,7 @@ def create_detailed_abc_chart(spare_parts):
     if spare_parts.empty:
         return create_empty_chart("No data for detailed ABC analysis")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    # Calculate criticality score based on quantity and min_order_level
-    spare_parts['criticality_score'] = spare_parts['quantity'] * spare_parts['min_order_level']
-    spare_parts = spare_parts.sort_values('criticality_score', ascending=False)
-    spare_parts['cumulative_percentage'] = spare_parts['criticality_score'].cumsum() / spare_parts['criticality_score'].sum() * 100
+    spare_parts = inventory_analytics.abc_analysis(spare_parts)
     
     # Create Pareto chart
     fig = go.Figure()
@@ -784,26 +819,7 @@ def create_stock_level_analysis_chart(spare_parts):
     if spare_parts.empty:
         return create_empty_chart("No data for stock level analysis")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure decimal columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0.0)
-    
-    # Handle department column
-    if 'child_department' not in spare_parts.columns:
-        if 'department_id' in spare_parts.columns:
-            # Create department mapping
-            dept_mapping = {}
-            for dept_id in spare_parts['department_id'].unique():
-                dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                if dept_info is not None and not dept_info.empty:
-                    dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                else:
-                    dept_mapping[dept_id] = f'Dept_{dept_id}'
-            spare_parts['child_department'] = spare_parts['department_id'].map(dept_mapping)
-        else:
-            spare_parts['child_department'] = 'General'
+    spare_parts = ensure_data_consistency(spare_parts)
     
     # Update hover data to show decimal values
     fig = px.scatter(
@@ -830,62 +846,62 @@ def create_stock_level_analysis_chart(spare_parts):
     fig.update_layout(height=500)
     return fig
 
-def create_demand_forecast_chart(part_transactions, part_data):
-    """Create demand forecast chart for a specific part"""
-    if part_transactions.empty:
-        return create_empty_chart("No transaction data for forecasting")
+def create_demand_forecast_chart(part_transactions, part_data, forecast=None):
+    """Daily check-outs of a part with its 7-day average and stored forecast"""
+    check_outs = part_transactions[part_transactions['transaction_type'] == 'check_out'] \
+        if not part_transactions.empty else part_transactions
+    daily_demand = pd.Series(dtype=float)
+    if not check_outs.empty:
+        timestamps = inventory_analytics.parse_timestamps(check_outs['timestamp'])
+        daily_demand = check_outs['quantity'].groupby(timestamps.dt.date.values).sum()
+    
+    if len(daily_demand) <= 7 and forecast is None:
+        return create_empty_chart("Insufficient data for reliable forecasting")
     
-    part_transactions = part_transactions.copy()
-    part_transactions['timestamp'] = pd.to_datetime(part_transactions['timestamp'])
-    daily_demand = part_transactions.groupby(part_transactions['timestamp'].dt.date)['quantity'].sum()
+    fig = go.Figure()
     
-    # Simple moving average forecast
-    forecast_days = 30
-    if len(daily_demand) > 7:
-        ma_7 = daily_demand.rolling(window=7).mean()
-        
-        fig = go.Figure()
-        
+    if not daily_demand.empty:
         fig.add_trace(go.Scatter(
             x=daily_demand.index,
             y=daily_demand.values,
             name='Actual Demand',
             line=dict(color='blue', width=2)
         ))
-        
+    
+    if len(daily_demand) > 7:
+        ma_7 = daily_demand.rolling(window=7).mean()
         fig.add_trace(go.Scatter(
             x=ma_7.index,
             y=ma_7.values,
             name='7-Day Moving Average',
             line=dict(color='red', width=2, dash='dash')
         ))
-        
-        fig.update_layout(
-            title=f"🔮 Demand Forecast: {part_data['name']}",
-            xaxis_title='Date',
-            yaxis_title='Quantity',
-            height=400,
-            showlegend=True
-        )
-    else:
-        fig = create_empty_chart("Insufficient data for reliable forecasting")
     
+    if forecast is not None:
+        # Both methods forecast a flat daily rate over the horizon
+        horizon = pd.date_range(pd.Timestamp.today().normalize(), periods=forecast['horizon_days'], freq='D')
+        fig.add_trace(go.Scatter(
+            x=horizon,
+            y=[forecast['daily_rate']] * len(horizon),
+            name=f"Forecast ({forecast['method'] or 'no demand'}, {forecast['pattern']})",
+            line=dict(color='green', width=2, dash='dot')
+        ))
+    
+    fig.update_layout(
+        title=f"🔮 Demand Forecast: {part_data['name']}",
+        xaxis_title='Date',
+        yaxis_title='Quantity',
+        height=400,
+        showlegend=True
+    )
     return fig
 
-def create_demand_pattern_chart(transactions):
+def create_demand_pattern_chart(histogram):
     """Create overall demand pattern analysis"""
-    if transactions.empty:
+    if histogram.empty:
         return create_empty_chart("No transaction data for pattern analysis")
     
-    transactions = transactions.copy()
-    transactions['timestamp'] = pd.to_datetime(transactions['timestamp'])
-    transactions['day_of_week'] = transactions['timestamp'].dt.day_name()
-    transactions['hour'] = transactions['timestamp'].dt.hour
-    
-    daily_pattern = transactions.groupby('day_of_week').size()
-    
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    daily_pattern = daily_pattern.reindex(days_order)
+    daily_pattern = inventory_analytics.weekday_totals(histogram)
     
     fig = px.line(
         x=daily_pattern.index,
@@ -897,156 +913,119 @@ def create_demand_pattern_chart(transactions):
     fig.update_layout(height=400)
     return fig
 
-def create_weekly_demand_pattern(transactions):
-    """Create weekly demand pattern chart"""
-    return create_empty_chart("Weekly demand pattern chart placeholder")
-
-def create_demand_correlation_heatmap(transactions):
-    """Create demand correlation heatmap"""
-    return create_empty_chart("Demand correlation heatmap placeholder")
-
-def create_reorder_analysis_chart(spare_parts, transactions):
-    """Create reorder analysis chart"""
-    return create_empty_chart("Reorder analysis chart placeholder")
-
-# =============================================================================
-# ANALYTICAL CALCULATION FUNCTIONS
-# =============================================================================
-
-def calculate_stock_turnover_rate(transactions, spare_parts):
-    """Calculate inventory turnover rate"""
-    if transactions.empty or spare_parts.empty:
-        return 0
-    
-    # Ensure numeric data types
-    transactions = transactions.copy()
-    spare_parts = spare_parts.copy()
-    
-    # Ensure decimal data types
-    transactions['quantity'] = pd.to_numeric(transactions['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    
-    total_usage = abs(transactions[transactions['transaction_type'] == 'check_out']['quantity'].sum())
-    avg_inventory = spare_parts['quantity'].mean()
+def create_weekly_demand_pattern(histogram):
+    """Create weekday x hour check-out quantity heatmap"""
+    if histogram.empty:
+        return create_empty_chart("No transaction data for pattern analysis")
     
-    return float(total_usage / avg_inventory) if avg_inventory != 0 else 0.0
+    matrix = inventory_analytics.weekday_hour_matrix(histogram, 'check_out_quantity')
+    fig = px.imshow(
+        matrix,
+        labels={'x': 'Hour of Day', 'y': 'Day of Week', 'color': 'Units Checked Out'},
+        title="🗓️ Check-outs by Weekday and Hour",
+        color_continuous_scale='Blues',
+        aspect='auto'
+    )
+    fig.update_xaxes(dtick=2)
+    fig.update_layout(height=400)
+    return fig
 
-def calculate_service_level(transactions):
-    """Calculate service level percentage"""
-    if transactions.empty:
-        return 100
-    
-    total_demand = abs(transactions[transactions['transaction_type'] == 'check_out']['quantity'].sum())
-    return 95.0  # Simplified - in real scenario, calculate based on stockouts
+def create_staffing_heatmap(histogram, days):
+    """Create store counter staffing heatmap from average hourly transactions"""
+    if histogram.empty:
+        return create_empty_chart("No transaction data for staffing analysis")
+    
+    average, clerks = inventory_analytics.counter_staffing(histogram, days)
+    weekday, hour, busiest = inventory_analytics.busiest_slot(average)
+    fig = go.Figure(go.Heatmap(
+        z=average.to_numpy(),
+        x=list(average.columns),
+        y=list(average.index),
+        text=clerks.to_numpy(),
+        texttemplate="%{text}",
+        colorscale='YlOrRd',
+        colorbar=dict(title='Avg Transactions'),
+        hovertemplate="%{y} %{x}:00<br>Avg transactions: %{z:.1f}<br>Clerks needed: %{text}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"🧑‍🔧 Clerks Needed per Hour (busiest: {weekday} {hour}:00, {busiest:.1f} transactions)",
+        xaxis_title='Hour of Day',
+        yaxis=dict(autorange='reversed'),
+        height=400
+    )
+    fig.update_xaxes(dtick=2)
+    return fig
 
-def calculate_abc_summary(spare_parts):
-    """Calculate ABC analysis summary"""
-    if spare_parts.empty:
-        return pd.DataFrame()
-    
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    # Simplified ABC calculation
-    spare_parts['criticality_score'] = spare_parts['quantity'] * spare_parts['min_order_level']
-    spare_parts = spare_parts.sort_values('criticality_score', ascending=False)
-    spare_parts['cumulative_percentage'] = spare_parts['criticality_score'].cumsum() / spare_parts['criticality_score'].sum() * 100
-    
-    # Use explicit logic for ABC classification
-    abc_class = []
-    for cum_pct in spare_parts['cumulative_percentage']:
-        if cum_pct <= 80:
-            abc_class.append('A')
-        elif cum_pct <= 95:
-            abc_class.append('B')
-        else:
-            abc_class.append('C')
-    
-    spare_parts['abc_class'] = abc_class
-    
-    abc_summary = spare_parts.groupby('abc_class').agg({
-        'name': 'count',
-        'criticality_score': 'sum',
-        'quantity': 'sum'
-    }).rename(columns={'name': 'item_count', 'criticality_score': 'total_criticality'})
-    
-    abc_summary['percentage_items'] = (abc_summary['item_count'] / len(spare_parts)) * 100
-    abc_summary['percentage_criticality'] = (abc_summary['total_criticality'] / spare_parts['criticality_score'].sum()) * 100
+def create_demand_correlation_heatmap(transactions):
+    """Create demand correlation heatmap, the strongest item pairs and the top related items of every item"""
+    part_ids, matrix, pairs = inventory_analytics.demand_correlations(transactions)
+    if pairs.empty:
+        return create_empty_chart("Not enough recurring demand to correlate items"), pairs, pairs
+    
+    labels = transactions.drop_duplicates('part_id').set_index('part_id')['name'].astype(str)
+    related = pairs.assign(item=pairs['part_id'].map(labels), related_item=pairs['related_part_id'].map(labels))
+    related = related[['part_id', 'item', 'rank', 'related_part_id', 'related_item', 'correlation']]
+    strongest = inventory_analytics.strongest_pairs(pairs)
+    strongest_table = pd.DataFrame({
+        'Item': strongest['part_id'].map(labels),
+        'Related Item': strongest['related_part_id'].map(labels),
+        'Correlation': strongest['correlation'].round(3)
+    })
+    
+    # Heatmap of the items in the strongest pairs
+    shown = pd.unique(strongest[['part_id', 'related_part_id']].to_numpy().ravel())[:HEATMAP_ITEMS]
+    rows = np.searchsorted(part_ids, shown)
+    correlations = inventory_analytics.correlation_matrix(matrix[rows])
+    names = [f"{labels[part_id]} ({part_id})" for part_id in shown]
+    
+    fig = go.Figure(go.Heatmap(
+        z=correlations,
+        x=names,
+        y=names,
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        reversescale=True,
+        colorbar=dict(title='Correlation')
+    ))
+    fig.update_layout(
+        title="🔗 Demand Correlation of Most Related Items",
+        height=500,
+        xaxis=dict(showticklabels=False)
+    )
     
-    return abc_summary.round(2)
+    return fig, strongest_table, related
 
-def generate_stock_recommendations(spare_parts):
-    """Generate stock level recommendations"""
-    recommendations = []
-    
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    spare_parts['min_order_quantity'] = pd.to_numeric(spare_parts['min_order_quantity'], errors='coerce').fillna(1)
-    
-    # Last piece items
-    last_piece = spare_parts[spare_parts['quantity'] == 1]
-    if not last_piece.empty:
-        recommendations.append({
-            'type': '🚨 Immediate Reorder Required',
-            'count': len(last_piece),
-            'description': 'Items at last piece level require immediate attention to avoid stockouts.',
-            'items': last_piece.assign(recommended_action='Immediate Reorder')
-        })
-    
-    # Low stock items
-    low_stock = spare_parts[
-        (spare_parts['quantity'] > 1) & 
-        (spare_parts['quantity'] <= spare_parts['min_order_level'])
-    ]
-    if not low_stock.empty:
-        recommendations.append({
-            'type': '⚠️ Low Stock Alert',
-            'count': len(low_stock),
-            'description': 'Items below minimum order level should be reordered soon.',
-            'items': low_stock.assign(recommended_action='Schedule Reorder')
-        })
-    
-    # Excess stock items
-    excess_stock = spare_parts[spare_parts['quantity'] > spare_parts['min_order_level'] * 3]
-    if not excess_stock.empty:
-        recommendations.append({
-            'type': '💡 Excess Stock Identified',
-            'count': len(excess_stock),
-            'description': 'Items with stock levels significantly above requirements.',
-            'items': excess_stock.assign(recommended_action='Review Stock Levels')
-        })
-    
-    return recommendations
+def create_reorder_analysis_chart(suggestions):
+    """Create current vs suggested minimum level chart"""
+    fig = px.scatter(
+        suggestions.head(REORDER_CHART_ITEMS),
+        x='min_order_level',
+        y='suggested_min_order_level',
+        color='child_department',
+        hover_data=['name', 'part_number', 'avg_daily_demand'],
+        title="🔄 Current vs Suggested Minimum Levels",
+        labels={'min_order_level': 'Current Minimum Level',
+                'suggested_min_order_level': 'Suggested Minimum Level',
+                'child_department': 'Department'}
+    )
+    
+    # Points above the diagonal need a higher minimum level
+    upper = max(suggestions['min_order_level'].max(), suggestions['suggested_min_order_level'].max())
+    fig.add_shape(type='line', x0=0, y0=0, x1=upper, y1=upper, line=dict(color='gray', dash='dash'))
+    fig.update_layout(height=400, showlegend=False)
+    return fig
 
 # =============================================================================
 # REPORT GENERATION FUNCTIONS
 # =============================================================================
 
-def generate_inventory_performance_report(days, department_id, user_role):
+def generate_inventory_performance_report(context):
     """Generate comprehensive inventory performance report"""
     st.subheader("Inventory Performance Report")
     
-    # Get data based on user role and department
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
-    
-    # Ensure data consistency
-    spare_parts = ensure_data_consistency(spare_parts)
-    transactions = ensure_data_consistency(transactions)
+    spare_parts = context.spare_parts
+    transactions = context.transactions
     
     if transactions.empty or spare_parts.empty:
         st.warning("Insufficient data for performance report")
@@ -1058,7 +1037,7 @@ def generate_inventory_performance_report(days, department_id, user_role):
     with col1:
         st.metric("Total Items", len(spare_parts))
         st.metric("Total Transactions", len(transactions))
-        st.metric("Average Daily Movement", f"{len(transactions)/max(days, 1):.1f}")
+        st.metric("Average Daily Movement", f"{len(transactions)/max(context.days, 1):.1f}")
     
     with col2:
         st.metric("Stock Accuracy", "98.2%")
@@ -1078,69 +1057,18 @@ def generate_inventory_performance_report(days, department_id, user_role):
     with analysis_col2:
         st.write("**Department Performance**")
         
-        # Fix: Handle department information properly
-        dept_perf = transactions.copy()
-        
-        # Check if child_department exists in transactions, if not try to merge
-        if 'child_department' not in dept_perf.columns and 'part_id' in dept_perf.columns:
-            # Merge with spare_parts to get department information
-            if 'id' in spare_parts.columns and 'child_department' in spare_parts.columns:
-                dept_perf = dept_perf.merge(
-                    spare_parts[['id', 'child_department']], 
-                    left_on='part_id', 
-                    right_on='id', 
-                    how='left'
-                )
-        
-        # If we still don't have child_department, try to get it from department_id
-        if 'child_department' not in dept_perf.columns and 'department_id' in spare_parts.columns:
-            # Create department mapping
-            dept_mapping = {}
-            for dept_id in spare_parts['department_id'].unique():
-                dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                if dept_info is not None and not dept_info.empty:
-                    dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                else:
-                    dept_mapping[dept_id] = f'Dept_{dept_id}'
-            
-            # Merge department mapping
-            if 'department_id' in dept_perf.columns:
-                dept_perf['child_department'] = dept_perf['department_id'].map(dept_mapping)
-            elif 'part_id' in dept_perf.columns:
-                # Create part_id to department_id mapping
-                part_dept_mapping = spare_parts.set_index('id')['department_id'].to_dict()
-                dept_perf['department_id'] = dept_perf['part_id'].map(part_dept_mapping)
-                dept_perf['child_department'] = dept_perf['department_id'].map(dept_mapping)
-        
-        # If we still don't have department info, use a default
-        if 'child_department' not in dept_perf.columns:
-            dept_perf['child_department'] = 'General Department'
-        
-        # Fill any NaN values
-        dept_perf['child_department'] = dept_perf['child_department'].fillna('Unknown Department')
-        
-        # Now group by department
-        if 'child_department' in dept_perf.columns:
-            dept_summary = dept_perf.groupby('child_department').size().nlargest(5)
+        dept_activity = inventory_analytics.department_activity(transactions, spare_parts)
+        if not dept_activity.empty:
+            dept_summary = dept_activity.set_index('child_department')['transaction_count'].nlargest(5)
             st.dataframe(dept_summary, use_container_width=True)
         else:
             st.info("No department information available")
 
-def generate_stock_optimization_report(days, department_id, user_role):
+def generate_stock_optimization_report(context):
     """Generate stock optimization report"""
     st.subheader("Stock Optimization Report")
     
-    # Get data based on user role and department
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-    
-    # Ensure data consistency
-    spare_parts = ensure_data_consistency(spare_parts)
+    spare_parts = context.spare_parts
     
     if spare_parts.empty:
         st.warning("No data for stock optimization report")
@@ -1150,21 +1078,16 @@ def generate_stock_optimization_report(days, department_id, user_role):
     st.write("**Current Stock Status**")
     
     status_col1, status_col2, status_col3 = st.columns(3)
+    health_counts = inventory_analytics.health_counts(spare_parts)
     
     with status_col1:
-        healthy_stock = len(spare_parts[spare_parts['quantity'] > spare_parts['min_order_level']])
-        st.metric("Healthy Stock Items", healthy_stock)
+        st.metric("Healthy Stock Items", health_counts.get(inventory_analytics.HEALTHY, 0))
     
     with status_col2:
-        low_stock = len(spare_parts[
-            (spare_parts['quantity'] <= spare_parts['min_order_level']) & 
-            (spare_parts['quantity'] > 1)
-        ])
-        st.metric("Low Stock Items", low_stock)
+        st.metric("Low Stock Items", health_counts.get(inventory_analytics.LOW_STOCK, 0))
     
     with status_col3:
-        last_piece = len(spare_parts[spare_parts['quantity'] == 1])
-        st.metric("Last Piece Items", last_piece)
+        st.metric("Last Piece Items", health_counts.get(inventory_analytics.LAST_PIECE, 0))
     
     # Optimization recommendations
     st.subheader("Optimization Recommendations")
@@ -1197,92 +1120,67 @@ def create_empty_chart(message):
     fig.update_layout(height=400)
     return fig
 
-def ensure_data_consistency(df, expected_columns=None):
-    """Ensure dataframe has expected columns and proper data types"""
-    if df.empty:
-        return df
-    
-    df = df.copy()
-    
-    # Update numeric columns to handle decimals
-    numeric_columns = ['quantity', 'min_order_level', 'min_order_quantity', 'line_no']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)  # Changed to 0.0
-    
-    # Handle department information
-    if 'child_department' not in df.columns and 'department_id' in df.columns:
-        # Create department mapping
-        dept_mapping = {}
-        for dept_id in df['department_id'].unique():
-            dept_info = st.session_state.data_manager.get_department_info(dept_id)
-            if dept_info is not None and not dept_info.empty:
-                dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-            else:
-                dept_mapping[dept_id] = f'Dept_{dept_id}'
-        df['child_department'] = df['department_id'].map(dept_mapping)
-    elif 'child_department' not in df.columns:
-        df['child_department'] = 'General Department'
-    
-    # Fill any NaN values in critical columns
-    if 'child_department' in df.columns:
-        df['child_department'] = df['child_department'].fillna('Unknown Department')
-    
-    return df
+def ensure_data_consistency(df):
+    """Numeric columns and department names via inventory_analytics"""
+    return inventory_analytics.ensure_data_consistency(
+        df, st.session_state.data_manager.get_department_names)
 
 def calculate_turnover_trend(transactions):
     """Calculate turnover trend (simplified)"""
     return 0.3  # Placeholder
 
-def calculate_excess_stock_count(spare_parts):
-    """Calculate excess stock items count"""
-    if spare_parts.empty:
-        return 0
-    excess = spare_parts[spare_parts['quantity'] > spare_parts['min_order_level'] * 2]
-    return len(excess)
-
-def calculate_stockout_risk(spare_parts):
-    """Calculate stockout risk items count"""
-    if spare_parts.empty:
-        return 0
-    return len(spare_parts[spare_parts['quantity'] <= spare_parts['min_order_level']])
+def detect_seasonal_trend(seasonality):
+    """Describe a stored department seasonality row"""
+    if seasonality is None:
+        return "Pending"
+    if not seasonality['dominant_period']:
+        return "Stable"
+    return f"{seasonality['dominant_period'].title()} ({seasonality['strength']:.0%})"
 
-def calculate_optimal_stock_level(spare_parts):
-    """Calculate optimal stock level achievement"""
-    if spare_parts.empty:
-        return 0
-    optimal = spare_parts[spare_parts['quantity'] > spare_parts['min_order_level']]
-    return (len(optimal) / len(spare_parts)) * 100
-
-def calculate_average_daily_demand(transactions):
-    """Calculate average daily demand with decimal quantities"""
-    if transactions.empty:
-        return 0.0
-    
-    transactions['date'] = pd.to_datetime(transactions['timestamp']).dt.date
-    daily_demand = transactions.groupby('date')['quantity'].sum()
-    return float(daily_demand.mean())
-
-def calculate_demand_variability(transactions):
-    """Calculate demand variability coefficient with decimal quantities"""
-    if transactions.empty:
-        return 0.0
-    
-    transactions['date'] = pd.to_datetime(transactions['timestamp']).dt.date
-    daily_demand = transactions.groupby('date')['quantity'].sum()
-    return float(daily_demand.std() / daily_demand.mean()) if daily_demand.mean() != 0 else 0.0
+def create_seasonality_chart(seasonal_parts):
+    """Create seasonal item count per cycle chart"""
+    counts = seasonal_parts['dominant_period'].value_counts().reindex(
+        list(inventory_analytics.SEASONAL_PERIODS), fill_value=0)
+    fig = px.bar(
+        x=[period.title() for period in counts.index],
+        y=counts.values,
+        title="🌊 Seasonal Items by Cycle",
+        labels={'x': 'Cycle', 'y': 'Items'}
+    )
+    fig.update_layout(height=400)
+    return fig
 
-def identify_peak_demand(transactions):
-    """Identify peak demand period"""
-    if transactions.empty:
-        return "N/A"
-    transactions['hour'] = pd.to_datetime(transactions['timestamp']).dt.hour
-    hourly_demand = transactions.groupby('hour')['quantity'].sum()
-    return f"{hourly_demand.idxmax()}:00"
+def create_department_risk_chart(by_department):
+    """Create expected stock-outs per department chart"""
+    by_department = by_department[by_department['department'].notna()].sort_values(
+        'expected_stockouts', ascending=False)
+    fig = px.bar(
+        by_department,
+        x='department',
+        y='expected_stockouts',
+        hover_data=['parts', 'parts_at_risk', 'expected_shortfall'],
+        title="🚢 Expected Stock-outs by Department",
+        labels={'department': 'Department', 'expected_stockouts': 'Expected Stock-outs',
+                'parts': 'Items', 'parts_at_risk': 'Items at Risk', 'expected_shortfall': 'Expected Shortfall'}
+    )
+    fig.update_layout(height=400)
+    return fig
 
-def detect_seasonal_trend(transactions):
-    """Detect seasonal trend (simplified)"""
-    return "Stable"
+def create_demand_simulation_chart(item, deployment_days, trials):
+    """Create simulated deployment demand histogram of one item against its stock"""
+    demand = inventory_analytics.simulate_demand(
+        [item['expected_demand']], [item['daily_std'] ** 2 * deployment_days],
+        inventory_analytics.standard_scenarios(trials, SIMULATION_SEED))[0]
+    fig = px.histogram(
+        x=demand,
+        nbins=50,
+        title=f"🎲 Simulated {deployment_days}-Day Demand - {item['name']}",
+        labels={'x': 'Demand'}
+    )
+    fig.add_vline(x=item['quantity'], line_dash="dash", line_color="red",
+                  annotation_text=f"In stock: {item['quantity']:g}")
+    fig.update_layout(height=400, yaxis_title="Trials", showlegend=False)
+    return fig
 
 if __name__ == "__main__":
-    render_analytics_page()
\ No newline at end of file
+    run_page(current_page, render_analytics_page)
\ No newline at end of file
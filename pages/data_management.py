@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 import random
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
+from data_manager import stock_alert_condition
+from page_profiler import run_page
 
 
 current_page = "Data Management"
@@ -450,17 +452,17 @@ def display_database_status():
         st.subheader("Current Stock Alerts")
         
         try:
-            low_stock = pd.read_sql_query('''
+            low_stock = pd.read_sql_query(f'''
                 SELECT name, quantity, min_order_level, min_order_quantity 
                 FROM spare_parts 
-                WHERE quantity <= min_order_level AND quantity > 1
+                WHERE {stock_alert_condition('low_stock')}
                 ORDER BY quantity ASC
             ''', conn)
             
-            last_piece = pd.read_sql_query('''
+            last_piece = pd.read_sql_query(f'''
                 SELECT name, quantity, min_order_level, min_order_quantity 
                 FROM spare_parts 
-                WHERE quantity = 1
+                WHERE {stock_alert_condition('last_piece')}
                 ORDER BY name
             ''', conn)
             
@@ -481,4 +483,4 @@ def display_database_status():
         st.error(f"Error displaying database status: {str(e)}")
 
 if __name__ == "__main__":
-    render_data_management_page()
\ No newline at end of file
+    run_page(current_page, render_data_management_page)
\ No newline at end of file
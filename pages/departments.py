@@ -7,8 +7,8 @@ import pandas as pd
 import sqlite3
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
+from page_profiler import run_page
 from data_manager import DataManager
-import time
 
 
 current_page = "Departments"
@@ -79,9 +79,8 @@ def render_departments_page():
                         if st.form_submit_button("Update"):
                             # Implement update logic
                             if st.session_state.data_manager.update_department(dept_id, new_code, new_name, parent_id):
-                                st.rerun()
                                 st.toast("Department Updated successfully", icon="✅")
-                                time.sleep(3)  # This will block the UI       
+                                st.rerun()
                             else:
                                 st.error("Department code already exists")
                     with col2:
@@ -89,9 +88,8 @@ def render_departments_page():
                             # Implement delete logic
                             success, message = st.session_state.data_manager.delete_department(dept_id)
                             if success:
-                                st.rerun()
                                 st.toast("Department deleted successfully!", icon="✅")
-                                time.sleep(3)  # This will block the UI       
+                                st.rerun()
                             else:
                                 st.error(f"Deletion failed: {message}")
         else:
@@ -121,14 +119,12 @@ def render_departments_page():
                 if not is_parent and code and name and parent_id:
                     if st.session_state.data_manager.add_department(code, name, parent_id):
                         st.toast("Department added successfully", icon="✅")
-                        time.sleep(3)  # This will block the UI
                         st.rerun()
                     else:
                         st.error("Department code already exists")
                 elif is_parent and code and name:
                     if st.session_state.data_manager.add_department(code, name, parent_id):
                         st.toast("Department added successfully", icon="✅")
-                        time.sleep(3)  # This will block the UI
                         st.rerun()
                     else:
                         st.error("Department code already exists")
@@ -136,4 +132,4 @@ def render_departments_page():
                     st.error("Please fill in all required fields")
 
 if __name__ == "__main__":
-    render_departments_page()
\ No newline at end of file
+    run_page(current_page, render_departments_page)
\ No newline at end of file
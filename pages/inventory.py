@@ -8,11 +8,49 @@ from data_manager import DataManager
 from barcode_handler import BarcodeHandler
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
+from page_profiler import run_page
+from fragment_rerun import rerun_fragment
 from datetime import datetime
-import time
 
 
 
+# Inventory grid columns, sort options and stock filters
+USER_GRID_COLUMNS = [
+    'part_number', 'name', 'quantity', 'parent_department', 'child_department', 
+    'line_no', 'description', 'page_no', 'order_no',
+    'material_code', 'ilms_code', 'item_denomination',
+    'mustered', 'compartment_no', 'box_no', 'remark',
+    'min_order_level', 'barcode',
+    'status', 'last_maintenance_date',
+    'next_maintenance_date'
+]
+ADMIN_GRID_COLUMNS = [
+    'part_number', 'name', 'quantity', 'parent_department', 'child_department', 
+    'description', 'item_denomination', 'compartment_no', 'box_no', 'ilms_code', 'min_order_level', 'barcode', 'status', 'department_id'
+]
+GRID_COLUMN_CONFIG = {
+    "mustered": st.column_config.CheckboxColumn("Mustered"),
+    "quantity": st.column_config.NumberColumn("Qty", format="%.2f"),
+    "min_order_level": st.column_config.NumberColumn("Min Order Level", format="%.2f")
+}
+SORT_COLUMNS = {
+    "Name": 'name',
+    "Part Number": 'part_number',
+    "Quantity": 'quantity',
+    "Min Order Level": 'min_order_level',
+    "Compartment": 'compartment_no',
+    "Box": 'box_no',
+    "Status": 'status',
+    "Last Updated": 'last_updated'
+}
+STOCK_FILTERS = {
+    "All Items": None,
+    "Low Stock": 'low_stock',
+    "Last Piece": 'last_piece',
+    "Out of Stock": 'out_of_stock'
+}
+GRID_PAGE_SIZES = [50, 100, 250]
+
 current_page = "Inventory"
 st.header(current_page)
 
@@ -66,41 +104,8 @@ def render_inventory_page():
             if dept_info is not None and not dept_info.empty:
                 st.subheader(f"Inventory for {dept_info['child_department']} Department")
             
-            # Get items only for user's department
-            df = st.session_state.data_manager.get_parts_by_department(current_user_dept_id)
-
-            # Search and filter 
-            search_term = st.text_input("Search parts by name, description, part_number, box_no, compartment_no, ilms_code or barcode")
-            if search_term:
-                df = df[df['name'].str.contains(search_term, case=False) |
-                        df['description'].str.contains(search_term, case=False) |
-                        df['part_number'].str.contains(search_term, case=False) |
-                        df['barcode'].str.contains(search_term, case=False) |
-                        df['ilms_code'].str.contains(search_term, case=False) |
-                        df['compartment_no'].str.contains(search_term, case=False) |
-                        df['box_no'].str.contains(search_term, case=False)]
-
-            if not df.empty:
-                st.dataframe(df[[
-                    'part_number', 'name', 'quantity', 'parent_department', 'child_department', 
-                    'line_no', 'description', 'page_no', 'order_no',
-                    'material_code', 'ilms_code', 'item_denomination',
-                    'mustered', 'compartment_no', 'box_no', 'remark',
-                    'min_order_level', 'barcode',
-                    'status', 'last_maintenance_date',
-                    'next_maintenance_date'
-                ]],
-                column_config={
-                    "mustered": st.column_config.CheckboxColumn("Mustered"),
-                    "quantity": st.column_config.NumberColumn("Qty", format="%.2f"),  # NEW - float with 2 decimal places
-                    "min_order_level": st.column_config.NumberColumn("Min Order Level", format="%.2f")  # Also update min_order_level if needed
-                },
-                use_container_width=True,
-                hide_index=True)
-            else:
-                st.info("""
-                📱 Stock information not available for selected department.
-                """)
+            # Only the visible page of the user's department leaves the database
+            render_parts_grid(current_user_dept_id, USER_GRID_COLUMNS)
         else:
             # Admin/Super User view with department selection
             selected_child = ""
@@ -135,96 +140,8 @@ def render_inventory_page():
                             key = "ListChildDept"
                         )
 
-            if selected_child is not None:
-                # Use a cache key that includes the department to ensure proper refresh
-                cache_key = f"inventory_data_{selected_child}"
-                
-                if cache_key not in st.session_state:
-                    df = st.session_state.data_manager.get_parts_by_department(selected_child)
-                    st.session_state[cache_key] = df
-                else:
-                    df = st.session_state[cache_key]
-                
-                # Clear the cache when departments change
-                if st.session_state.get('last_dept') != selected_child:
-                    if cache_key in st.session_state:
-                        del st.session_state[cache_key]
-                    df = st.session_state.data_manager.get_parts_by_department(selected_child)
-                    st.session_state[cache_key] = df
-                    st.session_state.last_dept = selected_child
-                #df = st.session_state.data_manager.get_parts_by_department(selected_child)
-                #st.session_state.inventory_data = df
-
-                # Search and filter 
-                search_term = st.text_input("Search parts by name, description, part_number, box_no, compartment_no, ilms_code or barcode")
-                if search_term:
-                    df = df[df['name'].str.contains(search_term, case=False) |
-                            df['description'].str.contains(search_term, case=False) |
-                            df['part_number'].str.contains(search_term, case=False) |
-                            df['barcode'].str.contains(search_term, case=False) |
-                            df['ilms_code'].str.contains(search_term, case=False) |
-                            df['compartment_no'].str.contains(search_term, case=False) |
-                            df['box_no'].str.contains(search_term, case=False)]
-
-                if not df.empty:
-                    #st.subheader("Inventory Items - Select a row to edit")
-                    
-                    # Create a copy for display
-                    display_df = df[[
-                        'part_number', 'name', 'quantity', 'parent_department', 'child_department', 
-                        'description', 'item_denomination', 'compartment_no', 'box_no', 'ilms_code', 'min_order_level', 'barcode', 'status', 'department_id'
-                    ]].copy()
-
-                    # Format quantity and min_order_level for display
-                    display_df['quantity'] = display_df['quantity'].apply(lambda x: f"{float(x):.2f}")
-                    display_df['min_order_level'] = display_df['min_order_level'].apply(lambda x: f"{float(x):.2f}")
-                    
-                    # Add row numbers for selection
-                    display_df['row_id'] = range(len(display_df))
-                    
-                    # Create selection form
-                    with st.form("row_selection_form"):
-                        # Display the dataframe
-                        st.dataframe(
-                            display_df.drop(columns=['row_id']),
-                            use_container_width=True,
-                            hide_index=True
-                        )
-                        
-                        # Selection dropdown
-                        row_options = {f"Row {i+1}: {row['part_number']} (Name: {row['name']}) (Dept: {row['department_id']})": row['row_id'] 
-                                    for i, row in display_df.iterrows()}
-                        selected_label = st.selectbox(
-                            "Select a row to edit:",
-                            options=[""] + list(row_options.keys()),
-                            key="row_selector"
-                        )
-                        
-                        submitted = st.form_submit_button("Select Row")
-                        
-                        if submitted and selected_label:
-                            selected_row_id = row_options[selected_label]
-                            selected_row = display_df[display_df['row_id'] == selected_row_id].iloc[0]
-                            
-                            # Store selection in session state
-                            st.session_state.selected_part = selected_row['part_number']
-                            st.session_state.selected_department_id = selected_row['department_id']
-                            
-                            # Rerun to show the form immediately
-                            st.rerun()
-                    
-                    # Show edit form if a row is selected
-                    if st.session_state.selected_part and st.session_state.selected_department_id:
-                        selected_part_data = df[
-                            (df['part_number'] == st.session_state.selected_part) & 
-                            (df['department_id'] == st.session_state.selected_department_id)
-                        ].iloc[0]
-                        
-                        show_edit_form(selected_part_data)
-                else:
-                    st.info("""
-                    📱 Stock information not available for selected department.
-                    """)                
+            if selected_child:
+                render_department_parts(selected_child)
             else:
                 st.info("""
                 📱 Please select Department to view stock information.
@@ -363,6 +280,93 @@ def render_inventory_page():
             bulk_import_section()
 
 
+def select_grid_row(page_df, key):
+    """Make the part of the grid row just selected the one to edit"""
+    rows = st.session_state[key].selection.rows
+    if rows:
+        row = page_df.iloc[rows[0]]
+        st.session_state.selected_part = row['part_number']
+        st.session_state.selected_department_id = int(row['department_id'])
+    else:
+        st.session_state.selected_part = None
+        st.session_state.selected_department_id = None
+
+def render_parts_grid(department_id, columns, selectable=False):
+    """Paginated parts grid of a department; search, filter, sort and paging run in SQL"""
+    data_manager = st.session_state.data_manager
+    
+    cols = st.columns([3, 1, 1, 1])
+    with cols[0]:
+        search_term = st.text_input("Search parts by name, description, part_number, box_no, compartment_no, ilms_code or barcode")
+    with cols[1]:
+        stock_filter = st.selectbox("Stock", list(STOCK_FILTERS), key="parts_grid_stock")
+    with cols[2]:
+        sort_label = st.selectbox("Sort by", list(SORT_COLUMNS), key="parts_grid_sort")
+    with cols[3]:
+        order = st.selectbox("Order", ["Ascending", "Descending"], key="parts_grid_order")
+    
+    search_term = search_term.strip()
+    total = data_manager.count_parts(department_id, search_term, STOCK_FILTERS[stock_filter])
+    if total == 0:
+        st.info("""
+        📱 Stock information not available for selected department.
+        """)
+        return
+    
+    # Back to the first page whenever the rows change; stay within the last page
+    page_size = st.session_state.get("parts_grid_page_size", GRID_PAGE_SIZES[0])
+    pages = (total - 1) // page_size + 1
+    filters = (department_id, search_term, stock_filter, sort_label, order, page_size)
+    if st.session_state.get("parts_grid_filters") != filters:
+        st.session_state.parts_grid_filters = filters
+        st.session_state.parts_grid_page = 1
+    st.session_state.parts_grid_page = min(st.session_state.get("parts_grid_page", 1), pages)
+    page = st.session_state.parts_grid_page
+    
+    page_df = data_manager.get_parts_page(
+        department_id, search_term, STOCK_FILTERS[stock_filter], SORT_COLUMNS[sort_label],
+        order == "Descending", page - 1, page_size)
+    
+    # A new key per page, so a selection never carries over to other rows
+    key = "parts_grid_" + "_".join(str(value) for value in filters + (page,))
+    grid_options = {}
+    if selectable:
+        grid_options = dict(on_select=lambda: select_grid_row(page_df, key), selection_mode="single-row")
+    st.dataframe(
+        page_df[columns],
+        column_config=GRID_COLUMN_CONFIG,
+        use_container_width=True,
+        hide_index=True,
+        key=key,
+        **grid_options
+    )
+    
+    cols = st.columns([3, 1, 1])
+    with cols[0]:
+        first = (page - 1) * page_size + 1
+        st.caption(f"Showing {first}–{first + len(page_df) - 1} of {total} items")
+    with cols[1]:
+        st.selectbox("Rows per page", GRID_PAGE_SIZES, key="parts_grid_page_size")
+    with cols[2]:
+        st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="parts_grid_page")
+
+@st.fragment
+def render_department_parts(department_id):
+    """Selectable parts grid of a department with the edit form of the selected part.
+
+    A fragment: selecting, updating or deleting a part reruns only the grid
+    and the form, not the department selectors and the other tabs.
+    """
+    # Select a row to edit it below the grid
+    render_parts_grid(department_id, ADMIN_GRID_COLUMNS, selectable=True)
+    
+    # Show edit form if a row is selected
+    if st.session_state.selected_part and st.session_state.selected_department_id:
+        selected_part_data = st.session_state.data_manager.get_department_part(
+            st.session_state.selected_part, st.session_state.selected_department_id)
+        if selected_part_data is not None:
+            show_edit_form(selected_part_data)
+
 def show_edit_form(part_data):
     """Show edit form for selected part with decimal quantity support"""
     # Create unique keys for this part
@@ -393,7 +397,7 @@ def show_edit_form(part_data):
             if st.button("✅ Yes, Delete Part", type="primary", use_container_width=True):
                 success = delete_part(part_data)
                 if success:
-                    st.success("✅ Part deleted successfully!")
+                    st.toast("Part deleted successfully!", icon="✅")
                     # Clear all states
                     st.session_state.selected_part = None
                     st.session_state.selected_department_id = None
@@ -401,12 +405,7 @@ def show_edit_form(part_data):
                         del st.session_state[delete_key]
                     if confirm_key in st.session_state:
                         del st.session_state[confirm_key]
-                    # Clear cache
-                    cache_key = f"inventory_data_{part_data['department_id']}"
-                    if cache_key in st.session_state:
-                        del st.session_state[cache_key]
-                    time.sleep(1)
-                    st.rerun()
+                    rerun_fragment()
                 else:
                     st.error("❌ Failed to delete part")
         
@@ -415,7 +414,7 @@ def show_edit_form(part_data):
                 # Clear confirmation state but keep selection
                 if confirm_key in st.session_state:
                     del st.session_state[confirm_key]
-                st.rerun()
+                rerun_fragment()
         
         with col3:
             if st.button("⬅️ Back to Edit", use_container_width=True):
@@ -424,7 +423,7 @@ def show_edit_form(part_data):
                     del st.session_state[delete_key]
                 if confirm_key in st.session_state:
                     del st.session_state[confirm_key]
-                st.rerun()
+                rerun_fragment()
         
         return  # Don't show edit form when in confirmation mode
     
@@ -438,12 +437,12 @@ def show_edit_form(part_data):
         if st.button("✖️ Clear Selection", use_container_width=True):
             st.session_state.selected_part = None
             st.session_state.selected_department_id = None
-            st.rerun()
+            rerun_fragment()
     
     with col2:
         if st.button("🗑️ Delete Part", type="secondary", use_container_width=True):
             st.session_state[confirm_key] = True
-            st.rerun()
+            rerun_fragment()
 
     # Define available status options
     status_options = ["In Store", "Operational", "Under Maintenance"]
@@ -553,11 +552,10 @@ def show_edit_form(part_data):
                     }
                 )
                 if success:
-                    st.success("Part updated successfully!")
-                    time.sleep(2)
+                    st.toast("Part updated successfully!", icon="✅")
                     st.session_state.selected_part = None
                     st.session_state.selected_department_id = None
-                    st.rerun()
+                    rerun_fragment()
                 else:
                     st.error("Failed to update part. Please try again.")
 
@@ -665,10 +663,6 @@ def handle_delete_part(part_data):
                         # Clear all relevant session state
                         st.session_state.selected_part = None
                         st.session_state.selected_department_id = None
-                        # Clear inventory cache to force refresh
-                        cache_key = f"inventory_data_{part_data['department_id']}"
-                        if cache_key in st.session_state:
-                            del st.session_state[cache_key]
                         # Clear delete state
                         if delete_key in st.session_state:
                             del st.session_state[delete_key]
@@ -1046,4 +1040,4 @@ def convert_df_to_csv(df):
     return df.to_csv(index=False).encode('utf-8')
 
 if __name__ == "__main__":
-    render_inventory_page()
+    run_page(current_page, render_inventory_page)
@@ -4,12 +4,13 @@ from app_settings import set_page_configuration
 set_page_configuration()
 
 import pandas as pd
-from data_manager import DataManager
+from data_manager import DataManager, ALERT_TYPES
 from barcode_handler import BarcodeHandler
 from user_management import login_required, init_session_state, check_and_restore_session
 from datetime import datetime
 import navbar
-import time
+from page_profiler import run_page
+from fragment_rerun import rerun_fragment
 import math
 
 
@@ -30,6 +31,294 @@ def safe_float_round(value, precision=6):
     except (ValueError, TypeError):
         return 0.0
 
+def resolve_scan(scan_input, department_id=None):
+    """(part, prefix matches) for a scanned barcode or a typed part number or name.
+
+    part is set when the input is a barcode or exactly one matching part
+    number, otherwise None and the caller offers the matches.
+    """
+    success, part = st.session_state.barcode_handler.get_part_by_barcode(
+        st.session_state.data_manager, scan_input)
+    if success:
+        return part, pd.DataFrame()
+    matches = st.session_state.data_manager.search_parts_by_prefix(scan_input, department_id)
+    if matches.empty:
+        return None, matches
+    exact = matches[matches['part_number'].fillna('').str.upper() == scan_input.upper()]
+    if len(exact) == 1:
+        return exact.iloc[0], matches
+    return None, matches
+
+def part_labels(parts):
+    """Pick list label of every part, keyed by the frame's index"""
+    return {
+        index: f"{name} (Part#: {part_number}, {department}, Qty: {safe_float_round(quantity):.3f})"
+        for index, name, part_number, department, quantity in zip(
+            parts.index, parts['name'], parts['part_number'], parts['child_department'], parts['quantity'])
+    }
+
+@st.fragment
+def render_open_alerts():
+    """Open stock alerts grouped by type, with acknowledgement.
+
+    A fragment: acknowledging alerts reruns only the alert list.
+    """
+    alerts = st.session_state.data_manager.get_open_alerts()
+    if alerts.empty:
+        return
+
+    for alert_type, label in ALERT_TYPES.items():
+        items = alerts[alerts['alert_type'] == alert_type]
+        if items.empty:
+            continue
+        with st.expander(f"🚨 {label} Alerts", expanded=False):
+            st.warning(f"{len(items)} items need attention!")
+            event = st.dataframe(
+                items[['name', 'part_number', 'quantity', 'min_order_level', 'min_order_quantity',
+                       'child_department', 'opened_at']].rename(columns={
+                    'name': 'Name', 'part_number': 'Part #', 'quantity': 'Current Stock',
+                    'min_order_level': 'Minimum Level', 'min_order_quantity': 'Suggested Order',
+                    'child_department': 'Department', 'opened_at': 'Since'}),
+                hide_index=True, use_container_width=True,
+                on_select="rerun", selection_mode="multi-row", key=f"alerts_{alert_type}")
+            selected = event.selection.rows
+            if st.button(f"Acknowledge {len(selected)} selected", key=f"ack_{alert_type}",
+                         disabled=not selected):
+                success, error_msg = st.session_state.data_manager.acknowledge_alerts(
+                    items['alert_id'].iloc[selected], st.session_state.get('username'))
+                if success:
+                    st.toast(f"Acknowledged {len(selected)} alerts", icon="✅")
+                    rerun_fragment()
+                st.error(f"Could not acknowledge alerts: {error_msg}")
+
+@st.fragment
+def render_scanner(department_id):
+    """Scan a part and check it in or out.
+
+    A fragment: confirming a scan reruns only this panel; the alerts above
+    catch up on the next full rerun.
+    """
+    st.info("""
+    📱 Use this interface with a physical barcode scanner or enter the barcode manually.
+    The scanner should work automatically when you scan a barcode.
+    You can also type a part number or the start of a part name.
+    """)
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        scan_input = st.text_input("Scan Barcode or Type Part Number / Name",
+                                   key="barcode_scanner",
+                                   placeholder="ABC-D-1234").strip()
+
+        # Barcodes and part numbers resolve through single index probes;
+        # anything else offers a short prefix pick list
+        part = None
+        if scan_input:
+            part, matches = resolve_scan(scan_input, department_id)
+            if part is None and not matches.empty:
+                matches = matches.set_index('id', drop=False)
+                labels = part_labels(matches)
+                chosen = st.selectbox("Matching Parts", matches.index, index=None,
+                                      placeholder=f"{len(matches)} parts start with '{scan_input}'",
+                                      format_func=labels.get, key="scan_match")
+                if chosen is not None:
+                    part = matches.loc[chosen]
+            elif part is None:
+                st.error("No part found with this barcode, part number or name")
+
+        if part is not None:
+            # Show alert if item is low on stock
+            if safe_float_round(part['quantity']) <= safe_float_round(part['min_order_level']):
+                st.warning(
+                    f"⚠️ Low stock alert: Only {safe_float_round(part['quantity']):.3f} units remaining!"
+                )
+
+            st.json({
+                "Name": part['name'],
+                "Part Number": part['part_number'],
+                "Box No": part['box_no'],
+                "Compartment Name": part['compartment_no'],
+                "ILMS Code": part['ilms_code'],
+                "Current Quantity": safe_float_round(part['quantity']),
+                "Min Order Level": safe_float_round(part['min_order_level'])
+            })
+
+            cols = st.columns(2)
+            with cols[0]:
+                # Quick actions for scanned part
+                action = st.selectbox("Select Action",
+                                    ["Check In", "Check Out"],
+                                    key="barcode_action")
+
+                # Convert all values to float to avoid mixed types
+                available_quantity = safe_float_round(part['quantity'])
+
+                # Fix: Use safe rounding for min_value to avoid floating point precision issues
+                min_val = 0.1
+                max_val = safe_float_round(available_quantity) if action == "Check Out" else None
+
+                # Ensure max_value is at least min_value
+                if max_val is not None and max_val < min_val:
+                    max_val = min_val
+
+                quantity = st.number_input(
+                    "Quantity",
+                    min_value=min_val,
+                    max_value=max_val,
+                    value=min(1.0, available_quantity) if action == "Check Out" else 1.0,
+                    step=0.1,
+                    format="%.3f",
+                    key="barcode_quantity"
+                )
+            with cols[1]:
+                if action == "Check Out":
+                    reason = st.selectbox("Reason", ["Operational", "Maintenance", "Damaged"], key="barcode_reason_out")
+                    remarks = st.text_area("Remarks", key="barcode_remarks_out")
+                else:
+                    reason = st.selectbox("Reason", ["New", "After Maintenance"], key="barcode_reason_in")
+                    remarks = st.text_area("Remarks", key="barcode_remarks_in")
+
+            if st.button(f"Confirm {action}"):
+                transaction_type = 'check_in' if action == "Check In" else 'check_out'
+
+                success, error_msg = st.session_state.data_manager.record_transaction(
+                    part['id'], transaction_type, quantity, reason, remarks)
+
+                if success:
+                    st.toast(f"Successfully {action.lower()}ed {quantity:.3f} units", icon="✅")
+
+                    # Check if action triggered low stock alert
+                    updated_df = st.session_state.data_manager.get_part_by_id(
+                        part['id'])
+                    if updated_df is not None and not updated_df.empty:
+                        updated_part = updated_df.iloc[0]
+                        if safe_float_round(updated_part['quantity']) <= safe_float_round(updated_part['min_order_level']):
+                            st.toast(f"Stock Alert: {updated_part['name']} is now below minimum stock level!", icon="⚠️")
+
+                    st.session_state.last_scans.append(
+                        f"{datetime.now().strftime('%H:%M:%S')} - {part['name']}"
+                    )
+                    rerun_fragment()
+                else:
+                    st.error(f"Transaction failed: {error_msg}")
+
+    with col2:
+        if part is not None and part['barcode']:
+            barcode_image = st.session_state.barcode_handler.generate_barcode(part['barcode'])
+            st.image(f"data:image/png;base64,{barcode_image}")
+        st.markdown("### Last Scanned")
+        for scan in st.session_state.last_scans[-5:]:
+            st.text(scan)
+
+@st.fragment
+def render_part_operations(department_id):
+    """Part search with check-in and check-out forms for a department.
+
+    A fragment: submitting a form reruns only the part search, the stock
+    summary and the forms, not the department selectors above.
+    """
+    st.subheader("Part Selection")
+
+    # Prefix search over the department's part numbers and names; only
+    # the matches are read, however large the department
+    part_query = st.text_input("Find Part by Part Number or Name", key="operations_part_search",
+                               placeholder="Type the start of a part number or name")
+    matches = st.session_state.data_manager.search_parts_by_prefix(part_query.strip(), department_id)
+    if not matches.empty:
+        matches = matches.set_index('id', drop=False)
+        labels = part_labels(matches)
+        selected_id = st.selectbox(
+            "Select Part for Check-In/Check-Out",
+            options=matches.index,
+            format_func=labels.get,
+            key="operations_part_select"
+        )
+
+        if selected_id is not None:
+            part_data = matches.loc[selected_id]
+
+            # Show stock level warning if applicable
+            if safe_float_round(part_data['quantity']) <= safe_float_round(part_data['min_order_level']):
+                st.warning(
+                    f"⚠️ Low stock alert: Only {safe_float_round(part_data['quantity']):.3f} units remaining!"
+                )
+            else:
+                st.info(f"Current quantity: {safe_float_round(part_data['quantity']):.3f}")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                with st.form("check_in_form"):
+                    check_in_quantity = st.number_input(
+                        "Check-In Quantity",
+                        min_value=0.1,
+                        value=1.0,
+                        step=0.1,
+                        format="%.3f",
+                        key="checkin_quantity"
+                    )
+                    reason = st.selectbox("Reason", ["New", "After Maintenance"], key="checkin_reason")
+                    remarks = st.text_area("Remarks", key="checkin_remarks")
+
+                    if st.form_submit_button("Check-In"):
+                        success, error_msg = st.session_state.data_manager.record_transaction(
+                            part_data['id'], 'check_in', check_in_quantity, reason, remarks)
+                        if success:
+                            st.toast(f"Checked in {check_in_quantity:.3f} units of {part_data['name']}", icon="✅")
+                            rerun_fragment()
+                        else:
+                            st.error(f"Transaction failed: {error_msg}")
+
+            with col2:
+                with st.form(f"check_out_form_{part_data['id']}"):
+                    # Get the available quantity as float with safe rounding
+                    available_quantity = safe_float_round(part_data['quantity'])
+
+                    if available_quantity > 0:
+                        # Fix: Use safe rounding for max_value to avoid floating point precision issues
+                        max_val = safe_float_round(available_quantity)
+                        min_val = 0.1
+
+                        # Ensure max_value is at least min_value
+                        if max_val < min_val:
+                            max_val = min_val
+
+                        check_out_quantity = st.number_input(
+                            "Check-Out Quantity",
+                            min_value=min_val,
+                            max_value=max_val,
+                            value=min(1.0, available_quantity),
+                            step=0.1,
+                            format="%.3f",
+                            key=f"checkout_quantity_{part_data['id']}"
+                        )
+                        reason = st.selectbox("Reason", ["Operational", "Maintenance", "Damaged"], key="checkout_reason")
+                        remarks = st.text_area("Remarks", key="checkout_remarks")
+                    else:
+                        st.warning("This item is currently out of stock")
+                        check_out_quantity = 0.0
+
+                    submitted = st.form_submit_button("Check-Out", disabled=(available_quantity <= 0))
+
+                    if submitted and available_quantity > 0:
+                        success, error_msg = st.session_state.data_manager.record_transaction(
+                            part_data['id'], 'check_out', check_out_quantity, reason, remarks)
+
+                        if success:
+                            # Check for low stock alert
+                            updated_df = st.session_state.data_manager.get_part_by_id(part_data['id'])
+                            if updated_df is not None and not updated_df.empty:
+                                updated_part = updated_df.iloc[0]
+                                if safe_float_round(updated_part['quantity']) <= safe_float_round(updated_part['min_order_level']):
+                                    st.toast(f"Stock Alert: {updated_part['name']} is now below minimum stock level!", icon="⚠️")
+
+                            st.toast(f"Successfully checked out {check_out_quantity:.3f} units of {part_data['name']}", icon="✅")
+                            rerun_fragment()
+                        else:
+                            st.error(f"Transaction failed: {error_msg}")
+    else:
+        st.info("No parts in the selected department match this search")
+
 @login_required
 def render_operations_page():
     # Initialize session state if needed
@@ -46,145 +335,17 @@ def render_operations_page():
     if 'operations_child_dept' not in st.session_state:
         st.session_state.operations_child_dept = None
 
-    # Show any active alerts
-    lpl_stock = st.session_state.data_manager.get_last_piece_stock_items()
-    if not lpl_stock.empty:
-        with st.expander("🚨 Last Piece Stock Alerts", expanded=False):
-            st.warning(f"{len(lpl_stock)} items need attention!")
-            for _, item in lpl_stock.iterrows():
-                st.error(f"""
-                    **{item['name']}** (Part #{item['part_number']})
-                    - Current Stock: {safe_float_round(item['quantity']):.3f}
-                    - Minimum Level: {safe_float_round(item['min_order_level']):.3f}
-                    - Suggested Order: {safe_float_round(item['min_order_quantity']):.3f}
-                """)
-
-    low_stock = st.session_state.data_manager.get_low_stock_items()
-    if not low_stock.empty:
-        with st.expander("🚨 Low Stock Alerts", expanded=False):
-            st.warning(f"{len(low_stock)} items need attention!")
-            for _, item in low_stock.iterrows():
-                st.error(f"""
-                    **{item['name']}** (Part #{item['part_number']})
-                    - Current Stock: {safe_float_round(item['quantity']):.3f}
-                    - Minimum Level: {safe_float_round(item['min_order_level']):.3f}
-                    - Suggested Order: {safe_float_round(item['min_order_quantity']):.3f}
-                """)
-
-    tab1, tab2 = st.tabs(
-        ["Barcode Scanner Interface", "Check-In / Check-Out"])
+    # Show any open alerts
+    render_open_alerts()
 
-    with tab1:
-        st.info("""
-        📱 Use this interface with a physical barcode scanner or enter the barcode manually.
-        The scanner should work automatically when you scan a barcode.
-        """)
-
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            barcode_input = st.text_input("Scan or Enter Barcode",
-                                          key="barcode_scanner",
-                                          placeholder="ABC-D-1234")
-
-            if barcode_input:
-                is_valid, cleaned_barcode = st.session_state.barcode_handler.validate_barcode(
-                    barcode_input)
-                if is_valid:
-                    success, part = st.session_state.barcode_handler.get_part_by_barcode(
-                        st.session_state.data_manager, barcode_input)
-                    if success:
-                        # Show alert if item is low on stock
-                        if safe_float_round(part['quantity']) <= safe_float_round(part['min_order_level']):
-                            st.warning(
-                                f"⚠️ Low stock alert: Only {safe_float_round(part['quantity']):.3f} units remaining!"
-                            )
-
-                        st.json({
-                            "Name": part['name'],
-                            "Part Number": part['part_number'],
-                            "Box No": part['box_no'],
-                            "Compartment Name": part['compartment_no'],
-                            "ILMS Code": part['ilms_code'],
-                            "Current Quantity": safe_float_round(part['quantity']),
-                            "Min Order Level": safe_float_round(part['min_order_level'])
-                        })
-
-                        cols = st.columns(2)
-                        with cols[0]:
-                            # Quick actions for scanned part
-                            action = st.selectbox("Select Action",
-                                                ["Check In", "Check Out"],
-                                                key="barcode_action")
-
-                            # Convert all values to float to avoid mixed types
-                            available_quantity = safe_float_round(part['quantity'])
-                            
-                            # Fix: Use safe rounding for min_value to avoid floating point precision issues
-                            min_val = 0.1
-                            max_val = safe_float_round(available_quantity) if action == "Check Out" else None
-                            
-                            # Ensure max_value is at least min_value
-                            if max_val is not None and max_val < min_val:
-                                max_val = min_val
-                            
-                            quantity = st.number_input(
-                                "Quantity",
-                                min_value=min_val,
-                                max_value=max_val,
-                                value=min(1.0, available_quantity) if action == "Check Out" else 1.0,
-                                step=0.1,
-                                format="%.3f",
-                                key="barcode_quantity"
-                            )
-                        with cols[1]:
-                            if action == "Check Out":
-                                reason = st.selectbox("Reason", ["Operational", "Maintenance", "Damaged"], key="barcode_reason_out")
-                                remarks = st.text_area("Remarks", key="barcode_remarks_out")
-                            else:
-                                reason = st.selectbox("Reason", ["New", "After Maintenance"], key="barcode_reason_in")
-                                remarks = st.text_area("Remarks", key="barcode_remarks_in")
-
-                        if st.button(f"Confirm {action}"):
-                            transaction_type = 'check_in' if action == "Check In" else 'check_out'
-
-                            success, error_msg = st.session_state.data_manager.record_transaction(
-                                part['id'], transaction_type, quantity, reason, remarks)
-
-                            if success:
-                                st.success(
-                                    f"Successfully {action.lower()}ed {quantity:.3f} units"
-                                )
-
-                                # Check if action triggered low stock alert
-                                updated_df = st.session_state.data_manager.get_part_by_id(
-                                    part['id'])
-                                if updated_df is not None and not updated_df.empty:
-                                    updated_part = updated_df.iloc[0]
-                                    if safe_float_round(updated_part['quantity']) <= safe_float_round(updated_part['min_order_level']):
-                                        st.warning(
-                                            f"⚠️ Stock Alert: {updated_part['name']} is now below minimum stock level!"
-                                        )
-
-                                st.session_state.last_scans.append(
-                                    f"{datetime.now().strftime('%H:%M:%S')} - {part['name']}"
-                                )
-                                st.rerun()
-                            else:
-                                st.error(f"Transaction failed: {error_msg}")
-                    else:
-                        st.error("Barcode not found in system")
-                else:
-                    st.error(
-                        "Invalid barcode format. Expected format: 3 chars - 1 char - 4 digits (ABC-D-1234)"
-                    )
+    # Users pick from their own department; a scanned barcode resolves anywhere
+    scan_department = st.session_state.get('user_department_id') if st.session_state.get('user_role') == 'User' else None
 
-        with col2:
-            if len(barcode_input) > 0:
-                barcode_image = st.session_state.barcode_handler.generate_barcode(barcode_input)
-                st.image(f"data:image/png;base64,{barcode_image}")
-            st.markdown("### Last Scanned")
-            for scan in st.session_state.last_scans[-5:]:
-                st.text(scan)
+    tab1, tab2, tab3 = st.tabs(
+        ["Barcode Scanner Interface", "Check-In / Check-Out", "Burst Scanning"])
+
+    with tab1:
+        render_scanner(scan_department)
 
     with tab2:
         # Department Selection for Check-In/Check-Out
@@ -209,7 +370,7 @@ def render_operations_page():
             # Regular users can only see their own department
             selected_child = current_user_dept_id
             if selected_child:
-                dept_info = st.session_state.data_manager.getdepartment_info(selected_child)
+                dept_info = st.session_state.data_manager.get_department_info(selected_child)
                 if dept_info is not None and not dept_info.empty:
                     st.info(f"📋 Your Department: {dept_info['child_department']} - {dept_info['parent_department']}")
         else:
@@ -291,133 +452,15 @@ def render_operations_page():
             else:
                 departments_active_selected = False
         
-        # Get parts based on department selection - ONLY if departments are actively selected
-        df = pd.DataFrame()
-        
         if departments_active_selected and selected_child:
-            df = st.session_state.data_manager.get_parts_by_department(selected_child)
-            
             # Show department info
             dept_info = st.session_state.data_manager.get_department_info(selected_child)
             if dept_info is not None and not dept_info.empty:
                 st.success(f"📊 Showing parts for: {dept_info['child_department']} - {dept_info['parent_department']}")
 
-        # Only show part selection and check-in/check-out if departments are actively selected AND we have parts
+        # Only show part selection and check-in/check-out if departments are actively selected
         if departments_active_selected:
-            if not df.empty:
-                st.subheader("Part Selection")
-                
-                # Create a user-friendly display for the dropdown
-                part_options = []
-                for _, part in df.iterrows():
-                    display_text = f"{part['name']} (Part#: {part['part_number']}, Qty: {safe_float_round(part['quantity']):.3f})"
-                    part_options.append((display_text, part))
-                
-                # Part selection dropdown
-                if part_options:
-                    selected_display = st.selectbox(
-                        "Select Part for Check-In/Check-Out",
-                        options=[opt[0] for opt in part_options],
-                        key="operations_part_select"
-                    )
-                    
-                    # Get the selected part data
-                    selected_part_data = None
-                    for display_text, part_data in part_options:
-                        if display_text == selected_display:
-                            selected_part_data = part_data
-                            break
-                    
-                    if selected_part_data is not None:
-                        part_data = selected_part_data
-                        
-                        # Show stock level warning if applicable
-                        if safe_float_round(part_data['quantity']) <= safe_float_round(part_data['min_order_level']):
-                            st.warning(
-                                f"⚠️ Low stock alert: Only {safe_float_round(part_data['quantity']):.3f} units remaining!"
-                            )
-                        else:
-                            st.info(f"Current quantity: {safe_float_round(part_data['quantity']):.3f}")
-
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            with st.form("check_in_form"):
-                                check_in_quantity = st.number_input(
-                                    "Check-In Quantity",
-                                    min_value=0.1,
-                                    value=1.0,
-                                    step=0.1,
-                                    format="%.3f",
-                                    key="checkin_quantity"
-                                )
-                                reason = st.selectbox("Reason", ["New", "After Maintenance"], key="checkin_reason")
-                                remarks = st.text_area("Remarks", key="checkin_remarks")
-                                
-                                if st.form_submit_button("Check-In"):
-                                    success, error_msg = st.session_state.data_manager.record_transaction(
-                                        part_data['id'], 'check_in', check_in_quantity, reason, remarks)
-                                    if success:
-                                        st.success(f"Checked in {check_in_quantity:.3f} units")
-                                        time.sleep(2)
-                                        st.rerun()
-                                    else:
-                                        st.error(f"Transaction failed: {error_msg}")
-
-                        with col2:
-                            with st.form(f"check_out_form_{part_data['id']}"):
-                                # Get the available quantity as float with safe rounding
-                                available_quantity = safe_float_round(part_data['quantity'])
-                                
-                                if available_quantity > 0:
-                                    # Fix: Use safe rounding for max_value to avoid floating point precision issues
-                                    max_val = safe_float_round(available_quantity)
-                                    min_val = 0.1
-                                    
-                                    # Ensure max_value is at least min_value
-                                    if max_val < min_val:
-                                        max_val = min_val
-                                    
-                                    check_out_quantity = st.number_input(
-                                        "Check-Out Quantity",
-                                        min_value=min_val,
-                                        max_value=max_val,
-                                        value=min(1.0, available_quantity),
-                                        step=0.1,
-                                        format="%.3f",
-                                        key=f"checkout_quantity_{part_data['id']}"
-                                    )
-                                    reason = st.selectbox("Reason", ["Operational", "Maintenance", "Damaged"], key="checkout_reason")
-                                    remarks = st.text_area("Remarks", key="checkout_remarks")
-                                else:
-                                    st.warning("This item is currently out of stock")
-                                    check_out_quantity = 0.0
-                                
-                                submitted = st.form_submit_button("Check-Out", disabled=(available_quantity <= 0))
-                                
-                                if submitted and available_quantity > 0:
-                                    success, error_msg = st.session_state.data_manager.record_transaction(
-                                        part_data['id'], 'check_out', check_out_quantity, reason, remarks)
-
-                                    if success:
-                                        # Check for low stock alert
-                                        updated_df = st.session_state.data_manager.get_part_by_id(part_data['id'])
-                                        if updated_df is not None and not updated_df.empty:
-                                            updated_part = updated_df.iloc[0]
-                                            if safe_float_round(updated_part['quantity']) <= safe_float_round(updated_part['min_order_level']):
-                                                st.warning(
-                                                    f"⚠️ Stock Alert: {updated_part['name']} is now below minimum stock level!"
-                                                )
-                                        
-                                        st.success(f"Successfully checked out {check_out_quantity:.3f} units of {part_data['name']}")
-                                        time.sleep(2)
-                                        st.rerun()
-                                    else:
-                                        st.error(f"Transaction failed: {error_msg}")
-                else:
-                    st.info("No parts available in the selected department")
-            else:
-                st.info("No parts found in the selected department")
+            render_part_operations(selected_child)
         else:
             # Show this message only when no department is actively selected
             if current_user_role == 'User':
@@ -426,6 +469,133 @@ def render_operations_page():
             else:
                 st.info("Please select both parent and child departments to view available parts")
 
+    with tab3:
+        render_burst_mode(scan_department)
+
+def queue_burst_scan(department_id):
+    """Add the scanned part to the burst queue, or count it once more"""
+    scan_input = st.session_state.burst_scan.strip()
+    # Ready for the next scan
+    st.session_state.burst_scan = ""
+    if not scan_input:
+        return
+    part, _ = resolve_scan(scan_input, department_id)
+    if part is None:
+        st.session_state.burst_feedback = ("error", f"{scan_input}: no part with this barcode or part number")
+        return
+    
+    step = st.session_state.burst_step
+    queue = st.session_state.burst_queue
+    for line in queue:
+        if line['part_id'] == int(part['id']):
+            line['quantity'] += step
+            break
+    else:
+        queue.append({'part_id': int(part['id']), 'name': part['name'],
+                      'part_number': part['part_number'], 'quantity': step})
+    st.session_state.burst_version += 1
+    st.session_state.burst_feedback = ("success", f"Scanned {part['name']} ({part['part_number']})")
+
+def apply_burst_edits(key):
+    """Apply the quantity changes and deleted rows of the burst queue editor"""
+    edits = st.session_state[key]
+    queue = st.session_state.burst_queue
+    for row, changes in edits['edited_rows'].items():
+        if changes.get('quantity') is not None:
+            queue[int(row)]['quantity'] = float(changes['quantity'])
+    for row in sorted(edits['deleted_rows'], reverse=True):
+        del queue[row]
+    # A fresh editor for the new queue, so these edits are not applied twice
+    st.session_state.burst_version += 1
+
+def clear_burst():
+    st.session_state.burst_queue = []
+    st.session_state.burst_version += 1
+    st.session_state.burst_feedback = None
+
+@st.fragment
+def render_burst_mode(department_id):
+    """Scan many parts in a row and record them in one transaction.
+
+    A fragment: each scan reruns only this panel, and the queue lives in
+    session state until it is committed.
+    """
+    if 'burst_queue' not in st.session_state:
+        st.session_state.burst_queue = []
+        st.session_state.burst_version = 0
+        st.session_state.burst_feedback = None
+    data_manager = st.session_state.data_manager
+    
+    st.info("""
+    ⚡ Scan items one after another; each scan adds to the list below without reloading the page.
+    Scanning an item again adds to its quantity. Commit the list in one go when done.
+    """)
+    
+    cols = st.columns(3)
+    with cols[0]:
+        action = st.radio("Action", ["Check Out", "Check In"], horizontal=True, key="burst_action")
+    with cols[1]:
+        reasons = ["Operational", "Maintenance", "Damaged"] if action == "Check Out" else ["New", "After Maintenance"]
+        reason = st.selectbox("Reason", reasons, key=f"burst_reason_{action}")
+    with cols[2]:
+        st.number_input("Quantity per Scan", min_value=0.1, value=1.0, step=0.1, format="%.3f", key="burst_step")
+    remarks = st.text_input("Remarks", key="burst_remarks")
+    
+    st.text_input("Scan Barcode or Part Number", key="burst_scan", placeholder="ABC-D-1234",
+                  on_change=queue_burst_scan, args=(department_id,))
+    if st.session_state.burst_feedback:
+        level, message = st.session_state.burst_feedback
+        (st.success if level == "success" else st.error)(message)
+    
+    queue = st.session_state.burst_queue
+    if not queue:
+        return
+    
+    # Validated as a whole: repeated check-outs of a part count against the same stock
+    transaction_type = 'check_out' if action == "Check Out" else 'check_in'
+    lines = [(line['part_id'], transaction_type, line['quantity'], reason, remarks) for line in queue]
+    errors = data_manager.check_transaction_batch(lines)
+    failed = sum(error is not None for error in errors)
+    
+    key = f"burst_editor_{st.session_state.burst_version}"
+    st.data_editor(
+        pd.DataFrame(queue).assign(status=[error or "✅ Ready" for error in errors])[
+            ['name', 'part_number', 'quantity', 'status']],
+        column_config={
+            "name": "Name",
+            "part_number": "Part #",
+            "quantity": st.column_config.NumberColumn("Qty", min_value=0.001, format="%.3f"),
+            "status": "Status"
+        },
+        disabled=['name', 'part_number', 'status'],
+        # Rows are only added by scanning, so the editor can drop them but not add any
+        num_rows="delete",
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+        on_change=apply_burst_edits,
+        args=(key,)
+    )
+    
+    cols = st.columns(2)
+    with cols[0]:
+        commit = st.button(f"Commit {len(queue)} Lines", type="primary", disabled=failed > 0)
+    with cols[1]:
+        st.button("Clear List", on_click=clear_burst)
+    if failed:
+        st.warning(f"Fix or remove the {failed} lines that cannot be recorded before committing")
+    
+    if commit:
+        success, error_msg = data_manager.record_transactions(lines)
+        if success:
+            st.session_state.last_scans.extend(
+                f"{datetime.now().strftime('%H:%M:%S')} - {line['name']}" for line in queue)
+            clear_burst()
+            st.session_state.burst_feedback = ("success", f"Recorded {len(lines)} {action.lower()} lines")
+            # Whole page, so stock alerts catch up with the burst
+            st.rerun()
+        else:
+            st.error(f"Transaction failed: {error_msg}")
 
 if __name__ == "__main__":
-    render_operations_page()
\ No newline at end of file
+    run_page(current_page, render_operations_page)
\ No newline at end of file
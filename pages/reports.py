@@ -10,7 +10,11 @@ from datetime import datetime, timedelta
 import numpy as np
 from user_management import login_required, init_session_state, check_and_restore_session
 import navbar
-from data_manager import DataManager
+from page_profiler import run_page
+from section_cache import cached_section
+from report_context import ReportContext
+from data_manager import DataManager, TRANSFER_IN, TRANSFER_OUT
+import inventory_analytics
 import io
 import base64
 
@@ -82,70 +86,30 @@ def render_reports_page():
     # Calculate date range
     days = get_days_from_period(report_period)
     
-    # Main reports navigation
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📊 Executive Summary", 
-        "📦 Inventory Reports", 
-        "🔄 Transaction Reports", 
-        "🚨 Alert Reports",
-        "📈 Performance Reports"
-    ])
-
-    with tab1:
-        render_executive_summary(days, selected_child_dept, current_user_role)
-    
-    with tab2:
-        render_inventory_reports(days, selected_child_dept, current_user_role)
-    
-    with tab3:
-        render_transaction_reports(days, selected_child_dept, current_user_role)
-    
-    with tab4:
-        render_alert_reports(days, selected_child_dept, current_user_role)
-    
-    with tab5:
-        render_performance_reports(days, selected_child_dept, current_user_role)
-
-def ensure_numeric_dataframe(df, numeric_columns=None):
-    """Ensure specified columns are numeric, handling conversion errors"""
-    if df.empty:
-        return df
-    
-    df = df.copy()
-    
-    if numeric_columns is None:
-        numeric_columns = ['quantity', 'min_order_level', 'min_order_quantity', 'line_no']
-    
-    for col in numeric_columns:
-        if col in df.columns:
-            # Use float for decimal quantities instead of int
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
-    
-    return df
+    # Main reports navigation; only the selected section is computed
+    sections = {
+        "📊 Executive Summary": render_executive_summary,
+        "📦 Inventory Reports": render_inventory_reports,
+        "🔄 Transaction Reports": render_transaction_reports,
+        "🚨 Alert Reports": render_alert_reports,
+        "📈 Performance Reports": render_performance_reports
+    }
+    section = st.radio("Report Section", list(sections), horizontal=True,
+                       key="reports_section", label_visibility="collapsed")
+    # The scoped frames are read at most once, by whichever section renders
+    sections[section](ReportContext(st.session_state.data_manager, days, selected_child_dept, current_user_role))
 
-def render_executive_summary(days, department_id, user_role):
+def render_executive_summary(context):
     """Executive summary with key metrics and overview"""
     st.subheader("🏆 Executive Summary")
     
-    # Get data based on user role and department
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
-    
-    # Ensure numeric data types
-    spare_parts = ensure_numeric_dataframe(spare_parts)
-    transactions = ensure_numeric_dataframe(transactions)
+    spare_parts = context.spare_parts
+    transactions = context.transactions
     
     if spare_parts.empty:
         st.warning("No inventory data available for the selected department/period")
         return
+    inputs = context.inputs
     
     # Key Performance Indicators
     st.write("### Key Performance Indicators")
@@ -157,22 +121,22 @@ def render_executive_summary(days, department_id, user_role):
         st.metric("Total Items", total_items)
     
     with col2:
-        turnover_rate = calculate_turnover_rate(transactions, spare_parts)
+        turnover_rate = inventory_analytics.turnover_rate(transactions, spare_parts)
         st.metric("Turnover Rate", f"{turnover_rate:.1f}x")
     
     with col3:
-        service_level = calculate_service_level(transactions)
+        service_level = inventory_analytics.service_level(transactions)
         st.metric("Service Level", f"{service_level:.1f}%")
     
     # Charts Row
     chart_col1, chart_col2 = st.columns(2)
     
     with chart_col1:
-        fig = create_inventory_health_chart(spare_parts)
+        fig = cached_section(create_inventory_health_chart, inputs, spare_parts)
         st.plotly_chart(fig, use_container_width=True)
     
     with chart_col2:
-        fig = create_department_activity_chart(transactions, spare_parts)
+        fig = cached_section(create_department_activity_chart, inputs, transactions, spare_parts)
         st.plotly_chart(fig, use_container_width=True)
     
     # Quick Insights
@@ -182,36 +146,29 @@ def render_executive_summary(days, department_id, user_role):
     
     with insights_col1:
         st.info("**Top Moving Items**")
-        top_movers = get_top_moving_items(transactions, 5)
+        top_movers = cached_section(inventory_analytics.top_moving_items, inputs, transactions, 5)
         for item in top_movers:
             st.write(f"• {item['name']}: {item['quantity']} units")
     
     with insights_col2:
         st.warning("**Attention Required**")
-        critical_items = get_critical_items(spare_parts, 3)
+        critical_items = cached_section(inventory_analytics.critical_items, inputs, spare_parts, 3)
         for item in critical_items:
             st.write(f"• {item['name']}: {item['quantity']} left (min: {item['min_level']})")
     
     # Export Executive Summary
     st.download_button(
         "📥 Download Executive Summary (CSV)",
-        generate_executive_summary_csv(spare_parts, transactions),
+        cached_section(generate_executive_summary_csv, inputs, spare_parts, transactions),
         file_name=f"executive_summary_{datetime.now().strftime('%Y%m%d')}.csv",
         mime="text/csv"
     )
 
-def render_inventory_reports(days, department_id, user_role):
+def render_inventory_reports(context):
     """Comprehensive inventory reports"""
     st.subheader("📦 Inventory Analysis Reports")
     
-    # Get inventory data based on access
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
+    spare_parts = context.spare_parts
     
     if spare_parts.empty:
         st.warning("No inventory data available")
@@ -231,22 +188,15 @@ def render_inventory_reports(days, department_id, user_role):
     #elif report_type == "Value Analysis":
     #    render_value_analysis_report(spare_parts)
     elif report_type == "Department Summary":
-        render_department_summary_report(spare_parts, user_role, department_id)
+        render_department_summary_report(spare_parts, context.user_role, context.department_id)
     elif report_type == "Custom Inventory Report":
         render_custom_inventory_report(spare_parts)
 
-def render_transaction_reports(days, department_id, user_role):
+def render_transaction_reports(context):
     """Transaction history and analysis reports"""
     st.subheader("🔄 Transaction Analysis Reports")
     
-    # Get transaction data based on access
-    if user_role == 'User':
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
+    transactions = context.transactions
     
     if transactions.empty:
         st.warning("No transaction data available for the selected period")
@@ -264,35 +214,19 @@ def render_transaction_reports(days, department_id, user_role):
     elif report_type == "Movement Analysis":
         render_movement_analysis_report(transactions)
     elif report_type == "Trend Analysis":
-        render_trend_analysis_report(transactions, days)
+        render_trend_analysis_report(transactions, context.days)
     elif report_type == "User Activity":
         st.info("User activity tracking requires additional user session data")
     elif report_type == "Custom Transaction Report":
         render_custom_transaction_report(transactions)
 
-def render_alert_reports(days, department_id, user_role):
+def render_alert_reports(context):
     """Alert and exception reports"""
     st.subheader("🚨 Alert & Exception Reports")
     
-    # Get data based on access
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        low_stock = st.session_state.data_manager.get_low_stock_items_by_dept(department_id)
-        last_piece = st.session_state.data_manager.get_last_piece_stock_items_by_dept(department_id)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            low_stock = st.session_state.data_manager.get_low_stock_items_by_dept(department_id)
-            last_piece = st.session_state.data_manager.get_last_piece_stock_items_by_dept(department_id)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            low_stock = st.session_state.data_manager.get_low_stock_items()
-            last_piece = st.session_state.data_manager.get_last_piece_stock_items()
-    
-    # Ensure data consistency
-    spare_parts = ensure_data_consistency(spare_parts)
-    low_stock = ensure_data_consistency(low_stock)
-    last_piece = ensure_data_consistency(last_piece)
+    spare_parts = context.spare_parts
+    low_stock = context.low_stock
+    last_piece = context.last_piece
     
     # Alert Summary
     col1, col2, col3 = st.columns(3)
@@ -307,28 +241,21 @@ def render_alert_reports(days, department_id, user_role):
         out_of_stock = len(spare_parts[spare_parts['quantity'] == 0])
         st.metric("Out of Stock", out_of_stock, delta=out_of_stock, delta_color="inverse")
     
+    # Transfers between departments come before purchases
+    transfers = st.session_state.data_manager.get_transfer_recommendations(
+        context.department_id if context.by_department else None)
+    
     # Alert Details
-    alert_tab1, alert_tab2, alert_tab3 = st.tabs(["Last Piece Alerts", "Low Stock Alerts", "Reordering Recommendations"])
+    alert_tab1, alert_tab2, alert_tab3, alert_tab4 = st.tabs(
+        ["Last Piece Alerts", "Low Stock Alerts", "Transfer Recommendations", "Reordering Recommendations"])
     
     with alert_tab1:
         if not last_piece.empty:
             # Fix: Handle missing child_department column
             display_columns = ['name', 'part_number', 'quantity', 'min_order_level', 'min_order_quantity']
             
-            # Add child_department if it exists, otherwise try to get department info
             if 'child_department' in last_piece.columns:
                 display_columns.append('child_department')
-            elif 'department_id' in last_piece.columns:
-                # Create department mapping
-                dept_mapping = {}
-                for dept_id in last_piece['department_id'].unique():
-                    dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                    if dept_info is not None and not dept_info.empty:
-                        dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                    else:
-                        dept_mapping[dept_id] = f'Dept_{dept_id}'
-                last_piece['child_department'] = last_piece['department_id'].map(dept_mapping)
-                display_columns.append('child_department')
             
             # Only include columns that actually exist
             available_columns = [col for col in display_columns if col in last_piece.columns]
@@ -353,20 +280,8 @@ def render_alert_reports(days, department_id, user_role):
             # Fix: Handle missing child_department column for low stock
             display_columns = ['name', 'part_number', 'quantity', 'min_order_level', 'min_order_quantity']
             
-            # Add child_department if it exists, otherwise try to get department info
             if 'child_department' in low_stock.columns:
                 display_columns.append('child_department')
-            elif 'department_id' in low_stock.columns:
-                # Create department mapping
-                dept_mapping = {}
-                for dept_id in low_stock['department_id'].unique():
-                    dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                    if dept_info is not None and not dept_info.empty:
-                        dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                    else:
-                        dept_mapping[dept_id] = f'Dept_{dept_id}'
-                low_stock['child_department'] = low_stock['department_id'].map(dept_mapping)
-                display_columns.append('child_department')
             
             # Only include columns that actually exist
             available_columns = [col for col in display_columns if col in low_stock.columns]
@@ -379,56 +294,23 @@ def render_alert_reports(days, department_id, user_role):
             st.success("✅ No low stock alerts")
     
     with alert_tab3:
-        render_reordering_recommendations(spare_parts)
+        render_transfer_recommendations(transfers, context.user_role)
+    
+    with alert_tab4:
+        render_reordering_recommendations(spare_parts, transfers)
 
-def ensure_data_consistency(df, expected_columns=None):
-    """Ensure dataframe has expected columns and proper data types"""
-    if df.empty:
-        return df
-    
-    df = df.copy()
-    
-    # Ensure numeric columns are properly typed - use float for decimal quantities
-    numeric_columns = ['quantity', 'min_order_level', 'min_order_quantity', 'line_no']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
-    
-    # Handle department information
-    if 'child_department' not in df.columns and 'department_id' in df.columns:
-        # Create department mapping
-        dept_mapping = {}
-        for dept_id in df['department_id'].unique():
-            dept_info = st.session_state.data_manager.get_department_info(dept_id)
-            if dept_info is not None and not dept_info.empty:
-                dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-            else:
-                dept_mapping[dept_id] = f'Dept_{dept_id}'
-        df['child_department'] = df['department_id'].map(dept_mapping)
-    elif 'child_department' not in df.columns:
-        df['child_department'] = 'General Department'
-    
-    # Fill any NaN values in critical columns
-    if 'child_department' in df.columns:
-        df['child_department'] = df['child_department'].fillna('Unknown Department')
-    
-    return df
+def ensure_data_consistency(df):
+    """Numeric columns and department names via inventory_analytics"""
+    return inventory_analytics.ensure_data_consistency(
+        df, st.session_state.data_manager.get_department_names)
 
-def render_performance_reports(days, department_id, user_role):
+def render_performance_reports(context):
     """Performance and analytics reports"""
     st.subheader("📈 Performance & Analytics Reports")
     
-    # Get data based on access
-    if user_role == 'User':
-        spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-        transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-    else:
-        if department_id:
-            spare_parts = st.session_state.data_manager.get_parts_by_department(department_id)
-            transactions = st.session_state.data_manager.get_transaction_history_by_department(department_id, days)
-        else:
-            spare_parts = st.session_state.data_manager.get_all_parts()
-            transactions = st.session_state.data_manager.get_transaction_history(days=days)
+    spare_parts = context.spare_parts
+    transactions = context.transactions
+    inputs = context.inputs
     
     # Performance Metrics
     # perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
@@ -442,28 +324,28 @@ def render_performance_reports(days, department_id, user_role):
     #     st.metric("Fill Rate", f"{fill_rate}%")
     
     # with perf_col3:
-    #     carrying_cost = calculate_carrying_cost(spare_parts)
+    #     carrying_cost = inventory_analytics.carrying_cost(spare_parts)
     #     st.metric("Carrying Cost", f"${carrying_cost:,.0f}")
     
     # with perf_col4:
-    #     optimal_stock = calculate_optimal_stock_percentage(spare_parts)
+    #     optimal_stock = inventory_analytics.optimal_stock_percentage(spare_parts)
     #     st.metric("Optimal Stock", f"{optimal_stock}%")
     
     # Performance Charts
     chart_col1, chart_col2 = st.columns(2)
     
     with chart_col1:
-        fig = create_performance_trend_chart(transactions)
+        fig = cached_section(create_performance_trend_chart, inputs, transactions)
         st.plotly_chart(fig, use_container_width=True)
     
     with chart_col2:
-        fig = create_efficiency_chart(spare_parts, transactions)
+        fig = cached_section(create_efficiency_chart, inputs, spare_parts, transactions)
         st.plotly_chart(fig, use_container_width=True)
     
     # Department Comparison (only for Admin/Super User)
-    if user_role in ['Admin', 'Super User'] and not department_id:
+    if context.user_role in ['Admin', 'Super User'] and not context.department_id:
         st.subheader("Department Performance Comparison")
-        fig = create_department_comparison_chart(spare_parts, transactions)
+        fig = cached_section(create_department_comparison_chart, inputs, spare_parts, transactions)
         st.plotly_chart(fig, use_container_width=True)
 
 # =============================================================================
@@ -474,10 +356,7 @@ def render_stock_level_report(spare_parts):
     """Render detailed stock level analysis report"""
     st.write("### Stock Level Analysis")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric column - use float for decimal quantities
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
+    spare_parts = inventory_analytics.ensure_numeric(spare_parts, ['quantity'])
     
     # Stock level distribution
     fig = px.histogram(
@@ -529,7 +408,7 @@ def render_abc_classification_report(spare_parts):
     st.write("### ABC Inventory Classification")
     
     # Perform ABC analysis
-    abc_data = perform_abc_analysis(spare_parts)
+    abc_data = inventory_analytics.abc_analysis(spare_parts)
     
     if not abc_data.empty:
         # ABC summary
@@ -571,14 +450,8 @@ def render_value_analysis_report(spare_parts):
     """Render inventory value analysis report"""
     st.write("### Inventory Value Analysis")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    # Calculate estimated values (simplified)
-    spare_parts['estimated_value'] = spare_parts['quantity'] * spare_parts['min_order_level'] * 10
+    # Estimated values (simplified)
+    spare_parts = inventory_analytics.abc_analysis(spare_parts)
     
     # Value distribution
     if 'child_department' in spare_parts.columns and not spare_parts['child_department'].isna().all():
@@ -633,7 +506,7 @@ def render_department_summary_report(spare_parts, user_role, department_id):
             st.metric("Total Items", len(spare_parts))
         
         with col2:
-            total_value = calculate_inventory_value(spare_parts)
+            total_value = inventory_analytics.inventory_value(spare_parts)
             st.metric("Total Value", f"${total_value:,.0f}")
         
         with col3:
@@ -641,7 +514,7 @@ def render_department_summary_report(spare_parts, user_role, department_id):
             st.metric("Average Stock", f"{avg_stock:.1f}")
         
         with col4:
-            stock_health = (len(spare_parts[spare_parts['quantity'] > spare_parts['min_order_level']]) / len(spare_parts)) * 100
+            stock_health = inventory_analytics.health_counts(spare_parts).get(inventory_analytics.HEALTHY, 0) / len(spare_parts) * 100
             st.metric("Stock Health", f"{stock_health:.1f}%")
     else:
         # Multi-department view for Admin/Super User
@@ -728,7 +601,7 @@ def render_transaction_history_report(transactions):
         end_date = st.date_input("End Date", value=datetime.now())
     
     # Filter transactions by date
-    transactions['timestamp'] = pd.to_datetime(transactions['timestamp'])
+    transactions['timestamp'] = inventory_analytics.parse_timestamps(transactions['timestamp'])
     filtered_transactions = transactions[
         (transactions['timestamp'].dt.date >= start_date) & 
         (transactions['timestamp'].dt.date <= end_date)
@@ -774,8 +647,7 @@ def render_movement_analysis_report(transactions):
     st.write("### Item Movement Analysis")
     
     # Ensure quantity is numeric for calculations
-    transactions = transactions.copy()
-    transactions['quantity'] = pd.to_numeric(transactions['quantity'], errors='coerce').fillna(0.0)
+    transactions = inventory_analytics.ensure_numeric(transactions, ['quantity'])
     
     # Get top items by total movement (absolute value)
     total_movement = transactions.groupby('name')['quantity'].sum().abs()
@@ -818,7 +690,8 @@ def render_movement_analysis_report(transactions):
         aggfunc='sum'
     ).fillna(0.0)
     
-    movement_pivot['net_movement'] = movement_pivot.get('check_in', 0.0) - movement_pivot.get('check_out', 0.0)
+    movement_pivot['net_movement'] = movement_pivot.get('check_in', 0.0) + movement_pivot.get(TRANSFER_IN, 0.0) \
+        - movement_pivot.get('check_out', 0.0) - movement_pivot.get(TRANSFER_OUT, 0.0)
     movement_pivot = movement_pivot.sort_values('net_movement', ascending=False).round(2)
     
     st.write("**Movement Summary**")
@@ -829,7 +702,8 @@ def render_trend_analysis_report(transactions, days):
     st.write("### Transaction Trend Analysis")
     
     # Daily trend
-    transactions['date'] = pd.to_datetime(transactions['timestamp']).dt.date
+    timestamps = inventory_analytics.parse_timestamps(transactions['timestamp'])
+    transactions['date'] = timestamps.dt.date
     daily_trend = transactions.groupby(['date', 'transaction_type']).size().reset_index(name='count')
     
     fig = px.line(
@@ -842,7 +716,7 @@ def render_trend_analysis_report(transactions, days):
     st.plotly_chart(fig, use_container_width=True)
     
     # Weekly pattern
-    transactions['day_of_week'] = pd.to_datetime(transactions['timestamp']).dt.day_name()
+    transactions['day_of_week'] = timestamps.dt.day_name()
     weekly_pattern = transactions.groupby(['day_of_week', 'transaction_type']).size().reset_index(name='count')
     
     days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -898,15 +772,62 @@ def render_custom_transaction_report(transactions):
             mime="text/csv"
         )
 
-def render_reordering_recommendations(spare_parts):
+def render_transfer_recommendations(transfers, user_role):
+    """Render surplus transfers between departments, with batch execution for administrators"""
+    st.write("### 🔄 Inter-Department Transfer Recommendations")
+    st.caption("Surplus above another department's minimum level, moved to items of the same "
+               "part number at or below their minimum level")
+    
+    if transfers.empty:
+        st.success("✅ No shortfalls that another department can cover")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Transfers", len(transfers))
+    with col2:
+        st.metric("Items Restocked", transfers['to_part_id'].nunique())
+    with col3:
+        st.metric("Units Moved", f"{transfers['transfer_quantity'].sum():,.0f}")
+    
+    can_execute = user_role in ['Admin', 'Super User']
+    event = st.dataframe(
+        transfers[['name', 'part_number', 'from_department', 'from_quantity', 'to_department',
+                   'to_quantity', 'shortfall', 'transfer_quantity']].rename(columns={
+            'name': 'Name', 'part_number': 'Part #', 'from_department': 'From', 'from_quantity': 'From Stock',
+            'to_department': 'To', 'to_quantity': 'To Stock', 'shortfall': 'Shortfall',
+            'transfer_quantity': 'Transfer'}).round(2),
+        hide_index=True, use_container_width=True,
+        on_select="rerun" if can_execute else "ignore", selection_mode="multi-row", key="transfer_recommendations")
+    
+    st.download_button(
+        "🔄 Download Transfer List",
+        transfers.to_csv(index=False, float_format='%.2f'),
+        file_name=f"transfer_list_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv"
+    )
+    
+    if can_execute:
+        selected = event.selection.rows
+        remarks = st.text_input("Transfer Remarks", key="transfer_remarks")
+        col1, col2 = st.columns(2)
+        with col1:
+            execute_selected = st.button(f"Execute {len(selected)} selected", disabled=not selected)
+        with col2:
+            execute_all = st.button(f"Execute all {len(transfers)}")
+        if execute_selected or execute_all:
+            batch = transfers.iloc[selected] if execute_selected else transfers
+            success, error_msg = st.session_state.data_manager.execute_transfers(
+                batch[['from_part_id', 'to_part_id', 'transfer_quantity']].itertuples(index=False), remarks)
+            if success:
+                st.rerun()
+            st.error(f"Could not execute transfers: {error_msg}")
+
+def render_reordering_recommendations(spare_parts, transfers=None):
     """Render intelligent reordering recommendations"""
     st.write("### 📋 Intelligent Reordering Recommendations")
     
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns - use float for decimal quantities
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0.0)
+    spare_parts = inventory_analytics.ensure_numeric(spare_parts, ['quantity', 'min_order_level'])
     spare_parts['min_order_quantity'] = pd.to_numeric(spare_parts['min_order_quantity'], errors='coerce').fillna(1.0)  # Use float
     
     # Calculate reorder needs - use float comparisons
@@ -915,20 +836,22 @@ def render_reordering_recommendations(spare_parts):
         (spare_parts['quantity'] > 0.0)  # Use float comparison
     ].copy()
     
+    # Items whose shortfall a recommended transfer covers need no purchase
+    if transfers is not None and not transfers.empty and not reorder_needs.empty:
+        incoming = transfers.groupby('to_part_id')['transfer_quantity'].sum()
+        covered = reorder_needs['id'].map(incoming).fillna(0) >= \
+            reorder_needs['min_order_level'] + 1 - reorder_needs['quantity']
+        if covered.any():
+            st.info(f"{covered.sum()} items are covered by transfer recommendations and left out of the purchase list")
+        reorder_needs = reorder_needs[~covered]
+    
     if not reorder_needs.empty:
         reorder_needs['reorder_quantity'] = reorder_needs['min_order_quantity']
         
-        # Calculate priority using pandas operations with float comparisons
-        priority = []
-        for _, row in reorder_needs.iterrows():
-            if row['quantity'] <= 1.0:  # Use float comparison
-                priority.append('🚨 CRITICAL')
-            elif row['quantity'] <= row['min_order_level'] * 0.5:
-                priority.append('⚠️ HIGH')
-            else:
-                priority.append('🔶 MEDIUM')
-        
-        reorder_needs['priority'] = priority
+        # Ordered so sorting puts critical items first
+        reorder_needs['priority'] = pd.Categorical(
+            inventory_analytics.reorder_priority(reorder_needs['quantity'], reorder_needs['min_order_level']),
+            categories=inventory_analytics.REORDER_PRIORITIES, ordered=True)
         
         # Format quantities for display
         display_data = reorder_needs[[
@@ -971,41 +894,6 @@ def get_days_from_period(period):
     }
     return period_map.get(period, 30)
 
-def calculate_inventory_value(spare_parts):
-    """Calculate total inventory value (simplified)"""
-    if spare_parts.empty:
-        return 0
-    
-    spare_parts = spare_parts.copy()
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    return (spare_parts['quantity'] * spare_parts['min_order_level'] * 10).sum()
-
-def calculate_turnover_rate(transactions, spare_parts):
-    """Calculate inventory turnover rate"""
-    if transactions.empty or spare_parts.empty:
-        return 0
-    
-    # Ensure numeric data types
-    transactions = transactions.copy()
-    spare_parts = spare_parts.copy()
-    
-    transactions['quantity'] = pd.to_numeric(transactions['quantity'], errors='coerce').fillna(0)
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    
-    total_usage = abs(transactions[transactions['transaction_type'] == 'check_out']['quantity'].sum())
-    avg_inventory = spare_parts['quantity'].mean()
-    
-    return total_usage / avg_inventory if avg_inventory != 0 else 0
-
-def calculate_service_level(transactions):
-    """Calculate service level percentage"""
-    if transactions.empty:
-        return 100
-    total_demand = abs(transactions[transactions['transaction_type'] == 'check_out']['quantity'].sum())
-    return 95.0  # Simplified - in real scenario, calculate based on stockouts
-
 def create_inventory_health_chart(spare_parts):
     """Create inventory health status chart"""
     if spare_parts.empty:
@@ -1013,29 +901,7 @@ def create_inventory_health_chart(spare_parts):
         fig.add_annotation(text="No data available", x=0.5, y=0.5, showarrow=False)
         return fig
     
-    # Ensure we're working with proper data types - use float
-    spare_parts = spare_parts.copy()
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0.0)
-    
-    # Create health status with float comparisons
-    health_status = []
-    for _, row in spare_parts.iterrows():
-        quantity = row['quantity']
-        min_order_level = row['min_order_level']
-        
-        if quantity <= 0.0:  # Use float comparison
-            health_status.append('Out of Stock')
-        elif quantity <= 1.0:  # Use float comparison
-            health_status.append('Last Piece')
-        elif quantity <= min_order_level:
-            health_status.append('Low Stock')
-        else:
-            health_status.append('Healthy')
-    
-    spare_parts['health_status'] = health_status
-    
-    health_counts = spare_parts['health_status'].value_counts()
+    health_counts = inventory_analytics.health_counts(spare_parts)
     
     fig = px.pie(
         values=health_counts.values,
@@ -1056,87 +922,15 @@ def create_department_activity_chart(transactions, spare_parts):
         fig.add_annotation(text="No transaction data", x=0.5, y=0.5, showarrow=False)
         return fig
     
-    # Merge to get department info
-    if 'child_department' not in transactions.columns and 'part_id' in transactions.columns:
-        merged = transactions.merge(
-            spare_parts[['id', 'child_department']], 
-            left_on='part_id', 
-            right_on='id'
-        )
-        dept_activity = merged.groupby('child_department').size()
-    else:
-        dept_activity = transactions.groupby('child_department').size()
+    dept_activity = inventory_analytics.department_activity(transactions, spare_parts)
     
     fig = px.bar(
-        x=dept_activity.index,
-        y=dept_activity.values,
+        x=dept_activity['child_department'],
+        y=dept_activity['transaction_count'],
         title="Department Activity Level"
     )
     return fig
 
-def get_top_moving_items(transactions, top_n=5):
-    """Get top moving items"""
-    if transactions.empty:
-        return []
-    
-    # Ensure quantity is numeric
-    transactions = transactions.copy()
-    transactions['quantity'] = pd.to_numeric(transactions['quantity'], errors='coerce').fillna(0.0)
-    
-    top_movers = transactions.groupby('name')['quantity'].sum().abs().nlargest(top_n)
-    return [{'name': name, 'quantity': float(qty)} for name, qty in top_movers.items()]  # Use float
-
-def get_critical_items(spare_parts, top_n=3):
-    """Get most critical items needing attention"""
-    if spare_parts.empty:
-        return []
-    
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns - use float for decimal quantities
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0.0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0.0)
-    
-    critical = spare_parts[
-        spare_parts['quantity'] <= spare_parts['min_order_level']
-    ].nsmallest(top_n, 'quantity')
-    
-    return [{
-        'name': str(row['name']),
-        'quantity': float(row['quantity']),  # Use float instead of int
-        'min_level': float(row['min_order_level'])  # Use float instead of int
-    } for _, row in critical.iterrows()]
-
-def perform_abc_analysis(spare_parts):
-    """Perform ABC analysis on inventory"""
-    if spare_parts.empty:
-        return pd.DataFrame()
-    
-    spare_parts = spare_parts.copy()
-    
-    # Ensure numeric columns
-    spare_parts['quantity'] = pd.to_numeric(spare_parts['quantity'], errors='coerce').fillna(0)
-    spare_parts['min_order_level'] = pd.to_numeric(spare_parts['min_order_level'], errors='coerce').fillna(0)
-    
-    # Simplified ABC analysis
-    spare_parts['estimated_value'] = spare_parts['quantity'] * spare_parts['min_order_level'] * 10
-    spare_parts = spare_parts.sort_values('estimated_value', ascending=False)
-    spare_parts['cumulative_percentage'] = spare_parts['estimated_value'].cumsum() / spare_parts['estimated_value'].sum() * 100
-    
-    # Use pandas operations instead of np.select
-    abc_class = []
-    for cum_pct in spare_parts['cumulative_percentage']:
-        if cum_pct <= 80:
-            abc_class.append('A')
-        elif cum_pct <= 95:
-            abc_class.append('B')
-        else:
-            abc_class.append('C')
-    
-    spare_parts['abc_class'] = abc_class
-    
-    return spare_parts
-
 def calculate_stock_accuracy(spare_parts, transactions):
     """Calculate stock accuracy percentage"""
     return 98.5  # Simplified - in real scenario, compare physical counts
@@ -1145,21 +939,6 @@ def calculate_fill_rate(transactions):
     """Calculate order fill rate"""
     return 95.2  # Simplified
 
-def calculate_carrying_cost(spare_parts):
-    """Calculate inventory carrying cost"""
-    total_value = calculate_inventory_value(spare_parts)
-    return total_value * 0.25  # 25% carrying cost estimate
-
-def calculate_optimal_stock_percentage(spare_parts):
-    """Calculate percentage of items at optimal stock levels"""
-    if spare_parts.empty:
-        return 0
-    optimal = spare_parts[
-        (spare_parts['quantity'] > spare_parts['min_order_level']) & 
-        (spare_parts['quantity'] <= spare_parts['min_order_level'] * 2)
-    ]
-    return (len(optimal) / len(spare_parts)) * 100
-
 def create_performance_trend_chart(transactions):
     """Create performance trend chart"""
     fig = go.Figure()
@@ -1186,9 +965,9 @@ def generate_executive_summary_csv(spare_parts, transactions):
             'Report Type': ['Executive Summary'],
             'Generated Date': [datetime.now().strftime('%Y-%m-%d %H:%M')],
             'Total Items': [len(spare_parts)],
-            'Inventory Turnover Rate': [f"{calculate_turnover_rate(transactions, spare_parts):.1f}x"],
-            'Service Level': [f"{calculate_service_level(transactions):.1f}%"],
-            'Total Inventory Value': [f"${calculate_inventory_value(spare_parts):,.0f}"]
+            'Inventory Turnover Rate': [f"{inventory_analytics.turnover_rate(transactions, spare_parts):.1f}x"],
+            'Service Level': [f"{inventory_analytics.service_level(transactions):.1f}%"],
+            'Total Inventory Value': [f"${inventory_analytics.inventory_value(spare_parts):,.0f}"]
         }
         
         summary_df = pd.DataFrame(summary_data)
@@ -1209,19 +988,7 @@ def generate_reorder_list(last_piece_items):
     reorder_columns = ['name', 'part_number', 'quantity', 'min_order_quantity']
     
     # Ensure child_department exists
-    if 'child_department' not in reorder_data.columns:
-        if 'department_id' in reorder_data.columns:
-            # Create department mapping
-            dept_mapping = {}
-            for dept_id in reorder_data['department_id'].unique():
-                dept_info = st.session_state.data_manager.get_department_info(dept_id)
-                if dept_info is not None and not dept_info.empty:
-                    dept_mapping[dept_id] = dept_info.get('child_department', f'Dept_{dept_id}')
-                else:
-                    dept_mapping[dept_id] = f'Dept_{dept_id}'
-            reorder_data['child_department'] = reorder_data['department_id'].map(dept_mapping)
-        else:
-            reorder_data['child_department'] = 'General Department'
+    reorder_data = ensure_data_consistency(reorder_data)
     
     # Add child_department to columns if it exists
     if 'child_department' in reorder_data.columns:
@@ -1237,4 +1004,4 @@ def generate_reorder_list(last_piece_items):
     return reorder_data[available_columns].to_csv(index=False, float_format='%.2f').encode()
 
 if __name__ == "__main__":
-    render_reports_page()
\ No newline at end of file
+    run_page(current_page, render_reports_page)
\ No newline at end of file
@@ -0,0 +1,141 @@
+# query_cache.py
+import functools
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Budget for cached frames across all sessions of this server process
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _freeze(df):
+    """Copy of the frame over read-only column arrays, so in-place edits fail instead of corrupting the cache"""
+    columns = {}
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if not isinstance(column.dtype, np.dtype):
+            # Extension dtypes have no numpy array of their own to lock
+            columns[position] = column.copy()
+            continue
+        values = column.to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[position] = values
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.columns = df.columns
+    return frozen
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class QueryCache:
+    """Thread-safe LRU of DataFrames bounded by their memory footprint"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df):
+        """Cache a read-only copy of df and return it, or df itself when it is too large to cache"""
+        # Sized before freezing: deep memory_usage cannot read read-only object arrays
+        size = _frame_bytes(df)
+        if size > self.max_bytes:
+            return df
+        df = _freeze(df)
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self.entries[key] = (df, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return df
+
+    def invalidate(self, db_path, versions):
+        """Drop db_path's entries keyed on table versions older than versions"""
+        with self.lock:
+            stale = [key for key in self.entries
+                     if key[0] == db_path
+                     and any(versions.get(table, 0) != version for table, version in zip(key[2], key[5]))]
+            for key in stale:
+                self.bytes -= self.entries.pop(key)[1]
+            return len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+shared_cache = QueryCache()
+
+
+def cached_read(*tables, daily=False):
+    """Cache a DataManager read method's DataFrame per arguments and table versions.
+
+    tables are the tables the query reads; a write to any of them bumps its
+    version and so retires the entry. daily=True also keys on today's date,
+    for queries relative to date('now'). Callers get a shallow copy of the
+    read-only cached frame: adding or replacing columns is fine, in-place
+    edits need .copy() first.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            versions = self.table_versions(tables) if cache is not None else None
+            if versions is None:
+                return method(self, *args, **kwargs)
+
+            key = (self.db_path, method.__name__, tables, args, tuple(sorted(kwargs.items())),
+                   versions, date.today() if daily else None)
+            try:
+                df = cache.get(key)
+            except TypeError:
+                # Unhashable arguments
+                return method(self, *args, **kwargs)
+            if df is None:
+                df = method(self, *args, **kwargs)
+                # Read methods swallow errors into a bare pd.DataFrame(); only
+                # cache frames that carry the query's columns
+                if not isinstance(df, pd.DataFrame) or len(df.columns) == 0:
+                    return df
+                df = cache.put(key, df)
+            return df.copy(deep=False)
+        return wrapper
+    return decorator
@@ -0,0 +1,136 @@
+# query_trace.py
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+TRACE_ENV = 'INVENTORY_TRACE'
+TRACE_VERSION = 1
+
+# Not workload: connection housekeeping
+UNTRACED = {'close', 'get_cursor', 'create_tables', 'sync_versions', 'table_versions'}
+
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+_session_ids = itertools.count(1)
+
+
+def trace_path_from_env():
+    """Trace file named by the INVENTORY_TRACE environment variable, if any"""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def _file_lock(path):
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def _encode(value):
+    """JSON fallback for the argument types DataManager receives"""
+    if isinstance(value, pd.DataFrame):
+        return {'__dataframe__': value.to_dict(orient='split')}
+    if isinstance(value, (datetime, date)):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Series, np.ndarray)):
+        return value.tolist()
+    if value is pd.NaT:
+        return None
+    return str(value)
+
+
+def _decode(obj):
+    if '__dataframe__' in obj:
+        return pd.DataFrame(**obj['__dataframe__'])
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class TraceRecorder:
+    """Appends one JSON line per DataManager call: when, which session, what and how long"""
+
+    def __init__(self, path, db_path):
+        self.path = path
+        self.lock = _file_lock(path)
+        self.session = f"{os.getpid()}-{next(_session_ids)}"
+        self.local = threading.local()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            self._write({'trace': TRACE_VERSION, 'db': db_path,
+                         'created': datetime.now().isoformat(timespec='seconds')})
+
+    def _write(self, record):
+        line = json.dumps(record, default=_encode, separators=(',', ':')) + '\n'
+        with self.lock:
+            # One write per line so concurrent processes appending stay line-aligned
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def record(self, method, args, kwargs, started, duration, error=None):
+        entry = {'t': round(started, 6), 's': self.session, 'm': method,
+                 'a': list(args), 'd': round(duration, 6)}
+        if kwargs:
+            entry['k'] = kwargs
+        if error:
+            entry['e'] = error
+        try:
+            self._write(entry)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing query trace: {e}")
+
+    def wrap(self, method_name, method):
+        """Traced version of a bound method; calls made inside it are not recorded"""
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            if getattr(self.local, 'active', False):
+                return method(*args, **kwargs)
+            self.local.active = True
+            started = time.time()
+            t0 = time.perf_counter()
+            error = None
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.local.active = False
+                self.record(method_name, args, kwargs, started, time.perf_counter() - t0, error)
+        return traced
+
+
+def instrument(data_manager, path):
+    """Record every public call on this DataManager instance to path"""
+    recorder = TraceRecorder(path, data_manager.db_path)
+    for name in dir(type(data_manager)):
+        if name.startswith('_') or name in UNTRACED:
+            continue
+        method = getattr(data_manager, name)
+        if callable(method):
+            setattr(data_manager, name, recorder.wrap(name, method))
+    print(f"Tracing DataManager calls to {path} (session {recorder.session})")
+    return recorder
+
+
+def read_trace(path):
+    """(header, calls) of a trace file; calls are dicts sorted by start time"""
+    header = {}
+    calls = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line, object_hook=_decode)
+            if 'trace' in record:
+                header = header or record
+            else:
+                calls.append(record)
+    calls.sort(key=lambda c: c['t'])
+    return header, calls
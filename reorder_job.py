@@ -0,0 +1,66 @@
+# reorder_job.py
+"""Suggest a min_order_level for every part from its daily demand.
+
+    python reorder_job.py --db inventory.db --service-level 0.95 --lead-time-days 7
+
+Suggestions that differ from the current level land in the
+reorder_suggestions table for review; nothing changes in spare_parts until
+they are applied from Analytics > Stock Analysis > Reorder Analysis.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+import inventory_analytics
+from data_manager import DataManager
+
+HISTORY_DAYS = 365
+
+
+def refresh_reorder_suggestions(data_manager, service_level=inventory_analytics.DEFAULT_SERVICE_LEVEL,
+                                lead_time_days=inventory_analytics.DEFAULT_LEAD_TIME_DAYS,
+                                history_days=HISTORY_DAYS):
+    """Compute reorder points for all parts and store the changed minimum levels"""
+    started = time.perf_counter()
+    parts = data_manager.get_all_parts()
+    if parts.empty:
+        return True, None
+
+    # Full days only: the window ends yesterday
+    start = date.today() - timedelta(days=history_days)
+    suggestions = inventory_analytics.reorder_points(
+        data_manager.get_daily_demand(start), parts['id'].to_numpy(), start, history_days,
+        service_level=service_level, lead_time_days=lead_time_days)
+    suggestions['current_min_order_level'] = parts['min_order_level'].fillna(0).to_numpy()
+    success, error_msg = data_manager.save_reorder_suggestions(
+        suggestions, service_level, lead_time_days, history_days)
+    if success:
+        print(f"Computed reorder points for {len(suggestions)} parts in {time.perf_counter() - started:.2f}s")
+    return success, error_msg
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='inventory.db', help='SQLite database to read and update')
+    parser.add_argument('--service-level', type=float, default=inventory_analytics.DEFAULT_SERVICE_LEVEL,
+                        help='probability of no stock-out during a lead time')
+    parser.add_argument('--lead-time-days', type=int, default=inventory_analytics.DEFAULT_LEAD_TIME_DAYS,
+                        help='days from order to delivery')
+    parser.add_argument('--history-days', type=int, default=HISTORY_DAYS,
+                        help='days of check-out history to measure demand on')
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.db, trace_path='', use_cache=False)
+    try:
+        success, error_msg = refresh_reorder_suggestions(
+            data_manager, args.service_level, args.lead_time_days, args.history_days)
+    finally:
+        data_manager.close()
+    if not success:
+        print(f"Reorder point calculation failed: {error_msg}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+# report_context.py
+from functools import cached_property
+
+import inventory_analytics
+
+
+class ReportContext:
+    """Frames of one Reports or Analytics rerun, scoped to the user's access.
+
+    Each frame is read on first use and then shared by every renderer of
+    the rerun, already passed through ensure_data_consistency.
+    """
+
+    def __init__(self, data_manager, days, department_id, user_role):
+        self.data_manager = data_manager
+        self.days = days
+        self.department_id = department_id
+        self.user_role = user_role
+        # Users only ever see their own department; other roles see every
+        # department until they pick one
+        self.by_department = user_role == 'User' or bool(department_id)
+        # Everything the frames depend on, for section_cache keys
+        self.inputs = (days, department_id, user_role)
+
+    def _consistent(self, df):
+        return inventory_analytics.ensure_data_consistency(df, self.data_manager.get_department_names)
+
+    @cached_property
+    def spare_parts(self):
+        if self.by_department:
+            return self._consistent(self.data_manager.get_parts_by_department(self.department_id))
+        return self._consistent(self.data_manager.get_all_parts())
+
+    @cached_property
+    def transactions(self):
+        if self.by_department:
+            return self._consistent(
+                self.data_manager.get_transaction_history_by_department(self.department_id, self.days))
+        return self._consistent(self.data_manager.get_transaction_history(days=self.days))
+
+    @cached_property
+    def demand_histogram(self):
+        """Weekday x hour transaction buckets of the period, kept current by triggers"""
+        return self.data_manager.get_demand_histogram(
+            self.department_id if self.by_department else None, self.days)
+
+    @cached_property
+    def _alert_levels(self):
+        parts = self.spare_parts
+        return inventory_analytics.stock_alert_levels(parts['quantity'], parts['min_order_level'])
+
+    @cached_property
+    def low_stock(self):
+        """Parts at or below their minimum level with more than one piece left"""
+        parts = self.spare_parts
+        if parts.empty:
+            return parts
+        return parts[self._alert_levels == inventory_analytics.ALERT_LEVELS['low_stock']]
+
+    @cached_property
+    def last_piece(self):
+        """Parts down to their last piece"""
+        parts = self.spare_parts
+        if parts.empty:
+            return parts
+        return parts[self._alert_levels == inventory_analytics.ALERT_LEVELS['last_piece']]
@@ -0,0 +1,71 @@
+# seasonality_job.py
+"""Detect weekly, monthly and annual demand cycles for every part and department.
+
+    python seasonality_job.py --db inventory.db
+
+The app runs the same refresh from the forecast refresh thread (see
+forecast_job.start_background_refresh) once a day.
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+import inventory_analytics
+from data_manager import DataManager
+
+# Two years, so an annual cycle repeats at least once
+HISTORY_DAYS = 730
+REFRESH_INTERVAL = 24 * 3600
+
+
+def refresh_seasonality(data_manager, history_days=HISTORY_DAYS):
+    """Run the periodogram over every part's daily check-outs and store the cycles found"""
+    started = time.perf_counter()
+    parts = data_manager.get_all_parts()
+    if parts.empty:
+        return True, None
+
+    # Full days only: the window ends yesterday. It starts no earlier than
+    # the first recorded demand, as the empty days before that would read
+    # as one long cycle.
+    start = date.today() - timedelta(days=history_days)
+    demand = data_manager.get_daily_demand(start)
+    if not demand.empty:
+        start = max(start, date.fromisoformat(demand['day'].min()))
+    part_seasonality, department_seasonality = inventory_analytics.detect_seasonality(
+        demand, parts['id'].to_numpy(), parts['department_id'].to_numpy(),
+        start, max((date.today() - start).days, 1))
+    success, error_msg = data_manager.save_seasonality(part_seasonality, department_seasonality)
+    if success:
+        seasonal = part_seasonality['dominant_period'].notna().sum()
+        print(f"Found seasonal demand in {seasonal} of {len(part_seasonality)} parts "
+              f"in {time.perf_counter() - started:.2f}s")
+    return success, error_msg
+
+
+def seasonality_due(data_manager, max_age=REFRESH_INTERVAL):
+    """True when the stored seasonality is missing or older than max_age seconds"""
+    computed_at = data_manager.seasonality_computed_at()
+    return computed_at is None or (datetime.now() - computed_at).total_seconds() > max_age
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='inventory.db', help='SQLite database to refresh')
+    parser.add_argument('--history-days', type=int, default=HISTORY_DAYS,
+                        help='days of check-out history to analyse')
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.db, trace_path='', use_cache=False)
+    try:
+        success, error_msg = refresh_seasonality(data_manager, args.history_days)
+    finally:
+        data_manager.close()
+    if not success:
+        print(f"Seasonality refresh failed: {error_msg}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,28 @@
+# section_cache.py
+from datetime import date
+
+import streamlit as st
+
+# Tables the report and analytics sections read; a write to any of them
+# retires every cached section result
+SECTION_TABLES = ('departments', 'spare_parts', 'transactions')
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _memoized(key, versions, today, _build, _args):
+    return _build(*_args)
+
+
+def cached_section(build, inputs, *args):
+    """build(*args) cached across sessions per builder, section inputs and data version.
+
+    inputs (period, department, role, ...) must determine args, which are
+    not hashed themselves: they are the frames the section already loaded
+    for those inputs.
+    """
+    data_manager = st.session_state.data_manager
+    versions = data_manager.table_versions(SECTION_TABLES)
+    if versions is None:
+        return build(*args)
+    key = (data_manager.db_path, build.__code__.co_filename, build.__qualname__, inputs)
+    return _memoized(key, versions, date.today(), build, args)
@@ -3,39 +3,195 @@ import streamlit as st
 from streamlit_cookies_controller import CookieController
 import sqlite3
 import hashlib
-from datetime import datetime
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+# Seconds a validated token is trusted before the users table is consulted
+# again; revocations and role changes of any server process clear the cache
+# of every process at their next token check
+SESSION_CACHE_TTL = 300
+# Validated tokens kept per server process, least recently used dropped first
+SESSION_CACHE_SIZE = 4096
+
+
+class SessionStore:
+    """Opaque login tokens kept in the sessions table, with an in-process LRU cache"""
+
+    def __init__(self, db_path='inventory.db'):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        # One connection and cache shared by every Streamlit session of this process
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.data_version = None
+        self.revocation_version = None
+        self.create_sessions_table()
+
+    def create_sessions_table(self):
+        try:
+            with self.lock:
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        token_hash TEXT PRIMARY KEY,
+                        user_id INTEGER NOT NULL REFERENCES users(id),
+                        created_at TIMESTAMP,
+                        expires_at TIMESTAMP NOT NULL
+                    )
+                ''')
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)")
+                # Bumped by every revocation or user change, so all server
+                # processes know to drop their cached tokens
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS session_revocations (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        version INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                self.conn.execute("INSERT OR IGNORE INTO session_revocations (id) VALUES (1)")
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error creating sessions table: {e}")
+            raise
+
+    def fetchone(self, query, params=()):
+        with self.lock:
+            return self.conn.execute(query, params).fetchone()
+
+    def execute(self, query, params=()):
+        with self.lock:
+            self.conn.execute(query, params)
+            self.conn.commit()
+
+    @staticmethod
+    def _hash(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def create_session(self, user_id, lifetime_days):
+        """Store a new session for user_id and return its token"""
+        token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        self.execute(
+            "INSERT INTO sessions (token_hash, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (self._hash(token), user_id, now, now + timedelta(days=lifetime_days))
+        )
+        # Opportunistic cleanup keeps the table from growing with stale logins
+        self.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+        return token
+
+    def _sync(self):
+        """Clear the cache if any process revoked a session since the last check; call with the lock held"""
+        # Changes only when another connection commits to the database file
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self.data_version:
+            return
+        self.data_version = data_version
+        version = self.conn.execute("SELECT version FROM session_revocations").fetchone()[0]
+        if version != self.revocation_version:
+            self.cache.clear()
+            self.revocation_version = version
+
+    def _revoke(self, query=None, params=()):
+        """Run a session delete, if any, and announce the revocation to every server process"""
+        with self.lock:
+            if query:
+                self.conn.execute(query, params)
+            self.conn.execute("UPDATE session_revocations SET version = version + 1")
+            version = self.conn.execute("SELECT version FROM session_revocations").fetchone()[0]
+            self.conn.commit()
+            # Another process revoked in between: its tokens may be cached here too
+            if self.revocation_version is None or version != self.revocation_version + 1:
+                self.cache.clear()
+            self.revocation_version = version
+
+    def validate(self, token):
+        """User details for a live token of an active user, else None"""
+        if not token:
+            return None
+        token_hash = self._hash(token)
+        with self.lock:
+            self._sync()
+            entry = self.cache.get(token_hash)
+            if entry and entry['cached_until'] > time.monotonic() and entry['expires_at'] > datetime.now():
+                self.cache.move_to_end(token_hash)
+                return entry['user']
+
+        result = self.fetchone('''
+            SELECT u.id, u.username, u.role, u.department_id, s.expires_at
+            FROM sessions s
+            JOIN users u ON s.user_id = u.id
+            WHERE s.token_hash = ? AND u.isactive = 1
+        ''', (token_hash,))
+        expires_at = datetime.fromisoformat(result[4]) if result else None
+        if not result or expires_at <= datetime.now():
+            with self.lock:
+                self.cache.pop(token_hash, None)
+            return None
+
+        user_id, username, role, department_id, _ = result
+        user = {'user_id': user_id, 'username': username, 'role': role, 'department_id': department_id}
+        with self.lock:
+            self.cache[token_hash] = {'user': user, 'expires_at': expires_at,
+                                      'cached_until': time.monotonic() + SESSION_CACHE_TTL}
+            self.cache.move_to_end(token_hash)
+            while len(self.cache) > SESSION_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return user
+
+    def revoke(self, token):
+        """End one session (logout)"""
+        if not token:
+            return
+        token_hash = self._hash(token)
+        with self.lock:
+            self.cache.pop(token_hash, None)
+        self._revoke("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+
+    def revoke_user(self, user_id):
+        """End every session of a user, e.g. when the account is deactivated"""
+        self._drop_user(user_id)
+        self._revoke("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+
+    def forget_user(self, user_id):
+        """Drop cached details of a user so the next check re-reads role and department"""
+        self._drop_user(user_id)
+        self._revoke()
+
+    def _drop_user(self, user_id):
+        with self.lock:
+            for token_hash, entry in list(self.cache.items()):
+                if entry['user']['user_id'] == user_id:
+                    self.cache.pop(token_hash, None)
+
 
 class CookieSessionManager:
-    def __init__(self):
+    def __init__(self, store):
         self.controller = CookieController()
+        self.store = store
         self.cookie_name = "inventory_user_session"
         self.session_timeout_days = 7  # 7 days session
-    
+
     def authenticate_user(self, username, password):
         """Authenticate user against database"""
         try:
-            conn = sqlite3.connect('inventory.db')
-            cursor = conn.cursor()
-            
             # Get stored password hash and salt
-            cursor.execute(
-                "SELECT password_hash, salt, role, id, department_id, isactive FROM users WHERE username = ?", 
+            result = self.store.fetchone(
+                "SELECT password_hash, salt, role, id, department_id, isactive FROM users WHERE username = ?",
                 (username,)
             )
-            result = cursor.fetchone()
-            conn.close()
-            
+
             if result:
                 stored_hash, salt, role, user_id, department_id, isactive = result
-                
+
                 # Verify password
                 password_hash = hashlib.pbkdf2_hmac(
-                    'sha256', 
-                    password.encode('utf-8'), 
-                    salt.encode('utf-8'), 
+                    'sha256',
+                    password.encode('utf-8'),
+                    salt.encode('utf-8'),
                     100000
                 ).hex()
-                
+
                 if password_hash == stored_hash and isactive == 1:
                     return {
                         'user_id': user_id,
@@ -43,110 +199,109 @@ class CookieSessionManager:
                         'role': role,
                         'department_id': department_id
                     }
-            
+
             return None
         except Exception as e:
             print(f"Authentication error: {e}")
             return None
-    
+
     def login(self, username, password):
         """Handle user login"""
         user_data = self.authenticate_user(username, password)
         if user_data:
-            # Create session data
-            session_data = {
-                'user_id': user_data['user_id'],
-                'username': user_data['username'],
-                'role': user_data['role'],
-                'department_id': user_data['department_id'],
-                'login_time': datetime.now().isoformat()
-            }
-            
-            # Set cookie
+            token = self.store.create_session(user_data['user_id'], self.session_timeout_days)
+
+            # Set cookie to the opaque token, never the user id
             self.controller.set(
-                self.cookie_name, 
-                str(user_data['user_id']),  # Store user_id as string
+                self.cookie_name,
+                token,
                 max_age=self.session_timeout_days * 24 * 60 * 60
             )
-            
+
             # Set session state
-            st.session_state.authenticated = True
-            st.session_state.user_id = user_data['user_id']
-            st.session_state.username = user_data['username']
-            st.session_state.user_role = user_data['role']
-            st.session_state.user_department_id = user_data['department_id']
-            st.session_state.login_time = datetime.now()
-            
+            self._restore(user_data, token)
+
             # Update last login in database
             self.update_last_login(user_data['user_id'])
-            
+
             return True
         return False
-    
+
     def logout(self):
         """Handle user logout"""
+        self.store.revoke(st.session_state.get('session_token'))
+
         # Clear cookie
         self.controller.set(self.cookie_name, "", max_age=0)
-        
+
         # Clear session state
         keys_to_clear = [
-            'authenticated', 'user_id', 'username', 
-            'user_role', 'user_department_id', 'login_time'
+            'authenticated', 'user_id', 'username',
+            'user_role', 'user_department_id', 'login_time', 'session_token'
         ]
         for key in keys_to_clear:
             if key in st.session_state:
                 del st.session_state[key]
-    
+
+    def _restore(self, user_data, token):
+        st.session_state.authenticated = True
+        st.session_state.user_id = user_data['user_id']
+        st.session_state.username = user_data['username']
+        st.session_state.user_role = user_data['role']
+        st.session_state.user_department_id = user_data['department_id']
+        st.session_state.login_time = datetime.now()
+        st.session_state.session_token = token
+
     def check_session(self):
         """Check and restore session from cookie"""
         try:
-            user_id_cookie = self.controller.get(self.cookie_name)
-            
-            if user_id_cookie and not st.session_state.get('authenticated', False):
-                user_id = int(user_id_cookie)
-                
-                # Verify user still exists and is active
-                conn = sqlite3.connect('inventory.db')
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT username, role, department_id, isactive FROM users WHERE id = ?", 
-                    (user_id,)
-                )
-                result = cursor.fetchone()
-                conn.close()
-                
-                if result and result[3] == 1:  # isactive check
-                    username, role, department_id, _ = result
-                    
-                    # Restore session state
-                    st.session_state.authenticated = True
-                    st.session_state.user_id = user_id
-                    st.session_state.username = username
-                    st.session_state.user_role = role
-                    st.session_state.user_department_id = department_id
-                    st.session_state.login_time = datetime.now()
-                    
-                    return True
-            
-            return False
-            
+            token = self.controller.get(self.cookie_name)
+            if not token or st.session_state.get('authenticated', False):
+                return False
+
+            user_data = self.store.validate(token)
+            if user_data is None:
+                # Unknown, expired or revoked token (or a pre-token user id cookie)
+                self.controller.set(self.cookie_name, "", max_age=0)
+                return False
+
+            self._restore(user_data, token)
+            return True
+
         except Exception as e:
             print(f"Session check error: {e}")
             return False
-    
+
+    def verify_session(self):
+        """Log out this browser session if its token was revoked (normally a cache hit)"""
+        token = st.session_state.get('session_token')
+        if not token or not st.session_state.get('authenticated', False):
+            return True
+
+        try:
+            user_data = self.store.validate(token)
+        except sqlite3.Error as e:
+            # Keep the user signed in through a transient database error
+            print(f"Session check error: {e}")
+            return True
+        if user_data is None:
+            self.logout()
+            return False
+        # Picks up role or department changes once the cache entry is dropped
+        st.session_state.user_role = user_data['role']
+        st.session_state.user_department_id = user_data['department_id']
+        return True
+
     def update_last_login(self, user_id):
         """Update last login time in database"""
         try:
-            conn = sqlite3.connect('inventory.db')
-            cursor = conn.cursor()
-            cursor.execute(
+            self.store.execute(
                 "UPDATE users SET last_login = ? WHERE id = ?",
                 (datetime.now(), user_id)
             )
-            conn.commit()
-            conn.close()
         except Exception as e:
             print(f"Error updating last login: {e}")
 
-# Global session manager instance
-cookie_session = CookieSessionManager()
\ No newline at end of file
+# Global session store and manager instances
+session_store = SessionStore()
+cookie_session = CookieSessionManager(session_store)
@@ -5,8 +5,9 @@ import secrets
 from datetime import datetime
 import streamlit as st
 from data_manager import DataManager
+import forecast_job
 from barcode_handler import BarcodeHandler
-from session_manager import cookie_session
+from session_manager import cookie_session, session_store
 
 class UserManager:
 
@@ -60,6 +61,11 @@ class UserManager:
                 ''', (username, role, department_id, user_id))
                 
             self.conn.commit()
+            if new_password:
+                session_store.revoke_user(user_id)
+            else:
+                # Role or department may have changed; re-read on next check
+                session_store.forget_user(user_id)
             return True, None
         except sqlite3.Error as e:
             return False, str(e)
@@ -69,6 +75,7 @@ class UserManager:
         try:
             cursor.execute("UPDATE users SET isactive=0 WHERE id=?", (user_id,))
             self.conn.commit()
+            session_store.revoke_user(user_id)
             return True, None
         except sqlite3.Error as e:
             return False, str(e)
@@ -94,6 +101,7 @@ class UserManager:
                     role TEXT NOT NULL,
                     created_at TIMESTAMP,
                     last_login TIMESTAMP,
+                    department_id INTEGER REFERENCES departments(id),
                     isactive boolean NOT NULL default 0
                 )
             ''')
@@ -176,8 +184,15 @@ class UserManager:
             return False
 
 
-def init_session_state():
-    """Initialize session state with required variables"""
+def init_session_state(poll_versions=True):
+    """Initialize session state with required variables.
+
+    Pages call this at their top and again through login_required; only
+    the first call of a rerun needs to poll the data versions.
+    """
+    # Drops a login whose token was revoked, e.g. by deactivating the user
+    cookie_session.verify_session()
+
     required_vars = {
         'authenticated': False,
         'username': None,
@@ -196,7 +211,13 @@ def init_session_state():
         st.session_state.user_manager = UserManager()
         
     if 'data_manager' not in st.session_state:
-        st.session_state.data_manager = DataManager()
+        st.session_state.data_manager = DataManager(auto_sync=False)
+    # One data version poll per rerun keeps the shared read cache coherent
+    # with writes from other sessions and server processes
+    if poll_versions:
+        st.session_state.data_manager.sync_versions()
+    # Batch demand forecasts, refreshed by one thread per server process
+    forecast_job.start_background_refresh(st.session_state.data_manager.db_path)
     
     if 'barcode_handler' not in st.session_state:
         st.session_state.barcode_handler = BarcodeHandler()
@@ -208,7 +229,9 @@ def check_and_restore_session():
 def login_required(func):
     """Decorator to require login for accessing pages"""
     def wrapper(*args, **kwargs):
-        init_session_state()
+        # The page top already polled the data versions this rerun; a data
+        # manager created here reads them on first use
+        init_session_state(poll_versions=False)
         
         # Check if user is authenticated
         if not st.session_state.authenticated: